@@ -0,0 +1 @@
+"""Performance benchmarks for the patent analysis tools on a synthetic corpus."""
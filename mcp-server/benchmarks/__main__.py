@@ -0,0 +1,6 @@
+"""Entry point for running the benchmarks: python -m benchmarks run"""
+
+from .runner import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+"""
+Seeded synthetic patent corpus for benchmarks.
+
+Documents follow the layout of templates/applications/*.md and the claim
+style of templates/claims/*.md: numbered specification paragraphs with
+reference numerals, markdown emphasis, the standard sections, and a claim
+set of independent claims with chains of dependents. The same seed and size
+always produce the same document, so timings are comparable across commits.
+"""
+
+import random
+from pathlib import Path
+
+
+# Named benchmark sizes: (number of claims, bytes of specification)
+SIZES = {
+    "small": (10, 10 * 1024),
+    "medium": (100, 1024 * 1024),
+    "large": (1000, 20 * 1024 * 1024),
+}
+
+DEFAULT_SEED = 1234
+
+DOMAINS = {
+    "semiconductor": {
+        "title": "Semiconductor Device Having a Stacked Gate Structure",
+        "subjects": ["semiconductor device", "transistor structure", "memory device"],
+        "elements": [
+            "substrate", "gate electrode", "gate dielectric", "channel region", "source region",
+            "drain region", "spacer", "isolation structure", "contact plug", "interconnect layer",
+            "barrier layer", "silicide layer", "fin structure", "nanosheet", "work function layer",
+            "etch stop layer", "capping layer", "passivation layer", "bonding pad", "through-silicon via",
+        ],
+        "materials": [
+            "silicon", "silicon germanium", "hafnium oxide", "titanium nitride", "tungsten",
+            "copper", "silicon nitride", "silicon dioxide", "gallium nitride", "cobalt",
+        ],
+        "verbs": ["deposited on", "formed over", "disposed between", "coupled to", "adjacent to", "etched into"],
+        "steps": ["forming", "depositing", "etching", "annealing", "patterning", "planarizing", "implanting"],
+    },
+    "computing": {
+        "title": "System and Method for Adaptive Data Processing",
+        "subjects": ["computing system", "data processing apparatus", "network device"],
+        "elements": [
+            "processor", "memory", "storage device", "network interface", "neural network",
+            "data buffer", "scheduler", "cache controller", "user interface", "encoder",
+            "decoder", "signal processor", "classifier", "feature extractor", "database",
+            "message queue", "load balancer", "authentication module", "sensor", "display",
+        ],
+        "materials": [
+            "image data", "sensor data", "training data", "video stream", "packet header",
+            "feature vector", "configuration file", "machine learning model", "query result", "log record",
+        ],
+        "verbs": ["coupled to", "configured to receive", "in communication with", "connected to", "stored in", "executed by"],
+        "steps": ["receiving", "processing", "transmitting", "storing", "classifying", "encoding", "determining"],
+    },
+}
+
+SPEC_SECTIONS = [
+    "BACKGROUND OF THE INVENTION",
+    "BRIEF SUMMARY OF THE INVENTION",
+    "BRIEF DESCRIPTION OF THE DRAWINGS",
+    "DETAILED DESCRIPTION OF THE INVENTION",
+]
+
+# Share of the specification given to each section above
+SECTION_WEIGHTS = [0.1, 0.1, 0.05, 0.75]
+
+CONNECTIVES = [
+    "In some embodiments,", "In one example,", "As shown in FIG. {fig},", "Referring to FIG. {fig},",
+    "Alternatively,", "In addition,", "According to various embodiments,", "For example,",
+]
+
+
+def generate_paragraph(rng: random.Random, domain: dict, numerals: dict[str, int], number: int) -> str:
+    """Write one numbered specification paragraph of a few sentences."""
+    sentences = []
+
+    for _ in range(rng.randint(3, 7)):
+        first, second = rng.sample(domain["elements"], 2)
+        lead = rng.choice(CONNECTIVES).format(fig=rng.randint(1, 12))
+        material = rng.choice(domain["materials"])
+        sentence = (
+            f"{lead} the {first} {numerals[first]} is {rng.choice(domain['verbs'])} "
+            f"the {second} {numerals[second]} and may include {material}"
+        )
+        roll = rng.random()
+        if roll < 0.1:
+            sentence += f", which is referred to herein as a **{first} assembly**"
+        elif roll < 0.2:
+            sentence += f" (*e.g.*, a {rng.choice(domain['materials'])})"
+        elif roll < 0.25:
+            sentence += f" as described in [related art](https://example.com/ref/{rng.randint(1, 999)})"
+        sentences.append(sentence + ".")
+
+    return f"[{number:04d}] " + " ".join(sentences)
+
+
+def generate_specification(rng: random.Random, domain: dict, numerals: dict[str, int], spec_bytes: int) -> list[str]:
+    """Write the specification sections up to roughly spec_bytes of text."""
+    parts = []
+    paragraph_number = 1
+
+    for section, weight in zip(SPEC_SECTIONS, SECTION_WEIGHTS):
+        parts.append(f"## {section}\n")
+        budget = max(int(spec_bytes * weight), 1)
+        written = 0
+
+        if section == "BRIEF DESCRIPTION OF THE DRAWINGS":
+            figure = 1
+            while written < budget:
+                line = f"FIG. {figure} is a cross-sectional view of the {rng.choice(domain['subjects'])} according to an embodiment.\n"
+                parts.append(line)
+                written += len(line)
+                figure += 1
+            parts.append("")
+            continue
+
+        while written < budget:
+            paragraph = generate_paragraph(rng, domain, numerals, paragraph_number) + "\n"
+            parts.append(paragraph)
+            written += len(paragraph)
+            paragraph_number += 1
+
+    return parts
+
+
+def article(noun: str) -> str:
+    """Indefinite article for a noun."""
+    return "an" if noun[0] in "aeiou" else "a"
+
+
+def generate_claims(rng: random.Random, domain: dict, claim_count: int) -> list[str]:
+    """Write a claim set of independent claims, each followed by a tree of dependents.
+
+    About one in ten dependent claims refers to an element that neither it nor
+    its ancestors introduced, so the antecedent checker has real findings.
+    """
+    claims = []
+    families = []
+    introduced = {}
+
+    for claim_num in range(1, claim_count + 1):
+        if claim_num == 1 or rng.random() < 0.1:
+            subject = rng.choice(domain["subjects"])
+            elements = rng.sample(domain["elements"], 4)
+            if rng.random() < 0.5:
+                preamble = f"{article(subject).capitalize()} {subject} comprising:"
+                body = [f"- {article(elements[0])} {elements[0]};"]
+                body += [
+                    f"- {article(element)} {element} {rng.choice(domain['verbs'])} the {elements[i]};"
+                    for i, element in enumerate(elements[1:])
+                ]
+            else:
+                subject = "method"
+                preamble = f"A method of manufacturing a {rng.choice(domain['subjects'])}, the method comprising:"
+                body = [f"- {rng.choice(domain['steps'])} {article(element)} {element};" for element in elements]
+            body[-1] = body[-1].rstrip(";") + "."
+            families.append((subject, [claim_num]))
+            introduced[claim_num] = elements
+            claims.append(f"**Claim {claim_num}.** {preamble}\n" + "\n".join(body))
+            continue
+
+        subject, members = rng.choice(families)
+        parent = rng.choice(members) if rng.random() < 0.5 else members[0]
+        referenced = rng.choice(introduced[parent])
+        missing = [element for element in domain["elements"] if element not in introduced[parent]]
+        if missing and rng.random() < 0.1:
+            referenced = rng.choice(missing)
+        added = rng.choice(domain["elements"])
+        members.append(claim_num)
+        introduced[claim_num] = introduced[parent] + [added]
+        claims.append(
+            f"**Claim {claim_num}.** The {subject} of claim {parent}, wherein the {referenced} "
+            f"further comprises {article(added)} {added} including {rng.choice(domain['materials'])}."
+        )
+
+    return claims
+
+
+def generate_document(claims: int = 10, spec_bytes: int = 10 * 1024, seed: int = DEFAULT_SEED, domain: str | None = None) -> str:
+    """Generate a complete patent application in markdown."""
+    rng = random.Random(f"{seed}:{claims}:{spec_bytes}:{domain}")
+    domain = DOMAINS[domain or rng.choice(sorted(DOMAINS))]
+
+    numerals = {element: 102 + 2 * i for i, element in enumerate(domain["elements"])}
+
+    parts = [
+        "# Patent Application\n",
+        "## TITLE OF INVENTION\n",
+        domain["title"] + "\n",
+        "## CROSS-REFERENCE TO RELATED APPLICATIONS\n",
+        "This application claims the benefit of U.S. Provisional Application No. 63/000,000.\n",
+    ]
+    parts += generate_specification(rng, domain, numerals, spec_bytes)
+    parts.append("## CLAIMS\n")
+    parts.append("\n\n".join(generate_claims(rng, domain, claims)) + "\n")
+    parts.append("## ABSTRACT\n")
+    parts.append(generate_paragraph(rng, domain, numerals, 1)[7:] + "\n")
+
+    return "\n".join(parts)
+
+
+def generate_cpc_table(subclasses: int, keywords_per_subclass: int = 5, seed: int = DEFAULT_SEED) -> dict[str, list[str]]:
+    """Generate a CPC keyword table of the given size for classifier scaling benchmarks.
+
+    Keywords are one to three invented words. Each element of the document
+    domains is added to one random subclass, so every table has the same real
+    hits and only the table size varies.
+    """
+    rng = random.Random(f"cpc:{seed}:{subclasses}:{keywords_per_subclass}")
+    elements = [element for domain in DOMAINS.values() for element in domain["elements"]]
+    syllables = ["ka", "lo", "mi", "ter", "zon", "ph", "ra", "vel", "dic", "su", "tro", "ne"]
+    table = {}
+
+    for i in range(subclasses):
+        code = f"{'ABCDEFGH'[i % 8]}{(i // 8) % 100:02d}{chr(ord('A') + (i // 800) % 26)}{i // 20800 or ''}"
+        keywords = []
+        for _ in range(keywords_per_subclass):
+            words = ["".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))) for _ in range(rng.randint(1, 3))]
+            keywords.append(" ".join(words))
+        table[code] = keywords
+
+    codes = list(table)
+    for element in elements:
+        table[rng.choice(codes)].append(element)
+
+    return table
+
+
+def write_corpus(directory: str | Path, sizes: list[str], seed: int = DEFAULT_SEED) -> list[Path]:
+    """Write one generated document per named size into a directory."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+
+    for size in sizes:
+        claims, spec_bytes = SIZES[size]
+        path = directory / f"synthetic-{size}-{claims}-claims.md"
+        path.write_text(generate_document(claims, spec_bytes, seed), encoding="utf-8")
+        paths.append(path)
+
+    return paths
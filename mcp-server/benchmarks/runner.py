@@ -0,0 +1,431 @@
+"""
+Benchmark runner for the patent analysis core and the MCP tools.
+
+Each benchmark is registered with @benchmark and receives a generated
+document; it returns the zero-argument callable that is timed. Results are
+written as JSON keyed by benchmark name and corpus size, so two runs from
+different commits can be compared with the compare command.
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import fnmatch
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+from patent_tools_mcp import core, ingest, numerals, parallel, proximity, server, similarity, support
+from patent_tools_mcp.cache import ResultCache, content_digest
+from patent_tools_mcp.claim_graph import ClaimGraph
+from patent_tools_mcp.cpc import CPCMatcher
+from patent_tools_mcp.incremental import ClaimSession
+from patent_tools_mcp.terminology import default_checker
+
+from .corpus import DEFAULT_SEED, SIZES, generate_cpc_table, generate_document, write_corpus
+
+
+RESULTS_SCHEMA = 1
+
+DEFAULT_SIZES = ["small", "medium"]
+
+# Slowdowns beyond this fraction are flagged by the compare command
+DEFAULT_REGRESSION_THRESHOLD = 0.10
+
+
+class BenchmarkDocument:
+    """A generated document, written to disk for the file_path tool calls."""
+
+    def __init__(self, size: str, seed: int, directory: Path):
+        self.size = size
+        self.claim_count, self.spec_bytes = SIZES[size]
+        self.text = generate_document(self.claim_count, self.spec_bytes, seed)
+        self.path = directory / f"synthetic-{size}.md"
+        self.path.write_text(self.text, encoding="utf-8")
+        self.digest = content_digest(self.text)
+        self.claims = core.extract_claims(self.text)
+        self.keywords = core.extract_keywords(self.text)
+
+
+BENCHMARKS: dict[str, Callable[[BenchmarkDocument], Callable[[], Any]]] = {}
+
+
+def benchmark(name: str):
+    """Register a benchmark setup function under a name."""
+    def register(setup: Callable[[BenchmarkDocument], Callable[[], Any]]):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+@benchmark("core.count_words")
+def bench_count_words(doc: BenchmarkDocument):
+    return lambda: core.count_words(doc.text)
+
+
+@benchmark("core.analyze_word_count")
+def bench_analyze_word_count(doc: BenchmarkDocument):
+    return lambda: core.analyze_word_count(doc.text, doc.path.name)
+
+
+@benchmark("core.scan_sections")
+def bench_scan_sections(doc: BenchmarkDocument):
+    return lambda: core.scan_sections(doc.text)
+
+
+@benchmark("core.extract_claims")
+def bench_extract_claims(doc: BenchmarkDocument):
+    return lambda: core.extract_claims(doc.text)
+
+
+@benchmark("core.analyze_antecedent_basis")
+def bench_analyze_antecedent_basis(doc: BenchmarkDocument):
+    claim_texts = list(doc.claims.values())
+    return lambda: [core.analyze_antecedent_basis(text) for text in claim_texts]
+
+
+@benchmark("claim_graph.ClaimGraph.from_claims")
+def bench_claim_graph(doc: BenchmarkDocument):
+    return lambda: ClaimGraph.from_claims(doc.claims)
+
+
+@benchmark("core.analyze_claims")
+def bench_analyze_claims(doc: BenchmarkDocument):
+    return lambda: core.analyze_claims(doc.text)
+
+
+@benchmark("core.analyze_claims.parallel")
+def bench_analyze_claims_parallel(doc: BenchmarkDocument):
+    # Every size through the worker pool (PATENT_TOOLS_WORKERS of them), for the
+    # break-even claim count against core.analyze_claims
+    def run():
+        threshold = os.environ.get("PATENT_TOOLS_PARALLEL_CLAIMS")
+        os.environ["PATENT_TOOLS_PARALLEL_CLAIMS"] = "1"
+        parallel.enable()
+        try:
+            return core.analyze_claims(doc.text)
+        finally:
+            parallel.enable(False)
+            if threshold is None:
+                del os.environ["PATENT_TOOLS_PARALLEL_CLAIMS"]
+            else:
+                os.environ["PATENT_TOOLS_PARALLEL_CLAIMS"] = threshold
+    return run
+
+
+@benchmark("core.extract_keywords")
+def bench_extract_keywords(doc: BenchmarkDocument):
+    return lambda: core.extract_keywords(doc.text)
+
+
+@benchmark("core.extract_technical_terms")
+def bench_extract_technical_terms(doc: BenchmarkDocument):
+    return lambda: core.extract_technical_terms(doc.text)
+
+
+@benchmark("core.generate_boolean_queries")
+def bench_generate_boolean_queries(doc: BenchmarkDocument):
+    return lambda: core.generate_boolean_queries(doc.keywords)
+
+
+@benchmark("proximity.generate_proximity_queries")
+def bench_generate_proximity_queries(doc: BenchmarkDocument):
+    terms = [kw["keyword"] for kw in core.rank_keywords(doc.keywords)]
+    return lambda: proximity.generate_proximity_queries(doc.text, terms)
+
+
+@benchmark("core.suggest_cpc_classifications")
+def bench_suggest_cpc_classifications(doc: BenchmarkDocument):
+    return lambda: core.suggest_cpc_classifications(doc.text)
+
+
+def cpc_table_benchmark(subclasses: int):
+    """Time a classification scan with a generated table of the given number of subclasses."""
+    def setup(doc: BenchmarkDocument):
+        matcher = CPCMatcher(generate_cpc_table(subclasses))
+        return lambda: matcher.classify(doc.text)
+    return setup
+
+
+for _subclasses in (100, 1000, 10000):
+    benchmark(f"cpc.classify.{_subclasses}_subclasses")(cpc_table_benchmark(_subclasses))
+
+
+@benchmark("core.generate_prior_art_search")
+def bench_generate_prior_art_search(doc: BenchmarkDocument):
+    return lambda: core.generate_prior_art_search(doc.text)
+
+
+@benchmark("terminology.check")
+def bench_check_terminology(doc: BenchmarkDocument):
+    checker = default_checker()
+    return lambda: checker.check(doc.text)
+
+
+@benchmark("support.check_claim_support")
+def bench_check_claim_support(doc: BenchmarkDocument):
+    # Index the specification on every run, as for a new document
+    def run():
+        support.clear_index_cache()
+        return support.check_claim_support(doc.text)
+    return run
+
+
+@benchmark("numerals.check_reference_numerals")
+def bench_check_reference_numerals(doc: BenchmarkDocument):
+    return lambda: numerals.check_reference_numerals(doc.text)
+
+
+if similarity.np is not None:
+    @benchmark("similarity.find_near_duplicate_claims")
+    def bench_find_near_duplicate_claims(doc: BenchmarkDocument):
+        # A family of ten continuations of the generated application
+        family = {f"{doc.path.stem}-{i}": doc.text for i in range(10)}
+        return lambda: similarity.find_near_duplicate_claims(family)
+
+
+@benchmark("ingest.analyze_word_count_mapped")
+def bench_analyze_word_count_mapped(doc: BenchmarkDocument):
+    def run():
+        with ingest.map_document(doc.path) as data:
+            return ingest.analyze_word_count_mapped(data, doc.path.name)
+    return run
+
+
+@benchmark("ingest.count_streamed_words")
+def bench_count_streamed_words(doc: BenchmarkDocument):
+    def run():
+        with open(doc.path, 'rb') as f:
+            return ingest.count_streamed_words(iter(lambda: f.read(64 * 1024), b''))
+    return run
+
+
+@benchmark("ingest.extract_claims")
+def bench_ingest_extract_claims(doc: BenchmarkDocument):
+    def run():
+        with ingest.map_document(doc.path) as data:
+            return ingest.extract_claims(data)
+    return run
+
+
+@benchmark("incremental.reanalyze_one_claim")
+def bench_reanalyze_one_claim(doc: BenchmarkDocument):
+    # Alternate between two versions of the last claim so every call re-checks it
+    session = ClaimSession()
+    edited = dict(doc.claims)
+    last = max(edited)
+    versions = [doc.claims[last], doc.claims[last] + " The device further comprises a housing."]
+    session.analyze(edited)
+
+    def run():
+        versions.reverse()
+        edited[last] = versions[0]
+        return session.analyze(edited)
+    return run
+
+
+def tool_benchmark(tool: str, **extra: Any):
+    """Time an MCP tool end to end on the document file, with the result cache off."""
+    def setup(doc: BenchmarkDocument):
+        loop = asyncio.new_event_loop()
+        arguments = {"file_path": str(doc.path), **extra}
+        return lambda: loop.run_until_complete(server.call_tool(tool, arguments))
+    return setup
+
+
+for _tool in server.ANALYSIS_TOOLS:
+    benchmark(f"mcp.{_tool}")(tool_benchmark(_tool))
+benchmark("mcp.analyze_patent_claims.session")(
+    tool_benchmark("analyze_patent_claims", session_id="benchmark")
+)
+
+
+def time_callable(func: Callable[[], Any], min_time: float, max_repeats: int) -> list[float]:
+    """Call func repeatedly until min_time has elapsed or max_repeats is reached."""
+    samples = []
+    started = time.perf_counter()
+
+    while len(samples) < max_repeats:
+        begin = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - begin)
+        if time.perf_counter() - started >= min_time:
+            break
+
+    return samples
+
+
+def summarize(samples: list[float]) -> dict[str, Any]:
+    return {
+        "repeats": len(samples),
+        "min_seconds": min(samples),
+        "median_seconds": statistics.median(samples),
+        "mean_seconds": statistics.fmean(samples),
+        "stdev_seconds": statistics.stdev(samples) if len(samples) > 1 else 0.0
+    }
+
+
+def git_revision() -> dict[str, Any]:
+    """Commit and dirty state of the working tree, when run from a git checkout."""
+    root = Path(__file__).resolve().parent.parent
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=root, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = bool(subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=root,
+            capture_output=True, text=True, check=True
+        ).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+    return {"commit": commit, "dirty": dirty}
+
+
+def run_benchmarks(
+    sizes: list[str],
+    patterns: list[str] | None = None,
+    seed: int = DEFAULT_SEED,
+    min_time: float = 1.0,
+    max_repeats: int = 50
+) -> dict[str, Any]:
+    """Run every selected benchmark against each corpus size and collect the timings."""
+    names = [
+        name for name in BENCHMARKS
+        if not patterns or any(fnmatch.fnmatch(name, pattern) for pattern in patterns)
+    ]
+    results = []
+
+    # Time the analysis itself, not cache lookups
+    server.result_cache = ResultCache(max_entries=0)
+
+    with tempfile.TemporaryDirectory(prefix="patent-bench-") as tmp:
+        for size in sizes:
+            doc = BenchmarkDocument(size, seed, Path(tmp))
+            print(
+                f"{size}: {doc.claim_count} claims, {len(doc.text.encode('utf-8')):,} bytes",
+                file=sys.stderr
+            )
+            for name in names:
+                func = BENCHMARKS[name](doc)
+                record = {
+                    "name": name,
+                    "size": size,
+                    "claims": doc.claim_count,
+                    "spec_bytes": doc.spec_bytes,
+                    "document_digest": doc.digest,
+                    **summarize(time_callable(func, min_time, max_repeats))
+                }
+                results.append(record)
+                print(f"  {name:<45} {record['min_seconds'] * 1000:>10.3f} ms min  (x{record['repeats']})", file=sys.stderr)
+
+    return {
+        "schema": RESULTS_SCHEMA,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        **git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "seed": seed,
+        "results": results
+    }
+
+
+def compare_results(baseline: dict[str, Any], current: dict[str, Any], threshold: float) -> tuple[list[str], int]:
+    """Compare the fastest timings of two result files, returning report lines and the regression count.
+
+    The minimum is the sample least disturbed by other load on the machine.
+    """
+    previous = {(r["name"], r["size"]): r for r in baseline["results"]}
+    lines = [f"{'benchmark':<45} {'size':<7} {'baseline':>12} {'current':>12} {'change':>8}"]
+    regressions = 0
+
+    for record in current["results"]:
+        key = (record["name"], record["size"])
+        if key not in previous:
+            lines.append(f"{key[0]:<45} {key[1]:<7} {'-':>12} {record['min_seconds'] * 1000:>10.3f}ms {'new':>8}")
+            continue
+
+        before = previous[key]["min_seconds"]
+        after = record["min_seconds"]
+        change = (after - before) / before if before else 0.0
+        flag = ""
+        if change > threshold:
+            regressions += 1
+            flag = "  REGRESSION"
+        if previous[key]["document_digest"] != record["document_digest"]:
+            flag += "  (corpus changed)"
+        lines.append(
+            f"{key[0]:<45} {key[1]:<7} {before * 1000:>10.3f}ms {after * 1000:>10.3f}ms {change:>+8.1%}{flag}"
+        )
+
+    return lines, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmark the patent analysis functions and MCP tools on a synthetic corpus."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the benchmarks and write JSON results")
+    run_parser.add_argument(
+        "--sizes", nargs="+", choices=list(SIZES), default=DEFAULT_SIZES,
+        help=f"Corpus sizes to generate (default: {' '.join(DEFAULT_SIZES)})"
+    )
+    run_parser.add_argument("--filter", nargs="+", dest="patterns", help="Only run benchmarks matching these glob patterns")
+    run_parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help=f"Corpus seed (default: {DEFAULT_SEED})")
+    run_parser.add_argument("--min-time", type=float, default=1.0, help="Minimum seconds spent timing each benchmark (default: 1.0)")
+    run_parser.add_argument("--max-repeats", type=int, default=50, help="Maximum calls per benchmark (default: 50)")
+    run_parser.add_argument("--output", help="Write JSON results to this file instead of stdout")
+
+    compare_parser = commands.add_parser("compare", help="Compare two JSON result files")
+    compare_parser.add_argument("baseline", help="Results from the reference commit")
+    compare_parser.add_argument("current", help="Results from the commit under test")
+    compare_parser.add_argument(
+        "--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+        help=f"Flag slowdowns larger than this fraction (default: {DEFAULT_REGRESSION_THRESHOLD})"
+    )
+
+    commands.add_parser("list", help="List the registered benchmarks")
+
+    corpus_parser = commands.add_parser("corpus", help="Write the generated documents to a directory")
+    corpus_parser.add_argument("directory", help="Directory to write the documents into")
+    corpus_parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES), help="Corpus sizes (default: all)")
+    corpus_parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help=f"Corpus seed (default: {DEFAULT_SEED})")
+
+    args = parser.parse_args()
+
+    if args.command == "list":
+        for name in BENCHMARKS:
+            print(name)
+        return
+
+    if args.command == "corpus":
+        for path in write_corpus(args.directory, args.sizes, args.seed):
+            print(path)
+        return
+
+    if args.command == "compare":
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        with open(args.current, encoding="utf-8") as f:
+            current = json.load(f)
+        lines, regressions = compare_results(baseline, current, args.threshold)
+        print(f"Baseline: {baseline.get('commit')}  Current: {current.get('commit')}")
+        print("\n".join(lines))
+        sys.exit(1 if regressions else 0)
+
+    report = run_benchmarks(args.sizes, args.patterns, args.seed, args.min_time, args.max_repeats)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n", encoding="utf-8")
+    else:
+        print(output)
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Batch analysis of patent documents.
+
+Runs the word count, claims and prior art analyses over a directory or glob
+of documents in a process pool, producing one JSON record per document as
+each one finishes. A document that fails to read or analyze is reported as
+an error record and never stops the run. Workers are started with "spawn",
+so a run from a threaded caller (the MCP server) never forks its threads.
+
+Each worker is given one document at a time. When a worker dies (killed,
+or out of memory on a pathological draft), the documents being analyzed at
+that moment are reported as errors and the rest of the run continues on a
+new pool.
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+import multiprocessing
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from .core import analyze_word_count, analyze_claims, generate_prior_art_search
+
+
+BATCH_ANALYSES = ("word_count", "claims", "prior_art")
+
+
+def collect_documents(target: str, pattern: str = "*.md") -> list[Path]:
+    """Expand a file, directory (searched recursively for pattern) or glob into document paths."""
+    if any(char in target for char in "*?["):
+        paths = [Path(p) for p in glob.glob(target, recursive=True)]
+    else:
+        path = Path(target)
+        if path.is_dir():
+            paths = list(path.rglob(pattern))
+        elif path.exists():
+            paths = [path]
+        else:
+            paths = []
+
+    return sorted(p for p in paths if p.is_file())
+
+
+def analyze_document(path: str, analyses: tuple[str, ...] = BATCH_ANALYSES) -> dict[str, Any]:
+    """Run the requested analyses on one document. Executed inside a pool worker."""
+    start = time.perf_counter()
+    record = {"file": path, "status": "ok", "results": {}}
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        for analysis in analyses:
+            if analysis == "word_count":
+                record["results"]["word_count"] = analyze_word_count(content, Path(path).name)
+            elif analysis == "claims":
+                record["results"]["claims"] = analyze_claims(content)
+            elif analysis == "prior_art":
+                record["results"]["prior_art"] = generate_prior_art_search(content)
+            else:
+                raise ValueError(f"Unknown analysis '{analysis}'")
+    except Exception as e:
+        record["status"] = "error"
+        record["error"] = f"{type(e).__name__}: {e}"
+        record["results"] = {}
+
+    record["elapsed_seconds"] = round(time.perf_counter() - start, 4)
+    return record
+
+
+def run_batch(
+    paths: Iterable[Path | str],
+    analyses: tuple[str, ...] = BATCH_ANALYSES,
+    workers: int | None = None
+) -> Iterator[dict[str, Any]]:
+    """Analyze documents across a process pool, yielding each record as it finishes."""
+    for analysis in analyses:
+        if analysis not in BATCH_ANALYSES:
+            raise ValueError(f"Unknown analysis '{analysis}'. Choose from: {', '.join(BATCH_ANALYSES)}")
+
+    pending = deque(str(p) for p in paths)
+    workers = workers or os.cpu_count() or 1
+
+    while pending:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            # As many documents in flight as workers, so that a dead worker takes only those with it
+            running = {}
+            broken = False
+            while (pending and not broken) or running:
+                while pending and not broken and len(running) < workers:
+                    path = pending.popleft()
+                    try:
+                        running[pool.submit(analyze_document, path, tuple(analyses))] = path
+                    except BrokenProcessPool:
+                        pending.appendleft(path)
+                        broken = True
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED) if running else ((), ())
+                for future in done:
+                    path = running.pop(future)
+                    try:
+                        yield future.result()
+                    except Exception as e:
+                        # The worker itself died (e.g. killed or out of memory)
+                        broken = broken or isinstance(e, BrokenProcessPool)
+                        yield {
+                            "file": path,
+                            "status": "error",
+                            "error": f"{type(e).__name__}: {e}",
+                            "results": {}
+                        }
+        # Documents not yet started go to a new pool
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run patent analyses over a directory or glob of documents."
+    )
+    parser.add_argument("target", help="Directory, file or glob pattern (quote globs, e.g. 'drafts/**/*.md')")
+    parser.add_argument("--pattern", default="*.md", help="File pattern used when target is a directory (default: *.md)")
+    parser.add_argument(
+        "--analyses", nargs="+", choices=BATCH_ANALYSES, default=list(BATCH_ANALYSES),
+        help="Analyses to run on each document (default: all)"
+    )
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes (default: CPU count)")
+    parser.add_argument("--output", help="Write JSON Lines records to this file instead of stdout")
+    args = parser.parse_args()
+
+    paths = collect_documents(args.target, args.pattern)
+    if not paths:
+        print(f"Error: No documents found for '{args.target}'.", file=sys.stderr)
+        sys.exit(1)
+
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    failures = 0
+    try:
+        for done, record in enumerate(run_batch(paths, tuple(args.analyses), args.workers), 1):
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            if record["status"] == "ok":
+                print(f"[{done}/{len(paths)}] ✓ {record['file']} ({record.get('elapsed_seconds', 0):.2f}s)", file=sys.stderr)
+            else:
+                failures += 1
+                print(f"[{done}/{len(paths)}] ✗ {record['file']}: {record['error']}", file=sys.stderr)
+    finally:
+        if args.output:
+            out.close()
+
+    print(f"Analyzed {len(paths)} documents: {len(paths) - failures} succeeded, {failures} failed.", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+Content-addressed result cache for the MCP tools.
+
+Results are keyed by (tool name, content hash, options) and kept in a bounded
+in-memory LRU. An optional SQLite store lets results survive server restarts.
+For file_path calls the cache remembers each file's mtime and size, so an
+unchanged file is looked up without being read or hashed again.
+
+Cached outputs are rendered reports, so every key carries
+CACHE_SCHEMA_VERSION: bump it in any change to a formatter or to the shape
+of a result, and entries written by the older code (in memory or on disk)
+are never served again.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from . import __version__
+
+
+# Version of the cached outputs; bump whenever a formatter or a result shape changes
+CACHE_SCHEMA_VERSION = 4
+
+DEFAULT_MAX_ENTRIES = 128
+DEFAULT_MAX_DISK_ENTRIES = 10000
+
+
+def content_digest(content: str | bytes) -> str:
+    """Hash document content (text, bytes or a memory map) for use in a cache key."""
+    data = content.encode('utf-8') if isinstance(content, str) else content
+    return hashlib.blake2b(data, digest_size=20).hexdigest()
+
+
+class ResultCache:
+    """Bounded LRU of formatted tool results with an optional on-disk store."""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        disk_path: str | Path | None = None,
+        max_disk_entries: int = DEFAULT_MAX_DISK_ENTRIES
+    ):
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self._entries = OrderedDict()
+        self._file_digests = {}
+        self._lock = threading.Lock()
+        self._db = None
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.stat_hits = 0
+
+        if disk_path:
+            disk_path = Path(disk_path)
+            disk_path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(disk_path), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._db.commit()
+            self.disk_path = disk_path
+        else:
+            self.disk_path = None
+
+    @classmethod
+    def from_environment(cls) -> "ResultCache":
+        """Configure from PATENT_TOOLS_CACHE_SIZE and PATENT_TOOLS_CACHE_DIR."""
+        max_entries = int(os.environ.get("PATENT_TOOLS_CACHE_SIZE", DEFAULT_MAX_ENTRIES))
+        cache_dir = os.environ.get("PATENT_TOOLS_CACHE_DIR")
+        disk_path = Path(cache_dir) / "results.sqlite3" if cache_dir else None
+        return cls(max_entries=max_entries, disk_path=disk_path)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 or self._db is not None
+
+    def make_key(self, tool: str, digest: str, options: dict[str, Any]) -> str:
+        """Build the cache key; results of another output schema or release never match."""
+        payload = json.dumps([CACHE_SCHEMA_VERSION, __version__, tool, digest, options], sort_keys=True)
+        return hashlib.blake2b(payload.encode('utf-8'), digest_size=20).hexdigest()
+
+    def file_digest(self, path: Path) -> str | None:
+        """Return the remembered digest of a file if its mtime and size are unchanged."""
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+
+        with self._lock:
+            remembered = self._file_digests.get(str(path))
+            if remembered and remembered[0] == stat.st_mtime_ns and remembered[1] == stat.st_size:
+                self.stat_hits += 1
+                return remembered[2]
+        return None
+
+    def remember_file(self, path: Path, digest: str, stat: os.stat_result):
+        """Record a file's mtime and size against its content digest.
+
+        stat must be taken before the content was read: a write between the
+        two then leaves a memo that no longer matches the file, where a stat
+        taken afterwards would tie the new mtime to the old content.
+        """
+        with self._lock:
+            self._file_digests[str(path)] = (stat.st_mtime_ns, stat.st_size, digest)
+            # Bound the stat memo along with the result entries
+            while len(self._file_digests) > max(self.max_entries, 1) * 4:
+                self._file_digests.pop(next(iter(self._file_digests)))
+
+    def get(self, key: str) -> str | None:
+        """Look up a result, promoting it to most recently used."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+
+            if self._db is not None:
+                row = self._db.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    self._db.execute(
+                        "UPDATE results SET accessed = ? WHERE key = ?", (time.time(), key)
+                    )
+                    self._db.commit()
+                    self._store_memory(key, row[0])
+                    self.disk_hits += 1
+                    return row[0]
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, value: str):
+        """Store a result in memory and, when configured, on disk."""
+        with self._lock:
+            self._store_memory(key, value)
+
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO results (key, value, accessed) VALUES (?, ?, ?)",
+                    (key, value, time.time())
+                )
+                self._db.execute(
+                    "DELETE FROM results WHERE key IN ("
+                    "SELECT key FROM results ORDER BY accessed DESC, rowid DESC LIMIT -1 OFFSET ?)",
+                    (self.max_disk_entries,)
+                )
+                self._db.commit()
+
+    def _store_memory(self, key: str, value: str):
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Drop every cached result, in memory and on disk."""
+        with self._lock:
+            self._entries.clear()
+            self._file_digests.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM results")
+                self._db.commit()
+
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss counters and current sizes, for sizing the cache."""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            disk_entries = None
+            if self._db is not None:
+                disk_entries = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "unchanged_file_skips": self.stat_hits,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "disk_path": str(self.disk_path) if self.disk_path else None,
+                "disk_entries": disk_entries
+            }
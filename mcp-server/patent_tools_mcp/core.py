@@ -0,0 +1,640 @@
+"""
+Patent analysis core.
+
+The word count, claims and prior art analyses shared by the MCP server and
+the command line tools in tools/. Every regular expression is compiled once
+at import, and this module only depends on the standard library so the
+command line tools can import it without loading the MCP SDK.
+"""
+
+import re
+import heapq
+from collections import Counter
+from typing import Any, Sequence
+
+from .claim_graph import ClaimGraph, parse_claim_references
+from .metrics import stage
+from .parallel import map_in_chunks, use_pool
+from .cpc import default_matcher
+from .idf import default_idf_table
+from .proximity import generate_proximity_queries
+
+
+# Markdown formatting stripped before counting words, applied in order.
+# The header pattern is '#+\s+' written with a literal first character,
+# which lets the regex engine skip ahead to each '#'.
+MARKDOWN_HEADER_PATTERN = re.compile(r'##*\s+')
+MARKDOWN_LINK_PATTERN = re.compile(r'\[([^\]]+)\]\([^\)]+\)')
+MARKDOWN_BOLD_PATTERN = re.compile(r'\*\*([^\*]+)\*\*')
+MARKDOWN_ITALIC_PATTERN = re.compile(r'\*([^\*]+)\*')
+MARKDOWN_CODE_BLOCK_PATTERN = re.compile(r'```[^`]*```', re.DOTALL)
+MARKDOWN_INLINE_CODE_PATTERN = re.compile(r'`[^`]+`')
+
+# One scan over a document finds its sections: every "##" run followed by
+# whitespace is looked at for the standard sections, and those at the start
+# of a line with the title on the same line (group 1 holds the spaces before
+# it, group 2 the rest of the line) split the document.
+SECTION_HEADING_PATTERN = re.compile(r'##(?=\s)([ \t]*)\s*(?=(.*))')
+
+# The standard sections, matched against the text following "##" and whitespace
+SECTION_TITLE_PATTERNS = {
+    'Background': re.compile(r'BACKGROUND', re.IGNORECASE),
+    'Summary': re.compile(r'.*SUMMARY', re.IGNORECASE),
+    'Description': re.compile(r'.*DESCRIPTION', re.IGNORECASE),
+    'Claims': re.compile(r'CLAIMS', re.IGNORECASE),
+    'Abstract': re.compile(r'ABSTRACT', re.IGNORECASE)
+}
+
+CLAIM_PATTERN = re.compile(r'\*\*Claim\s+(\d+)\.\*\*\s+(.*?)(?=\*\*Claim\s+\d+\.\*\*|$)', re.DOTALL)
+PREAMBLE_PATTERN = re.compile(r'^A\s+\w+|^The\s+\w+|^\d+\.')
+
+# "a/an" introductions and "the" references in a single token stream. The
+# element words sit in a lookahead so that introductions appearing inside a
+# "the" element ("the a processor") are still indexed.
+ANTECEDENT_TOKEN_PATTERN = re.compile(
+    r'\b(the|an?)\s+(?=([a-z]+)(?:(\s+)([a-z]+))?)', re.IGNORECASE
+)
+
+KEYWORD_PATTERN = re.compile(r'\b[a-z]{2,}\b')
+
+TECHNICAL_TERM_PATTERNS = [
+    re.compile(r'\b\w+-\w+(?:-\w+)?\b', re.IGNORECASE),  # hyphenated terms
+    re.compile(r'\b(?:neural|machine|deep|artificial)\s+(?:network|learning|intelligence)\b', re.IGNORECASE),
+    re.compile(r'\b(?:data|image|signal|video)\s+(?:processing|compression|analysis)\b', re.IGNORECASE),
+    re.compile(r'\b(?:user|graphical)\s+interface\b', re.IGNORECASE),
+    re.compile(r'\b(?:computer|processor|memory|storage)\s+\w+\b', re.IGNORECASE),
+]
+
+COMMON_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'by', 'from', 'as', 'is', 'was', 'are', 'were', 'be',
+    'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will',
+    'would', 'should', 'could', 'may', 'might', 'can', 'this', 'that',
+    'these', 'those', 'it', 'its', 'which', 'what', 'who', 'when', 'where',
+    'why', 'how', 'said', 'such', 'other', 'also', 'into', 'through'
+})
+
+
+def count_block_words(text: str) -> tuple[int, bool]:
+    """Count words like count_words, and tell whether a markdown span is left open at the end.
+
+    A span is open when one of the markdown patterns could still match across
+    the end of text: an unclosed link, a '**', '*', '```' or '`' still waiting
+    for its closing marker, or a '#' run whose trailing whitespace reaches the
+    end. A block of a larger document that ends in a line break with no span
+    open holds exactly the words count_words finds in it as part of the whole
+    document, so a document can be counted block by block.
+    """
+    last = len(text) - 1
+    while last >= 0 and text[last].isspace():
+        last -= 1
+    open_span = last >= 0 and text[last] == '#'
+
+    # Each pass is skipped when the text cannot contain what it removes
+    # Remove markdown headers
+    if '#' in text:
+        text = MARKDOWN_HEADER_PATTERN.sub('', text)
+    # A '[' without a ']' after it, or a '](' without a ')' after it, may
+    # still become a link
+    bracket = text.rfind('[')
+    if bracket >= 0 and text.find(']', bracket) < 0:
+        open_span = True
+    target = text.rfind('](')
+    if target >= 0 and text.find(')', target) < 0:
+        open_span = True
+    # Remove markdown links but keep the text
+    if '](' in text:
+        text = MARKDOWN_LINK_PATTERN.sub(r'\1', text)
+    # Remove markdown bold/italic. Any unmatched '**' at the end of the last
+    # run, and any unmatched '*' at all, would pair with a later one.
+    if '*' in text:
+        text = MARKDOWN_BOLD_PATTERN.sub(r'\1', text)
+        asterisk = text.rfind('*')
+        if asterisk > 0 and text[asterisk - 1] == '*':
+            open_span = True
+        text = MARKDOWN_ITALIC_PATTERN.sub(r'\1', text)
+        if '*' in text:
+            open_span = True
+    # Remove code blocks, likewise for an unmatched '```' or '`'
+    if '`' in text:
+        text = MARKDOWN_CODE_BLOCK_PATTERN.sub('', text)
+        backtick = text.rfind('`')
+        if backtick > 1 and text[backtick - 2:backtick] == '``':
+            open_span = True
+        text = MARKDOWN_INLINE_CODE_PATTERN.sub('', text)
+        if '`' in text:
+            open_span = True
+    # Split on whitespace and count
+    words = text.split()
+    return len(words), open_span
+
+
+def count_words(text: str) -> int:
+    """Count words in text, excluding markdown formatting."""
+    return count_block_words(text)[0]
+
+
+def build_word_count_result(total_words: int, sections_found: dict[str, bool], file_name: str = "",
+                            sections: list[dict[str, Any]] | None = None) -> dict[str, Any]:
+    """Assemble the word count result from a total count and the sections found."""
+    result = {
+        "total_words": total_words,
+        "file_name": file_name,
+        "sections_found": sections_found,
+        "sections": sections or [],
+        "abstract_check": None
+    }
+
+    # Check if it's an abstract
+    if 'abstract' in file_name.lower() or sections_found.get('Abstract'):
+        max_words = 150
+        result["abstract_check"] = {
+            "max_allowed": max_words,
+            "current_count": total_words,
+            "within_limit": total_words <= max_words,
+            "remaining": max_words - total_words if total_words <= max_words else None,
+            "exceeds_by": total_words - max_words if total_words > max_words else None
+        }
+
+    return result
+
+
+def section_name(heading: str | None) -> str | None:
+    """The standard section a heading introduces, if any."""
+    if heading:
+        for name, pattern in SECTION_TITLE_PATTERNS.items():
+            if pattern.match(heading):
+                return name
+    return None
+
+
+def scan_sections(data, heading_pattern: re.Pattern = SECTION_HEADING_PATTERN) -> tuple[dict[str, bool], list[tuple[int, str | None]]]:
+    """Find the sections of a document in a single pass over its headings.
+
+    Works on text or, with a bytes version of SECTION_HEADING_PATTERN, on raw
+    or memory-mapped bytes. Returns which standard sections appear and the
+    boundaries of the sections: (offset, heading) pairs starting with
+    (0, None) for any text before the first heading.
+    """
+    sections_found = dict.fromkeys(SECTION_TITLE_PATTERNS, False)
+    boundaries = [(0, None)]
+
+    for match in heading_pattern.finditer(data):
+        spaces, title = match.groups()
+        if isinstance(title, bytes):
+            title = title.decode('utf-8', 'replace')
+        for name, pattern in SECTION_TITLE_PATTERNS.items():
+            if not sections_found[name] and pattern.match(title):
+                sections_found[name] = True
+
+        start = match.start()
+        at_line_start = start == 0 or data[start - 1:start] in ('\n', b'\n')
+        if not at_line_start or not spaces or match.end() != start + 2 + len(spaces):
+            continue
+        if start == 0:
+            boundaries[0] = (0, title.strip())
+        else:
+            boundaries.append((start, title.strip()))
+
+    return sections_found, boundaries
+
+
+def build_section(heading: str | None, start: int, end: int, word_count: int) -> dict[str, Any]:
+    """One entry of the section map: the heading, its standard section, character offsets and word count."""
+    return {
+        "heading": heading,
+        "section": section_name(heading),
+        "start": start,
+        "end": end,
+        "word_count": word_count
+    }
+
+
+def segment_sections(content: str) -> tuple[dict[str, bool], list[dict[str, Any]]]:
+    """Split a document at its "## " headings and count the words of each section.
+
+    A section that leaves a markdown span open (an emphasis or code span
+    running on past its end) is merged with the next one, so that the
+    section counts always add up to count_words on the whole document.
+    """
+    sections_found, boundaries = scan_sections(content)
+    ends = [start for start, _ in boundaries[1:]] + [len(content)]
+    sections = []
+    merged = None
+
+    for (start, heading), end in zip(boundaries, ends):
+        if merged:
+            start, heading = merged
+        if end == start and heading is None:
+            continue
+        word_count, open_span = count_block_words(content[start:end])
+        if open_span and end < len(content):
+            merged = (start, heading)
+            continue
+        merged = None
+        sections.append(build_section(heading, start, end, word_count))
+
+    return sections_found, sections
+
+
+def find_sections(content: str) -> dict[str, bool]:
+    """Check which standard patent sections appear in the document."""
+    return scan_sections(content)[0]
+
+
+def analyze_word_count(content: str, file_name: str = "") -> dict[str, Any]:
+    """Analyze word count in a patent document, reading it once for both sections and words."""
+    sections_found, sections = segment_sections(content)
+    total_words = sum(section["word_count"] for section in sections)
+    return build_word_count_result(total_words, sections_found, file_name, sections)
+
+
+def extract_claims(content: str) -> dict[int, str]:
+    """Extract individual claims from the document."""
+    claims = {}
+
+    for match in CLAIM_PATTERN.finditer(content):
+        claim_num = int(match.group(1))
+        claim_text = match.group(2).strip()
+        claims[claim_num] = claim_text
+
+    return claims
+
+
+def index_claim_elements(claim_text: str) -> tuple[set, list[tuple[str, Any]]]:
+    """Tokenize a claim once into its introduced elements and "the" references.
+
+    An "a/an" element matches any "the" element that is a prefix of it, so
+    the index holds every prefix of the introduced word (and of the second
+    word of a two-word element). Each reference then resolves with a single
+    set lookup instead of a rescan of the claim.
+    """
+    introduced = set()
+    references = []
+    resume_at = 0
+
+    for match in ANTECEDENT_TOKEN_PATTERN.finditer(claim_text):
+        article, first, space, second = match.groups()
+        first_lower = first.lower()
+
+        if article.lower() == 'the':
+            # References do not overlap: skip a "the" inside the previous element
+            if match.start() < resume_at:
+                continue
+            if second:
+                references.append((first + space + second, (first_lower, space, second.lower())))
+                resume_at = match.end(4)
+            else:
+                references.append((first, first_lower))
+                resume_at = match.end(2)
+        else:
+            introduced.update(first_lower[:i] for i in range(1, len(first_lower) + 1))
+            if second:
+                second_lower = second.lower()
+                introduced.update(
+                    (first_lower, space, second_lower[:i]) for i in range(1, len(second_lower) + 1)
+                )
+
+    return introduced, references
+
+
+def report_antecedent_issues(references: list[tuple[str, Any]], introduced: set | frozenset) -> list[str]:
+    """Report every "the" reference that has no matching introduced element."""
+    return [
+        f"Possible antecedent basis issue: 'the {element}' without prior 'a/an {element}'"
+        for element, key in references
+        if key not in introduced
+    ]
+
+
+def analyze_antecedent_basis(claim_text: str) -> list[str]:
+    """Check for antecedent basis issues."""
+    introduced, references = index_claim_elements(claim_text)
+    return report_antecedent_issues(references, introduced)
+
+
+def analyze_claim_structure(claim_num: int, claim_text: str) -> dict[str, Any]:
+    """Analyze claim structure and formatting."""
+    issues = []
+    warnings = []
+    suggestions = []
+
+    # Check for preamble
+    if not PREAMBLE_PATTERN.match(claim_text):
+        issues.append("Missing or unclear preamble")
+
+    # Check for transition phrase
+    has_transition = False
+    transition_type = None
+    if 'comprising' in claim_text.lower():
+        has_transition = True
+        transition_type = "comprising (open-ended)"
+    elif 'consisting of' in claim_text.lower():
+        has_transition = True
+        transition_type = "consisting of (closed)"
+    elif 'consisting essentially of' in claim_text.lower():
+        has_transition = True
+        transition_type = "consisting essentially of (partially closed)"
+
+    if not has_transition:
+        warnings.append("No clear transition phrase (comprising, consisting of, etc.)")
+
+    # Check claim length
+    word_count = len(claim_text.split())
+    if word_count > 200:
+        warnings.append(f"Very long ({word_count} words) - consider simplifying")
+
+    # Check for unclear antecedents
+    if claim_text.count('said') > 0:
+        suggestions.append("Consider replacing 'said' with 'the' for clarity")
+
+    return {
+        "issues": issues,
+        "warnings": warnings,
+        "suggestions": suggestions,
+        "word_count": word_count,
+        "transition_type": transition_type
+    }
+
+
+def find_parent_claim(claim_text: str) -> int | None:
+    """Return the number of the first claim this claim depends on, if any."""
+    references = parse_claim_references(claim_text)
+    return references[0] if references else None
+
+
+def check_claim_dependencies(claims: dict[int, str]) -> tuple[list[int], dict[int, list[int]]]:
+    """Split claims into independent claims and a referenced claim -> dependents map."""
+    graph = ClaimGraph.from_claims(claims)
+    return graph.independent, graph.children
+
+
+def resolve_introduced_elements(
+    claim_elements: dict[int, tuple[set, list]],
+    graph: ClaimGraph,
+    claim_nums: set[int] | None = None,
+    available: dict[int, frozenset] | None = None
+) -> dict[int, frozenset]:
+    """Compute the elements available to each claim, including those of its ancestors.
+
+    Walks the claims in topological order so that each claim's set is built
+    once from its parents' memoized sets. A multiple dependent claim only
+    inherits the elements introduced along every one of its alternatives.
+    Claims that are not reached from an independent claim (a reference to a
+    missing claim only, or a cycle) only see the elements they introduce
+    themselves.
+
+    With claim_nums, only those claims are resolved and the sets of the other
+    claims are read from (and the new ones written to) available.
+    """
+    available = {} if available is None else available
+
+    for claim_num in graph.order:
+        if claim_nums is not None and claim_num not in claim_nums:
+            continue
+        introduced = claim_elements[claim_num][0]
+        parents = graph.parents[claim_num]
+        if parents:
+            inherited = available[parents[0]].intersection(*(available[parent] for parent in parents[1:]))
+            available[claim_num] = inherited | introduced
+        else:
+            available[claim_num] = frozenset(introduced)
+
+    for claim_num, (introduced, _) in claim_elements.items():
+        if claim_num not in graph.depth and (claim_nums is None or claim_num in claim_nums):
+            available[claim_num] = frozenset(introduced)
+
+    return available
+
+
+def analyze_claims(content: str) -> dict[str, Any]:
+    """Analyze patent claims for structure, antecedent basis, and dependencies."""
+    with stage("claims.extract"):
+        claims = extract_claims(content)
+    return analyze_extracted_claims(claims)
+
+
+def analyze_extracted_claims(claims: dict[int, str]) -> dict[str, Any]:
+    """Analyze claims that have already been extracted from a document."""
+    if not claims:
+        return {
+            "error": "No claims found in document",
+            "claims_count": 0
+        }
+
+    with stage("claims.graph"):
+        graph = ClaimGraph.from_claims(claims)
+
+    result = {
+        "total_claims": len(claims),
+        "independent_claims": graph.independent,
+        "independent_count": len(graph.independent),
+        "dependent_count": len(claims) - len(graph.independent),
+        "dependency_graph": graph.summary(),
+    }
+
+    if use_pool(len(claims)):
+        # Families do not share elements or findings, so very large claim sets are split along them
+        with stage("claims.parallel"):
+            families = [[(claim_num, claims[claim_num]) for claim_num in family] for family in graph.families()]
+            result["claim_analysis"] = dict(sorted(map_in_chunks(analyze_claim_run, families)))
+    else:
+        result["claim_analysis"] = analyze_claim_set(claims, graph)
+
+    return result
+
+
+def analyze_claim_set(claims: dict[int, str], graph: ClaimGraph) -> dict[int, dict[str, Any]]:
+    """The analysis of every claim, in claim number order, given the claim set's dependency graph."""
+    with stage("claims.check"):
+        checked = check_claims(claims)
+
+    # Index each claim once; dependents inherit their ancestors' elements
+    with stage("claims.elements"):
+        claim_elements = {claim_num: elements for claim_num, (elements, _) in checked.items()}
+        available = resolve_introduced_elements(claim_elements, graph)
+
+    with stage("claims.per_claim"):
+        return {
+            claim_num: analyze_claim(
+                claim_num, claims[claim_num], claim_elements[claim_num][1], available[claim_num], graph,
+                structure=checked[claim_num][1]
+            )
+            for claim_num in sorted(claims.keys())
+        }
+
+
+def analyze_claim_run(claims: Sequence[tuple[int, str]]) -> list[tuple[int, dict[str, Any]]]:
+    """Analyze a run of whole claim families on their own, as a worker process does.
+
+    Only the findings are returned, which is all that has to travel back
+    from a worker.
+    """
+    claims = dict(claims)
+    return list(analyze_claim_set(claims, ClaimGraph.from_claims(claims)).items())
+
+
+def check_claim_texts(claims: Sequence[tuple[int, str]]) -> list[tuple[tuple[set, list], dict[str, Any]]]:
+    """Index the elements and check the structure of a run of claims, the checks that need only the claim text."""
+    return [(index_claim_elements(text), analyze_claim_structure(claim_num, text)) for claim_num, text in claims]
+
+
+def check_claims(claims: dict[int, str]) -> dict[int, tuple[tuple[set, list], dict[str, Any]]]:
+    """Elements and structure check of every claim."""
+    return dict(zip(claims, check_claim_texts(list(claims.items()))))
+
+
+def analyze_claim(
+    claim_num: int,
+    claim_text: str,
+    references: list[tuple[str, Any]],
+    available: set | frozenset,
+    graph: ClaimGraph,
+    structure: dict[str, Any] | None = None
+) -> dict[str, Any]:
+    """Analyze a single claim given the elements available to it and the claim set's dependency graph.
+
+    structure is the claim's analyze_claim_structure result, when already computed.
+    """
+    # Determine claim type
+    dependencies = graph.references[claim_num]
+    claim_type = "dependent" if dependencies else "independent"
+    depends_on = dependencies[0] if dependencies else None
+
+    # Analyze structure
+    if structure is None:
+        structure = analyze_claim_structure(claim_num, claim_text)
+
+    # Check antecedent basis
+    antecedent_issues = report_antecedent_issues(references, available)
+
+    return {
+        "type": claim_type,
+        "depends_on": depends_on,
+        "dependencies": dependencies,
+        "dependency_issues": graph.issues.get(claim_num, []),
+        "word_count": structure["word_count"],
+        "transition_type": structure["transition_type"],
+        "structure_issues": structure["issues"],
+        "warnings": structure["warnings"],
+        "suggestions": structure["suggestions"],
+        "antecedent_issues": antecedent_issues
+    }
+
+
+def extract_keywords(text: str) -> list[str]:
+    """Extract potential keywords from text."""
+    # Extract words (2+ characters, alphabetic)
+    words = KEYWORD_PATTERN.findall(text.lower())
+
+    # Filter out common words
+    keywords = [w for w in words if w not in COMMON_WORDS]
+
+    return keywords
+
+
+def extract_technical_terms(text: str) -> list[str]:
+    """Extract multi-word technical terms."""
+    technical_terms = set()
+
+    for pattern in TECHNICAL_TERM_PATTERNS:
+        for match in pattern.finditer(text):
+            technical_terms.add(match.group(0))
+
+    return sorted(technical_terms)
+
+
+def rank_keywords(keywords: list[str], limit: int = 20) -> list[dict[str, Any]]:
+    """The most significant keywords with their frequencies.
+
+    Keywords are ranked by frequency, or by TF-IDF when an IDF table is
+    configured (PATENT_TOOLS_IDF_TABLE, see idf), in which case each entry
+    also carries its "tf_idf" score.
+    """
+    keyword_freq = Counter(keywords)
+    table = default_idf_table()
+    if table is None:
+        return [{"keyword": k, "frequency": v} for k, v in keyword_freq.most_common(limit)]
+
+    idf = table.idf
+    scored = heapq.nlargest(limit, ((v * idf(k), k, v) for k, v in keyword_freq.items()), key=lambda item: item[0])
+    return [{"keyword": k, "frequency": v, "tf_idf": round(score, 4)} for score, k, v in scored]
+
+
+def generate_boolean_queries(keywords: list[str], max_keywords: int = 5) -> list[str]:
+    """Generate Boolean search queries."""
+    queries = []
+
+    top_keywords = [kw["keyword"] for kw in rank_keywords(keywords, max_keywords)]
+
+    if len(top_keywords) >= 2:
+        # AND query with top keywords
+        queries.append(" AND ".join(top_keywords))
+
+        # OR variations
+        queries.append(" OR ".join(top_keywords[:3]))
+
+        # Mixed queries
+        if len(top_keywords) >= 3:
+            queries.append(f"{top_keywords[0]} AND ({top_keywords[1]} OR {top_keywords[2]})")
+
+    return queries
+
+
+def suggest_cpc_classifications(text: str) -> list[dict[str, Any]]:
+    """Suggest CPC subclasses whose keywords appear in the text, with hit counts."""
+    return default_matcher().classify(text)
+
+
+def generate_prior_art_search(content: str, index_path: str | None = None, max_hits: int = 5) -> dict[str, Any]:
+    """Generate prior art search strategy.
+
+    With index_path, the Boolean queries are also run against that local
+    full-text index (see search_index) and the ranked hits are returned
+    under "local_search". An index that is missing or cannot be read is
+    reported there as {"index_path": ..., "error": ...} and the rest of the
+    search strategy is returned as usual.
+    """
+    with stage("prior_art.keywords"):
+        keywords = extract_keywords(content)
+        technical_terms = extract_technical_terms(content)
+        queries = generate_boolean_queries(keywords)
+        top_keywords = rank_keywords(keywords)
+    with stage("prior_art.proximity"):
+        proximity_queries = generate_proximity_queries(content, [kw["keyword"] for kw in top_keywords])
+    with stage("prior_art.cpc"):
+        cpcs = suggest_cpc_classifications(content)
+
+    result = {
+        "recommended_databases": [
+            "USPTO Patent Full-Text Database (https://patft.uspto.gov/)",
+            "Google Patents (https://patents.google.com/)",
+            "Espacenet (https://worldwide.espacenet.com/)",
+            "WIPO PatentScope (https://patentscope.wipo.int/)",
+            "IEEE Xplore (for non-patent literature)",
+            "Google Scholar (for academic papers)"
+        ],
+        "top_keywords": top_keywords,
+        "technical_terms": technical_terms,
+        "boolean_queries": queries,
+        "proximity_queries": proximity_queries,
+        "suggested_cpc_classifications": cpcs,
+        "search_strategy": [
+            "Start with keyword searches using the first Boolean query",
+            "Review results and refine keywords",
+            "Add CPC classification filters",
+            "Search non-patent literature",
+            "Review citations from relevant patents",
+            "Document all searches in prior-art-analysis.md"
+        ]
+    }
+
+    if index_path:
+        from .search_index import search_prior_art
+        with stage("prior_art.local_search"):
+            try:
+                result["local_search"] = search_prior_art(index_path, queries, max_hits)
+            except (OSError, ValueError) as e:
+                result["local_search"] = {"index_path": str(index_path), "error": str(e)}
+
+    return result
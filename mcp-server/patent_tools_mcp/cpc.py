@@ -0,0 +1,302 @@
+"""
+CPC classification matching over a loadable keyword table.
+
+The keyword table maps CPC subclasses to keyword phrases. It is compiled once
+into an Aho-Corasick automaton over word tokens, so a document is scanned in
+a single pass and every occurrence of every keyword is found, no matter how
+many subclasses the table holds. Keywords match whole words, and each word
+is reduced to its singular form on both sides, so "gate electrode" also finds
+"gate electrodes".
+
+The built-in table lives in data/cpc_keywords.json and includes the H01L
+terms of docs/h01l-terminology-reference.md. Extra tables (JSON objects of
+subclass -> keywords, or tab-separated "subclass<TAB>keyword" lines) can be
+merged in through PATENT_TOOLS_CPC_TABLE, a list of paths separated by the
+platform path separator.
+"""
+
+import os
+import re
+import sys
+import json
+import hashlib
+import argparse
+from collections import deque
+from pathlib import Path
+from typing import Any, Iterable
+
+
+BUILTIN_TABLE_PATH = Path(__file__).parent / "data" / "cpc_keywords.json"
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+# The same tokens found in text that has not been lowercased, to keep character offsets
+WORD_PATTERN = re.compile(r'[a-z0-9]+', re.IGNORECASE)
+
+# Bold first-column terms of the tables in the terminology reference
+TERMINOLOGY_TERM_PATTERN = re.compile(r'^\|\s*\*\*([^*|]+)\*\*\s*\|', re.MULTILINE)
+
+# The abbreviation table ("| Abbreviation | Full Term |") and its rows
+TERMINOLOGY_ABBREVIATION_TABLE_PATTERN = re.compile(r'^\|\s*Abbreviation\s*\|.*\n\|[-| ]+\|\n((?:\|.*\|\n?)+)', re.MULTILINE)
+TERMINOLOGY_ROW_PATTERN = re.compile(r'^\|\s*([^|]+?)\s*\|\s*([^|]+?)\s*\|', re.MULTILINE)
+
+PARENTHETICAL_PATTERN = re.compile(r'\s*\(([^)]+)\)')
+
+# Terms of the reference that are everyday words outside semiconductor text
+GENERIC_TERMS = frozenset({
+    'base', 'contact', 'diffusion', 'emitter', 'mask', 'pitch', 'plug',
+    'spacing', 'subtractive', 'thickness', 'trace', 'via', 'wiring'
+})
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase word tokens, the alphabet of the automaton."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def normalize_token(token: str) -> str:
+    """Reduce a regular English plural to its singular: "gates" -> "gate", "processes" -> "process"."""
+    if len(token) <= 3 or not token.endswith('s') or token.endswith('ss'):
+        return token
+    if token.endswith(('sses', 'xes', 'ches', 'shes')):
+        return token[:-2]
+    return token[:-1]
+
+
+def terminology_keywords(text: str) -> list[str]:
+    """Extract keyword phrases from a terminology reference written as markdown tables.
+
+    Every bolded term in a table's first column is a keyword; a parenthesized
+    abbreviation ("lightly doped drain (LDD)") becomes a keyword of its own.
+    Rows of the abbreviation table contribute both the abbreviation and its
+    expansion.
+    """
+    keywords = {}
+
+    def add(term: str):
+        term = term.strip()
+        if term and term.lower() not in GENERIC_TERMS:
+            keywords.setdefault(term.lower(), term)
+
+    for match in TERMINOLOGY_TERM_PATTERN.finditer(text):
+        term = match.group(1)
+        for abbreviation in PARENTHETICAL_PATTERN.findall(term):
+            add(abbreviation)
+        add(PARENTHETICAL_PATTERN.sub('', term))
+
+    for table in TERMINOLOGY_ABBREVIATION_TABLE_PATTERN.finditer(text):
+        for row in TERMINOLOGY_ROW_PATTERN.finditer(table.group(1)):
+            abbreviation, expansion = row.groups()
+            add(abbreviation)
+            add(expansion)
+
+    return list(keywords.values())
+
+
+def load_cpc_table(path: str | Path) -> dict[str, list[str]]:
+    """Load a keyword table from a JSON object or a tab-separated file."""
+    path = Path(path)
+    text = path.read_text(encoding='utf-8')
+
+    if path.suffix.lower() == '.json':
+        table = json.loads(text)
+        return {code: list(keywords) for code, keywords in table.items()}
+
+    table = {}
+    for line in text.splitlines():
+        if not line.strip() or line.startswith('#'):
+            continue
+        code, _, keyword = line.partition('\t')
+        if keyword.strip():
+            table.setdefault(code.strip(), []).append(keyword.strip())
+    return table
+
+
+def merge_tables(tables: Iterable[dict[str, list[str]]]) -> dict[str, list[str]]:
+    """Union the keywords of several tables, keeping the first-seen order."""
+    merged = {}
+    for table in tables:
+        for code, keywords in table.items():
+            existing = merged.setdefault(code, [])
+            existing.extend(keyword for keyword in keywords if keyword not in existing)
+    return merged
+
+
+class PhraseMatcher:
+    """Aho-Corasick automaton over the word tokens of every keyword in a table of code -> keywords."""
+
+    def __init__(self, table: dict[str, list[str]]):
+        self.table = table
+        self.keyword_count = 0
+        # goto[state] maps a token to the next state; state 0 is the root
+        self._goto = [{}]
+        self._outputs = {}
+        self._token_counts = {}
+
+        for code, keywords in table.items():
+            for keyword in keywords:
+                tokens = [normalize_token(token) for token in tokenize(keyword)]
+                if not tokens:
+                    continue
+                state = 0
+                for token in tokens:
+                    state = self._add_transition(state, token)
+                self._outputs.setdefault(state, []).append((code, keyword))
+                self._token_counts[keyword] = len(tokens)
+                self.keyword_count += 1
+
+        self._fail = self._build_failure_links()
+
+    def _add_transition(self, state: int, token: str) -> int:
+        transitions = self._goto[state]
+        if token not in transitions:
+            transitions[token] = len(self._goto)
+            self._goto.append({})
+        return transitions[token]
+
+    def _build_failure_links(self) -> list[int]:
+        """Point each state at the longest proper suffix that is also a trie path."""
+        fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+
+        while queue:
+            state = queue.popleft()
+            for token, target in self._goto[state].items():
+                queue.append(target)
+
+                fallback = fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = fail[fallback]
+                fail[target] = self._goto[fallback].get(token, 0)
+
+                # A state also emits every keyword that ends at its failure state
+                inherited = self._outputs.get(fail[target])
+                if inherited:
+                    self._outputs[target] = self._outputs.get(target, []) + inherited
+
+        return fail
+
+    def scan(self, text: str) -> dict[str, dict[str, int]]:
+        """Count every keyword occurrence in one pass, grouped by code."""
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+        state_hits = {}
+        # A document repeats a small vocabulary, so normalize each distinct word once
+        normalized = {}
+        state = 0
+
+        for word in tokenize(text):
+            token = normalized.get(word)
+            if token is None:
+                token = normalized[word] = normalize_token(word)
+            transitions = goto[state]
+            while state and token not in transitions:
+                state = fail[state]
+                transitions = goto[state]
+            state = transitions.get(token, 0)
+
+            if state in outputs:
+                state_hits[state] = state_hits.get(state, 0) + 1
+
+        # Expand to keywords once per matched state rather than once per hit
+        counts = {}
+        for state, hits in state_hits.items():
+            for code, keyword in outputs[state]:
+                keyword_counts = counts.setdefault(code, {})
+                keyword_counts[keyword] = keyword_counts.get(keyword, 0) + hits
+
+        return counts
+
+    def find(self, text: str) -> list[tuple[int, int, str, str]]:
+        """Every keyword occurrence in one pass, as (start, end, code, keyword) with character offsets."""
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+        token_counts = self._token_counts
+        normalized = {}
+        starts = []
+        found = []
+        state = 0
+
+        for match in WORD_PATTERN.finditer(text):
+            word = match.group()
+            token = normalized.get(word)
+            if token is None:
+                token = normalized[word] = normalize_token(word.lower())
+            starts.append(match.start())
+            transitions = goto[state]
+            while state and token not in transitions:
+                state = fail[state]
+                transitions = goto[state]
+            state = transitions.get(token, 0)
+
+            if state in outputs:
+                for code, keyword in outputs[state]:
+                    found.append((starts[-token_counts[keyword]], match.end(), code, keyword))
+
+        return found
+
+
+class CPCMatcher(PhraseMatcher):
+    """Phrase matcher over a CPC keyword table, ranking subclasses by their keyword hits."""
+
+    def __init__(self, table: dict[str, list[str]]):
+        super().__init__(table)
+        # Digest of the table, so that cached results change with PATENT_TOOLS_CPC_TABLE
+        self.version = hashlib.blake2b(
+            json.dumps(table, sort_keys=True).encode('utf-8'), digest_size=8
+        ).hexdigest()
+
+    def classify(self, text: str) -> list[dict[str, Any]]:
+        """Every matching subclass with its hit counts, most hits first."""
+        suggestions = []
+
+        for code, keyword_counts in self.scan(text).items():
+            matched = sorted(keyword_counts.items(), key=lambda item: (-item[1], item[0]))
+            suggestions.append({
+                "classification": code,
+                "hits": sum(keyword_counts.values()),
+                "matched_keyword": matched[0][0],
+                "matched_keywords": dict(matched)
+            })
+
+        suggestions.sort(key=lambda suggestion: (-suggestion["hits"], suggestion["classification"]))
+        return suggestions
+
+
+_default_matcher = None
+
+
+def default_matcher() -> CPCMatcher:
+    """The matcher for the built-in table plus PATENT_TOOLS_CPC_TABLE, compiled on first use."""
+    global _default_matcher
+    if _default_matcher is None:
+        tables = [load_cpc_table(BUILTIN_TABLE_PATH)]
+        for path in os.environ.get("PATENT_TOOLS_CPC_TABLE", "").split(os.pathsep):
+            if path:
+                tables.append(load_cpc_table(path))
+        _default_matcher = CPCMatcher(merge_tables(tables))
+    return _default_matcher
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build a CPC keyword table, optionally adding the terms of a terminology reference."
+    )
+    parser.add_argument("tables", nargs="*", help="Keyword tables to merge (JSON or tab-separated)")
+    parser.add_argument("--terminology", help="Markdown terminology reference to extract keywords from")
+    parser.add_argument("--classification", default="H01L", help="Subclass for the terminology keywords (default: H01L)")
+    args = parser.parse_args()
+
+    tables = [load_cpc_table(path) for path in args.tables]
+    if args.terminology:
+        text = Path(args.terminology).read_text(encoding='utf-8')
+        tables.append({args.classification: terminology_keywords(text)})
+
+    json.dump(merge_tables(tables), sys.stdout, indent=2, ensure_ascii=False)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+"""
+Local daemon for the command line tools.
+
+Each run of tools/claim-analyzer.py, word-count.py or prior-art-search.py
+pays for interpreter startup, imports and building the CPC automaton and
+IDF table before doing any work. The daemon keeps one process with all of
+that loaded and serves the tools over a Unix socket: the tools call
+forward() first, which hands the arguments to a running daemon and prints
+its output, and run in process as before when there is none.
+
+The protocol is one JSON line each way, so editor integrations can talk to
+the socket directly:
+
+    -> {"tool": "claim-analyzer", "args": ["claims.md"], "cwd": "/drafts",
+        "env": {"PATENT_TOOLS_PRIOR_ART_INDEX": "/drafts/index.json"}}
+    <- {"stdout": "...", "stderr": "", "exit_code": 0}
+
+Requests run one at a time, in the request's working directory and with
+the request's PATENT_TOOLS_* settings, with the tool's output captured.
+The CPC, IDF and terminology tables are loaded once, so a request whose
+settings for them differ from the daemon's is refused with {"refused":
+reason} and the tool runs in process instead. A request without "env" runs
+with the daemon's settings.
+
+The socket is only accessible to its owner, and clients only talk to a
+socket owned by, and a daemon running as, their own user.
+
+    python -m patent_tools_mcp.daemon start     # serve in the foreground
+    python -m patent_tools_mcp.daemon status
+    python -m patent_tools_mcp.daemon stop
+
+    PATENT_TOOLS_SOCKET   socket path (default: patent-tools-<uid>.sock in
+                          $XDG_RUNTIME_DIR, or daemon.sock in a private
+                          patent-tools-<uid> directory under the temporary
+                          directory)
+    PATENT_TOOLS_DAEMON   "off" to always run the tools in process
+"""
+
+import io
+import os
+import sys
+import json
+import stat
+import time
+import socket
+import struct
+import argparse
+import tempfile
+import traceback
+import socketserver
+import importlib.util
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from typing import Any
+
+
+TOOLS_DIR = Path(__file__).resolve().parent.parent.parent / "tools"
+
+# Tools the daemon serves, by name
+TOOL_SCRIPTS = {
+    "claim-analyzer": "claim-analyzer.py",
+    "word-count": "word-count.py",
+    "prior-art-search": "prior-art-search.py"
+}
+
+# Arguments that keep a tool running, which therefore always runs in process
+LONG_RUNNING_ARGS = frozenset({"--watch"})
+
+# Seconds a client waits to connect before running in process
+CONNECT_TIMEOUT = 0.5
+
+# Seconds the daemon waits for a connected client to send or read a line
+REQUEST_TIMEOUT = 5.0
+
+# Settings read once when the daemon loads its tables; runs that need other values run in process
+LOADED_SETTINGS = ("PATENT_TOOLS_CPC_TABLE", "PATENT_TOOLS_IDF_TABLE", "PATENT_TOOLS_TERMINOLOGY")
+
+# Settings that choose the daemon rather than configure a run
+DAEMON_SETTINGS = ("PATENT_TOOLS_SOCKET", "PATENT_TOOLS_DAEMON")
+
+
+def _private_socket_directory() -> str:
+    return os.path.join(tempfile.gettempdir(), f"patent-tools-{os.getuid()}")
+
+
+def socket_path() -> str:
+    """The daemon's socket, from PATENT_TOOLS_SOCKET or per user in the runtime directory."""
+    path = os.environ.get("PATENT_TOOLS_SOCKET")
+    if path:
+        return path
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        return os.path.join(runtime, f"patent-tools-{os.getuid()}.sock")
+    # The temporary directory is shared, so the socket goes in a directory no one else can write to
+    return os.path.join(_private_socket_directory(), "daemon.sock")
+
+
+def private_directory(path: str) -> None:
+    """Create a directory only this user can access, or check that an existing one is."""
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise PermissionError(f"{path} is not a directory accessible only to its owner")
+
+
+def tool_environment(environ=os.environ) -> dict[str, str]:
+    """The PATENT_TOOLS_* settings that configure a tool run."""
+    return {
+        name: value for name, value in environ.items()
+        if name.startswith("PATENT_TOOLS_") and name not in DAEMON_SETTINGS
+    }
+
+
+def _peer_uid(client: socket.socket) -> int | None:
+    """The user the process at the other end of a Unix socket runs as, where the platform says."""
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    credentials = client.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    return struct.unpack("3i", credentials)[1]
+
+
+def request(message: dict[str, Any], timeout: float | None = CONNECT_TIMEOUT) -> dict[str, Any] | None:
+    """Send one request to the daemon and return its reply, or None when no daemon of ours is listening."""
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    path = socket_path()
+    try:
+        # Arguments and settings are only sent to a daemon run by this user
+        if os.stat(path).st_uid != os.getuid():
+            return None
+    except OSError:
+        return None
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.settimeout(timeout)
+        try:
+            client.connect(path)
+        except OSError:
+            return None
+        peer = _peer_uid(client)
+        if peer is not None and peer != os.getuid():
+            return None
+        # Connected; the analysis itself may take as long as it takes
+        client.settimeout(None)
+        client.sendall(json.dumps(message).encode("utf-8") + b"\n")
+        with client.makefile("rb") as reply:
+            line = reply.readline()
+        return json.loads(line) if line else None
+    finally:
+        client.close()
+
+
+def forward(tool: str, args: list[str]) -> None:
+    """Run a tool in the daemon and exit with its status; return to run it here if the daemon cannot."""
+    if os.environ.get("PATENT_TOOLS_DAEMON") == "off" or LONG_RUNNING_ARGS.intersection(args):
+        return
+    reply = request({"tool": tool, "args": args, "cwd": os.getcwd(), "env": tool_environment()})
+    if reply is None or "refused" in reply:
+        return
+    sys.stdout.write(reply["stdout"])
+    sys.stderr.write(reply["stderr"])
+    sys.exit(reply["exit_code"])
+
+
+def load_tool(name: str):
+    """Import a tool script as a module, so that its main() can be called."""
+    path = TOOLS_DIR / TOOL_SCRIPTS[name]
+    spec = importlib.util.spec_from_file_location(f"patent_tools_cli_{name.replace('-', '_')}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class ToolDaemon(socketserver.UnixStreamServer):
+    """Serves tool runs one at a time with the tools, patterns and tables kept loaded."""
+
+    def __init__(self, path: str):
+        self.started = time.time()
+        self.served = 0
+        self.stopping = False
+        self.environment = tool_environment()
+        self.tools = {name: load_tool(name) for name in TOOL_SCRIPTS}
+
+        # Build what the first request would otherwise wait for
+        from .cpc import default_matcher
+        from .idf import default_idf_table
+        default_matcher()
+        default_idf_table()
+
+        # Created accessible to this user only
+        umask = os.umask(0o177)
+        try:
+            super().__init__(path, DaemonRequestHandler)
+        finally:
+            os.umask(umask)
+
+    def run_tool(self, name: str, args: list[str], cwd: str, env: dict[str, str] | None = None) -> dict[str, Any]:
+        """Call a tool's main() as if run from the command line, capturing its output and exit status.
+
+        env replaces the daemon's PATENT_TOOLS_* settings for the run; a run
+        whose table settings differ from the loaded tables is refused.
+        """
+        if name not in self.tools:
+            return {"stdout": "", "stderr": f"Error: unknown tool '{name}'\n", "exit_code": 2}
+        if env is None:
+            env = self.environment
+        env = tool_environment(env)
+        stale = [setting for setting in LOADED_SETTINGS if env.get(setting) != self.environment.get(setting)]
+        if stale:
+            return {"refused": f"{', '.join(stale)} differ from the daemon's"}
+
+        stdout, stderr = io.StringIO(), io.StringIO()
+        exit_code = 0
+        module = self.tools[name]
+        previous_cwd, previous_argv = os.getcwd(), sys.argv
+        previous_env = tool_environment()
+        try:
+            for setting in previous_env:
+                del os.environ[setting]
+            os.environ.update(env)
+            os.chdir(cwd)
+            sys.argv = [module.__file__, *args]
+            with redirect_stdout(stdout), redirect_stderr(stderr):
+                try:
+                    module.main()
+                except SystemExit as e:
+                    if isinstance(e.code, int) or e.code is None:
+                        exit_code = e.code or 0
+                    else:
+                        print(e.code, file=sys.stderr)
+                        exit_code = 1
+                except Exception:
+                    traceback.print_exc()
+                    exit_code = 1
+        except OSError as e:
+            print(f"Error: {e}", file=stderr)
+            exit_code = 1
+        finally:
+            os.chdir(previous_cwd)
+            sys.argv = previous_argv
+            for setting in tool_environment():
+                del os.environ[setting]
+            os.environ.update(previous_env)
+        self.served += 1
+        return {"stdout": stdout.getvalue(), "stderr": stderr.getvalue(), "exit_code": exit_code}
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "pid": os.getpid(),
+            "socket": self.server_address,
+            "uptime_seconds": round(time.time() - self.started, 1),
+            "requests_served": self.served,
+            "tools": sorted(self.tools)
+        }
+
+
+class DaemonRequestHandler(socketserver.StreamRequestHandler):
+
+    # Requests are served one at a time, so a client that stalls must not hold the daemon
+    timeout = REQUEST_TIMEOUT
+
+    def handle(self):
+        try:
+            line = self.rfile.readline()
+        except OSError:
+            return
+        if not line:
+            return
+        try:
+            message = json.loads(line)
+        except ValueError:
+            return
+        if not isinstance(message, dict):
+            return
+
+        command = message.get("command")
+        if command == "status":
+            reply = self.server.status()
+        elif command == "stop":
+            reply = {"stopping": True}
+        else:
+            env = message.get("env")
+            if env is not None and not isinstance(env, dict):
+                env = None
+            reply = self.server.run_tool(
+                message.get("tool"), list(message.get("args", [])), message.get("cwd") or "/",
+                {str(name): str(value) for name, value in env.items()} if env is not None else None
+            )
+        try:
+            self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+        except OSError:
+            # The client went away or stopped reading; the run is over either way
+            pass
+        if command == "stop":
+            self.server.stopping = True
+
+
+def serve(path: str):
+    """Serve tool runs on a Unix socket until stopped."""
+    if request({"command": "status"}) is not None:
+        print(f"Error: a daemon is already listening on {path}", file=sys.stderr)
+        sys.exit(1)
+    if os.path.dirname(path) == _private_socket_directory():
+        try:
+            private_directory(os.path.dirname(path))
+        except PermissionError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+    if os.path.exists(path):
+        # Left behind by a daemon that did not shut down cleanly
+        os.unlink(path)
+
+    # Tools run inside the daemon must not forward to it
+    os.environ["PATENT_TOOLS_DAEMON"] = "off"
+    with ToolDaemon(path) as daemon:
+        print(f"Serving {', '.join(sorted(daemon.tools))} on {path}", file=sys.stderr, flush=True)
+        try:
+            while not daemon.stopping:
+                daemon.handle_request()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.unlink(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the command line tools from a persistent local process.")
+    parser.add_argument("command", choices=["start", "stop", "status"],
+                        help="start: serve in the foreground; stop or status: ask a running daemon")
+    args = parser.parse_args()
+
+    if not hasattr(socket, "AF_UNIX"):
+        print("Error: Unix sockets are not available on this platform", file=sys.stderr)
+        sys.exit(1)
+
+    path = socket_path()
+    if args.command == "start":
+        serve(path)
+        return
+
+    reply = request({"command": args.command})
+    if reply is None:
+        print(f"No daemon is listening on {path}")
+        sys.exit(1)
+    if args.command == "status":
+        print(json.dumps(reply, indent=2))
+    else:
+        print("Daemon stopped")
+
+
+if __name__ == "__main__":
+    main()
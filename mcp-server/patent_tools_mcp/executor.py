@@ -0,0 +1,113 @@
+"""
+Worker pools that keep blocking tool work off the server's event loop.
+
+Every tool call runs its file reads, hashing, cache lookups and analysis in
+a worker thread, so one large document never stalls other requests or the
+protocol's keepalives, and concurrent calls overlap. The CPU-bound analysis
+itself can additionally be sent to a pool of worker processes so that calls
+run in parallel rather than taking turns on the GIL.
+
+    PATENT_TOOLS_EXECUTOR   "thread" (default) or "process"
+    PATENT_TOOLS_WORKERS    concurrent calls / worker processes (default: CPU count, at most 8)
+
+Process workers are started with "spawn", which is safe in a process that
+is already running threads, and are created on first use. A worker that dies
+(killed, out of memory) breaks its whole pool; the pool is then replaced and
+the call retried once on the new one.
+"""
+
+import os
+import asyncio
+import functools
+import threading
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable
+
+
+EXECUTOR_KINDS = ("thread", "process")
+
+DEFAULT_EXECUTOR = "thread"
+
+DEFAULT_MAX_WORKERS = 8
+
+# Fresh process pools a call is tried on after its pool broke
+PROCESS_POOL_RETRIES = 1
+
+
+def default_workers() -> int:
+    return min(os.cpu_count() or 1, DEFAULT_MAX_WORKERS)
+
+
+class AnalysisExecutor:
+    """A thread pool for blocking tool calls, and optionally a process pool for their analyses."""
+
+    def __init__(self, kind: str = DEFAULT_EXECUTOR, workers: int | None = None):
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"Unknown executor '{kind}'. Use one of: {', '.join(EXECUTOR_KINDS)}")
+        self.kind = kind
+        self.workers = workers or default_workers()
+        self._threads = None
+        self._processes = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_environment(cls) -> "AnalysisExecutor":
+        """Configure from PATENT_TOOLS_EXECUTOR and PATENT_TOOLS_WORKERS."""
+        workers = os.environ.get("PATENT_TOOLS_WORKERS")
+        return cls(
+            kind=os.environ.get("PATENT_TOOLS_EXECUTOR") or DEFAULT_EXECUTOR,
+            workers=int(workers) if workers else None
+        )
+
+    def _thread_pool(self) -> Executor:
+        with self._lock:
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="patent-tools")
+            return self._threads
+
+    def _process_pool(self) -> Executor:
+        with self._lock:
+            if self._processes is None:
+                self._processes = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._processes
+
+    def _discard_process_pool(self, pool: Executor):
+        """Drop a broken process pool, unless another call has replaced it already."""
+        with self._lock:
+            if self._processes is pool:
+                self._processes = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, function: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking function in a worker thread and wait for it without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._thread_pool(), functools.partial(function, *args))
+
+    def compute(self, function: Callable[..., Any], *args: Any) -> Any:
+        """Run a CPU-bound function from a worker thread, in a worker process when so configured.
+
+        The function and its arguments must be picklable in process mode.
+        """
+        if self.kind != "process":
+            return function(*args)
+
+        for attempt in range(PROCESS_POOL_RETRIES + 1):
+            pool = self._process_pool()
+            try:
+                return pool.submit(function, *args).result()
+            except BrokenProcessPool:
+                # The pool is unusable once a worker has died, whichever call it was running
+                self._discard_process_pool(pool)
+                if attempt == PROCESS_POOL_RETRIES:
+                    raise
+
+    def shutdown(self):
+        with self._lock:
+            for pool in (self._threads, self._processes):
+                if pool is not None:
+                    pool.shutdown(wait=True, cancel_futures=True)
+            self._threads = self._processes = None
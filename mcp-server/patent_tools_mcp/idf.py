@@ -0,0 +1,211 @@
+"""
+Inverse document frequency table for keyword ranking.
+
+Ranking keywords by raw frequency puts words every patent repeats ("layer",
+"first", "device") at the top. With a document-frequency table built from a
+local corpus, keywords are ranked by TF-IDF instead, so the words that set a
+draft apart from other patents come first.
+
+The table is a compact binary file that is memory-mapped rather than read,
+so it opens in well under a millisecond whatever the corpus size, and pages
+are only touched by the lookups that need them. It is an open-addressing
+hash table of 64-bit term hashes (CRC-32 and Adler-32 of the UTF-8 term)
+and 32-bit document frequencies, written in little-endian order:
+
+    header    magic, slot count, term count, document count
+    keys      slot count x uint64, 0 marks an empty slot
+    counts    slot count x uint32
+
+Terms are the keywords of core.extract_keywords. Build a table with
+
+    python -m patent_tools_mcp.idf /data/uspto-dump --pattern "*.txt" -o idf.bin
+
+and point PATENT_TOOLS_IDF_TABLE at it.
+"""
+
+import os
+import sys
+import math
+import mmap
+import zlib
+import struct
+import argparse
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Iterable
+
+
+MAGIC = b"PTIDF\x00\x00\x01"
+
+HEADER = struct.Struct("<8sIIQ")
+
+# Terms found in fewer documents than this are left out of the table; they
+# score almost the same as terms the table has never seen
+DEFAULT_MIN_DF = 2
+
+# Weights remembered per table before the memo is cleared
+IDF_MEMO_SIZE = 1 << 18
+
+
+def term_key(term: str) -> tuple[int, int]:
+    """The 64-bit key of a term and the CRC-32 that picks its first slot."""
+    data = term.encode("utf-8")
+    crc = zlib.crc32(data)
+    return (crc << 32 | zlib.adler32(data)) or 1, crc
+
+
+def write_idf_table(path: str | Path, document_frequencies: dict[str, int], documents: int):
+    """Write document frequencies to a table file, keeping the load factor at most one half."""
+    slots = 8
+    while slots < 2 * len(document_frequencies):
+        slots *= 2
+    mask = slots - 1
+    keys = array("Q", bytes(8 * slots))
+    counts = array("I", bytes(4 * slots))
+
+    for term, frequency in document_frequencies.items():
+        key, slot = term_key(term)
+        slot &= mask
+        while keys[slot] and keys[slot] != key:
+            slot = (slot + 1) & mask
+        # Two terms sharing a 64-bit hash keep the larger count
+        keys[slot] = key
+        counts[slot] = max(counts[slot], min(frequency, 0xFFFFFFFF))
+
+    if sys.byteorder != "little":
+        keys.byteswap()
+        counts.byteswap()
+
+    path = Path(path)
+    temporary = path.with_name(path.name + ".tmp")
+    with open(temporary, "wb") as f:
+        f.write(HEADER.pack(MAGIC, slots, len(document_frequencies), documents))
+        keys.tofile(f)
+        counts.tofile(f)
+    os.replace(temporary, path)
+
+
+class IDFTable:
+    """A memory-mapped document-frequency table."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            if stat.st_size < HEADER.size:
+                raise ValueError(f"'{self.path}' is not an IDF table. Build one with python -m patent_tools_mcp.idf.")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        # Size and modification time of the mapped file, so that cached results change with the table
+        self.version = [stat.st_size, stat.st_mtime_ns]
+
+        magic, slots, self.term_count, self.documents = HEADER.unpack_from(self._map)
+        if magic != MAGIC or slots & (slots - 1) or len(self._map) != HEADER.size + 12 * slots:
+            self._map.close()
+            raise ValueError(f"'{self.path}' is not an IDF table. Build one with python -m patent_tools_mcp.idf.")
+
+        self._mask = slots - 1
+        self._idf_memo = {}
+        keys_end = HEADER.size + 8 * slots
+        if sys.byteorder == "little":
+            # Views straight into the mapping; nothing is copied
+            self._keys = memoryview(self._map)[HEADER.size:keys_end].cast("Q")
+            self._counts = memoryview(self._map)[keys_end:].cast("I")
+        else:
+            self._keys = array("Q", self._map[HEADER.size:keys_end])
+            self._counts = array("I", self._map[keys_end:])
+            self._keys.byteswap()
+            self._counts.byteswap()
+
+    def close(self):
+        if isinstance(self._keys, memoryview):
+            self._keys.release()
+            self._counts.release()
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def document_frequency(self, term: str) -> int:
+        """Number of corpus documents containing a term (0 when it is not in the table)."""
+        key, slot = term_key(term)
+        keys = self._keys
+        mask = self._mask
+        slot &= mask
+        while True:
+            found = keys[slot]
+            if found == key:
+                return self._counts[slot]
+            if not found:
+                return 0
+            slot = (slot + 1) & mask
+
+    def idf(self, term: str) -> float:
+        """Smoothed inverse document frequency: ln((N + 1) / (df + 1)) + 1."""
+        weight = self._idf_memo.get(term)
+        if weight is None:
+            if len(self._idf_memo) >= IDF_MEMO_SIZE:
+                self._idf_memo.clear()
+            weight = self._idf_memo[term] = math.log((self.documents + 1) / (self.document_frequency(term) + 1)) + 1
+        return weight
+
+
+def count_document_frequencies(documents: Iterable[Iterable[str]]) -> tuple[Counter, int]:
+    """Count, for every term, the documents it appears in. Each document is given as its terms."""
+    frequencies = Counter()
+    count = 0
+    for terms in documents:
+        frequencies.update(set(terms))
+        count += 1
+    return frequencies, count
+
+
+_default_table = None
+_default_table_loaded = False
+
+
+def default_idf_table() -> IDFTable | None:
+    """The table at PATENT_TOOLS_IDF_TABLE, opened on first use, or None when it is not set."""
+    global _default_table, _default_table_loaded
+    if not _default_table_loaded:
+        path = os.environ.get("PATENT_TOOLS_IDF_TABLE")
+        _default_table = IDFTable(path) if path else None
+        _default_table_loaded = True
+    return _default_table
+
+
+def main():
+    # core loads this module for keyword ranking, so the corpus helpers are imported here
+    from .batch import collect_documents
+    from .core import extract_keywords
+
+    parser = argparse.ArgumentParser(description="Build an IDF table for keyword ranking from a corpus of documents.")
+    parser.add_argument("target", help="Directory (searched recursively), file or glob of documents")
+    parser.add_argument("--pattern", default="*.md", help="File pattern for directories (default: *.md)")
+    parser.add_argument("-o", "--output", required=True, help="Table file to write")
+    parser.add_argument("--min-df", type=int, default=DEFAULT_MIN_DF,
+                        help=f"Leave out terms found in fewer documents (default: {DEFAULT_MIN_DF})")
+    args = parser.parse_args()
+
+    paths = collect_documents(args.target, args.pattern)
+    if not paths:
+        parser.error(f"no documents found at '{args.target}'")
+
+    def keyword_sets():
+        for path in paths:
+            try:
+                yield extract_keywords(path.read_text(encoding="utf-8", errors="replace"))
+            except OSError as e:
+                print(f"Skipping {path}: {e}", file=sys.stderr)
+
+    frequencies, documents = count_document_frequencies(keyword_sets())
+    kept = {term: count for term, count in frequencies.items() if count >= args.min_df}
+    write_idf_table(args.output, kept, documents)
+    print(f"{len(kept)} terms from {documents} documents written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
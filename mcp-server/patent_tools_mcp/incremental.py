@@ -0,0 +1,141 @@
+"""
+Incremental re-analysis of edited claim sets.
+
+A ClaimSession remembers the last claim set it analyzed for one document,
+keyed by a hash of each claim's text. When the document is analyzed again,
+only claims whose text changed, and the claims that depend on them, are
+re-checked; everything else is reused. The result is identical to a full
+analyze_claims run on the same content.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any
+
+from .claim_graph import ClaimGraph, parse_claim_references
+from .core import analyze_claim, check_claims, resolve_introduced_elements
+from .metrics import stage
+
+
+DEFAULT_MAX_SESSIONS = 32
+
+
+def claim_digest(claim_text: str) -> bytes:
+    """Hash a claim's text to detect edits."""
+    return hashlib.blake2b(claim_text.encode('utf-8'), digest_size=16).digest()
+
+
+class ClaimSession:
+    """The last parsed claim set of one document and its per-claim results."""
+
+    def __init__(self):
+        # Held while analyzing, so concurrent calls for one document take turns
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget the remembered claim set."""
+        self.digests = {}
+        self.references = {}
+        self.elements = {}
+        self.structures = {}
+        self.available = {}
+        self.analysis = {}
+        self.last_reanalyzed = []
+
+    def analyze(self, claims: dict[int, str]) -> dict[str, Any]:
+        """Analyze extracted claims, re-checking only edited claims and their dependents."""
+        if not claims:
+            self.reset()
+            return {
+                "error": "No claims found in document",
+                "claims_count": 0
+            }
+
+        # Claims that were edited, added or removed
+        changed = {claim_num for claim_num in self.digests if claim_num not in claims}
+        edited = {}
+        digests = {}
+        for claim_num, claim_text in claims.items():
+            digest = claim_digest(claim_text)
+            digests[claim_num] = digest
+            if self.digests.get(claim_num) != digest:
+                changed.add(claim_num)
+                edited[claim_num] = claim_text
+                self.references[claim_num] = parse_claim_references(claim_text)
+
+        # Only the text of a claim goes into these, so they are redone for edited claims alone
+        with stage("claims.check"):
+            for claim_num, (elements, structure) in check_claims(edited).items():
+                self.elements[claim_num] = elements
+                self.structures[claim_num] = structure
+
+        for claim_num in list(self.digests):
+            if claim_num not in claims:
+                del self.references[claim_num], self.elements[claim_num], self.structures[claim_num]
+                self.available.pop(claim_num, None)
+                self.analysis.pop(claim_num, None)
+        self.digests = digests
+
+        with stage("claims.graph"):
+            graph = ClaimGraph({claim_num: self.references[claim_num] for claim_num in claims})
+
+        # Dependents inherit elements and dependency findings, so every
+        # descendant of a change is stale too, including the claims that
+        # referred to a claim number that was removed or added
+        stale = (changed | graph.descendants(changed)) & claims.keys()
+
+        with stage("claims.elements"):
+            resolve_introduced_elements(self.elements, graph, stale, self.available)
+
+        with stage("claims.per_claim"):
+            for claim_num in stale:
+                self.analysis[claim_num] = analyze_claim(
+                    claim_num, claims[claim_num], self.elements[claim_num][1], self.available[claim_num], graph,
+                    structure=self.structures[claim_num]
+                )
+        self.last_reanalyzed = sorted(stale)
+
+        return {
+            "total_claims": len(claims),
+            "independent_claims": graph.independent,
+            "independent_count": len(graph.independent),
+            "dependent_count": len(claims) - len(graph.independent),
+            "dependency_graph": graph.summary(),
+            "claim_analysis": {claim_num: self.analysis[claim_num] for claim_num in sorted(claims)}
+        }
+
+
+class ClaimSessionStore:
+    """Bounded set of claim sessions, evicting the least recently used document."""
+
+    def __init__(self, max_sessions: int = DEFAULT_MAX_SESSIONS):
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> ClaimSession:
+        """Return the session for a document, creating it on first use."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = self._sessions[session_id] = ClaimSession()
+                while len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+            self._sessions.move_to_end(session_id)
+            return session
+
+    def discard(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+
+claim_sessions = ClaimSessionStore()
+
+
+def analyze_claims_in_session(session_id: str, claims: dict[int, str]) -> dict[str, Any]:
+    """Analyze extracted claims against the remembered state of a session."""
+    session = claim_sessions.get(session_id)
+    with session.lock:
+        return session.analyze(claims)
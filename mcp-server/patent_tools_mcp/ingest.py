@@ -0,0 +1,215 @@
+"""
+Memory-mapped ingestion and streaming word counts for very large patent documents.
+
+A combined specification and appendix can run to tens of megabytes, and
+reading it into one string and then copying it through several re.sub passes
+uses several times its size in RAM. The helpers here memory-map the file and
+run the section and claim scans directly over the mapping, decoding only the
+claim texts and headings they extract. Words are counted by a streaming
+counter that takes the document in chunks of any size and only holds the
+text since the last line break where no markdown span was open, so bulk
+exports of hundreds of megabytes can be counted without loading them.
+
+Like the analysis core, this module only depends on the standard library so
+that the command line tools can use it without importing the MCP SDK.
+"""
+
+import re
+import mmap
+import codecs
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from . import core
+
+
+# Files at least this large are memory-mapped instead of read into memory
+STREAMING_THRESHOLD = 8 * 1024 * 1024
+
+# Size of the slices fed to the word counter, and how much text it gathers
+# before looking for a place to count up to
+BLOCK_SIZE = 1024 * 1024
+
+# Text the word counter holds at most while a markdown span stays open
+MAX_STREAM_BUFFER = 16 * BLOCK_SIZE
+
+
+def _bytes_pattern(pattern: re.Pattern) -> re.Pattern:
+    """Compile a text pattern from the analysis core for scanning raw bytes."""
+    return re.compile(pattern.pattern.encode('ascii'), pattern.flags & ~re.UNICODE)
+
+
+CLAIM_PATTERN = _bytes_pattern(core.CLAIM_PATTERN)
+
+SECTION_HEADING_PATTERN = _bytes_pattern(core.SECTION_HEADING_PATTERN)
+
+
+def decode_text(data: bytes) -> str:
+    """Decode UTF-8 bytes with the same newline translation as a text-mode open()."""
+    return data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+
+
+@contextmanager
+def map_document(path: str | Path) -> Iterator[mmap.mmap | bytes]:
+    """Memory-map a document read-only. Empty files yield empty bytes, which cannot be mapped."""
+    with open(path, 'rb') as f:
+        if Path(path).stat().st_size == 0:
+            yield b''
+            return
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield mapped
+        finally:
+            mapped.close()
+
+
+class StreamingWordCounter:
+    """Count the words of a document fed in chunks, exactly as core.count_words counts the whole text.
+
+    Chunks may be text, or UTF-8 bytes that are decoded incrementally with
+    the newline translation of a text-mode open(). The counter keeps the text
+    since the last line break at which core.count_block_words found no
+    markdown span open; everything before it has been counted and dropped.
+    A span left open for more than max_buffer characters, such as an
+    unclosed code fence, is cut anyway to bound memory, and the count may
+    then differ from count_words around the cut.
+    """
+
+    def __init__(self, block_size: int = BLOCK_SIZE, max_buffer: int = MAX_STREAM_BUFFER):
+        self.block_size = block_size
+        self.max_buffer = max_buffer
+        self.words = 0
+        self.characters = 0
+        self._pending = []
+        self._pending_size = 0
+        self._next_cut = block_size
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._carriage_return = False
+
+    def feed(self, chunk: str | bytes):
+        """Add the next chunk of the document."""
+        if isinstance(chunk, bytes):
+            chunk = self._decode(chunk)
+        if not chunk:
+            return
+        self.characters += len(chunk)
+        self._pending.append(chunk)
+        self._pending_size += len(chunk)
+        if self._pending_size >= self._next_cut:
+            self._cut()
+
+    def flush(self) -> bool:
+        """Count all text fed so far unless it ends inside an open markdown span. Returns whether it did."""
+        text = ''.join(self._pending)
+        word_count, open_span = core.count_block_words(text)
+        if open_span:
+            self._pending = [text]
+            return False
+        self._count(word_count, '')
+        return True
+
+    def close(self) -> int:
+        """Count the rest of the document and return its total word count."""
+        tail = self._decoder.decode(b'', final=True)
+        if self._carriage_return:
+            tail = '\r' + tail
+            self._carriage_return = False
+        if tail:
+            tail = tail.replace('\r\n', '\n').replace('\r', '\n')
+            self.characters += len(tail)
+            self._pending.append(tail)
+        self._count(core.count_words(''.join(self._pending)), '')
+        return self.words
+
+    def _decode(self, data: bytes) -> str:
+        text = self._decoder.decode(data)
+        if self._carriage_return:
+            text = '\r' + text
+        # Hold back a trailing CR in case the next chunk starts with its LF
+        self._carriage_return = text.endswith('\r')
+        if self._carriage_return:
+            text = text[:-1]
+        return text.replace('\r\n', '\n').replace('\r', '\n')
+
+    def _cut(self):
+        """Count up to the last paragraph or line break if no span is open there."""
+        text = ''.join(self._pending)
+        cut = text.rfind('\n\n') + 1 or text.rfind('\n') + 1
+        if cut:
+            word_count, open_span = core.count_block_words(text[:cut])
+            if not open_span:
+                self._count(word_count, text[cut:])
+                return
+        if len(text) >= self.max_buffer:
+            cut = cut or len(text)
+            self._count(core.count_words(text[:cut]), text[cut:])
+            return
+        self._pending = [text]
+        self._next_cut = len(text) + self.block_size
+
+    def _count(self, word_count: int, rest: str):
+        self.words += word_count
+        self._pending = [rest] if rest else []
+        self._pending_size = len(rest)
+        self._next_cut = len(rest) + self.block_size
+
+
+def count_streamed_words(chunks: Iterable[str | bytes]) -> int:
+    """Count the words of a document given as an iterable of text or UTF-8 byte chunks."""
+    counter = StreamingWordCounter()
+    for chunk in chunks:
+        counter.feed(chunk)
+    return counter.close()
+
+
+def find_sections(data: mmap.mmap | bytes) -> dict[str, bool]:
+    """Check which standard sections appear, scanning the mapping without copying it."""
+    return core.scan_sections(data, SECTION_HEADING_PATTERN)[0]
+
+
+def segment_sections(data: mmap.mmap | bytes) -> tuple[dict[str, bool], list[dict[str, Any]]]:
+    """Split a mapped document at its "## " headings and count the words of each section.
+
+    Each section is streamed through a word counter one slice at a time, and
+    like core.segment_sections, a section that leaves a markdown span open
+    is merged with the next one. Offsets are in characters of the decoded text.
+    """
+    sections_found, boundaries = core.scan_sections(data, SECTION_HEADING_PATTERN)
+    ends = [start for start, _ in boundaries[1:]] + [len(data)]
+    sections = []
+    offset = 0
+    counter = None
+
+    for (start, heading), end in zip(boundaries, ends):
+        if counter is None:
+            if end == start and heading is None:
+                continue
+            counter, section_heading = StreamingWordCounter(), heading
+        for block_start in range(start, end, BLOCK_SIZE):
+            counter.feed(data[block_start:min(block_start + BLOCK_SIZE, end)])
+        if end < len(data) and not counter.flush():
+            continue
+        counter.close()
+        sections.append(core.build_section(section_heading, offset, offset + counter.characters, counter.words))
+        offset += counter.characters
+        counter = None
+
+    return sections_found, sections
+
+
+def extract_claims(data: mmap.mmap | bytes) -> dict[int, str]:
+    """Extract individual claims, decoding only the text of each claim."""
+    claims = {}
+
+    for match in CLAIM_PATTERN.finditer(data):
+        claims[int(match.group(1))] = decode_text(match.group(2)).strip()
+
+    return claims
+
+
+def analyze_word_count_mapped(data: mmap.mmap | bytes, file_name: str = "") -> dict[str, Any]:
+    """Word count analysis over a memory-mapped document, one section and slice at a time."""
+    sections_found, sections = segment_sections(data)
+    total_words = sum(section["word_count"] for section in sections)
+    return core.build_word_count_result(total_words, sections_found, file_name, sections)
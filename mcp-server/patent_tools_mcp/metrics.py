@@ -0,0 +1,218 @@
+"""
+Per-stage timing of tool calls.
+
+Every tool call is timed as a whole and stage by stage: waiting for a
+worker, reading the document, the cache lookup, the analysis and its own
+stages (claim extraction, per-claim checks, ...) and formatting. Each
+duration goes into a latency histogram per tool and stage, from which the
+server stats report p50, p90 and p99.
+
+Stages are timed with stage(), which costs one clock read at each end and
+does nothing unless a call is being recorded on the current thread, so the
+analysis functions can be timed without being tied to the server. Work done
+in a worker process is recorded there and handed back with its result (see
+add_durations).
+
+    PATENT_TOOLS_STATS_INTERVAL   seconds between stats lines on stderr (default: off)
+"""
+
+import os
+import time
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+
+# Histogram buckets: durations below 2**MIN_EXPONENT ns share the first bucket,
+# then every power of two from about 1 µs to about 69 s is split into
+# SUB_BUCKETS, so that a percentile is off by at most 1 / SUB_BUCKETS
+MIN_EXPONENT = 10
+MAX_EXPONENT = 36
+SUB_BITS = 2
+SUB_BUCKETS = 1 << SUB_BITS
+BUCKET_COUNT = (MAX_EXPONENT - MIN_EXPONENT) * SUB_BUCKETS + 2
+
+REPORTED_PERCENTILES = (50, 90, 99)
+
+
+def bucket_index(duration_ns: int) -> int:
+    """The histogram bucket of a duration."""
+    exponent = duration_ns.bit_length() - 1
+    if exponent < MIN_EXPONENT:
+        return 0
+    if exponent >= MAX_EXPONENT:
+        return BUCKET_COUNT - 1
+    sub_bucket = (duration_ns >> (exponent - SUB_BITS)) & (SUB_BUCKETS - 1)
+    return (exponent - MIN_EXPONENT) * SUB_BUCKETS + sub_bucket + 1
+
+
+def bucket_upper_bound(index: int) -> int:
+    """The largest duration in nanoseconds that falls into a bucket."""
+    if index == 0:
+        return (1 << MIN_EXPONENT) - 1
+    exponent, sub_bucket = divmod(index - 1, SUB_BUCKETS)
+    exponent += MIN_EXPONENT
+    return ((SUB_BUCKETS + sub_bucket + 1) << (exponent - SUB_BITS)) - 1
+
+
+class LatencyHistogram:
+    """Log-linear histogram of durations with exact count, total, minimum and maximum."""
+
+    def __init__(self):
+        self.buckets = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = 0
+
+    def add(self, duration_ns: int):
+        self.buckets[bucket_index(duration_ns)] += 1
+        self.count += 1
+        self.total_ns += duration_ns
+        if self.min_ns is None or duration_ns < self.min_ns:
+            self.min_ns = duration_ns
+        if duration_ns > self.max_ns:
+            self.max_ns = duration_ns
+
+    def percentile(self, percent: float) -> int:
+        """Upper bound of the bucket holding the given percentile, capped at the maximum seen."""
+        if not self.count:
+            return 0
+        rank = max(1, -(-self.count * percent // 100))
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                return min(bucket_upper_bound(index), self.max_ns)
+        return self.max_ns
+
+    def summary(self) -> dict[str, Any]:
+        """Count and latencies in milliseconds."""
+        summary = {
+            "count": self.count,
+            "mean_ms": round(self.total_ns / self.count / 1e6, 3) if self.count else None
+        }
+        for percent in REPORTED_PERCENTILES:
+            summary[f"p{percent}_ms"] = round(self.percentile(percent) / 1e6, 3) if self.count else None
+        summary["max_ms"] = round(self.max_ns / 1e6, 3) if self.count else None
+        summary["total_ms"] = round(self.total_ns / 1e6, 3)
+        return summary
+
+
+class Recording:
+    """Stage durations (ns) and counters of one tool call, collected on the thread handling it."""
+
+    def __init__(self):
+        self.durations = {}
+        self.counters = {}
+
+
+_local = threading.local()
+
+
+@contextmanager
+def recording() -> Iterator[Recording]:
+    """Collect the stages timed on this thread until the block ends."""
+    previous = getattr(_local, "recording", None)
+    current = _local.recording = Recording()
+    try:
+        yield current
+    finally:
+        _local.recording = previous
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a stage of the call being recorded on this thread; a no-op otherwise.
+
+    A stage entered several times in one call adds up.
+    """
+    current = getattr(_local, "recording", None)
+    if current is None:
+        yield
+        return
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter_ns() - start
+        current.durations[name] = current.durations.get(name, 0) + elapsed
+
+
+def add_durations(durations: dict[str, int]):
+    """Add stage durations measured elsewhere, such as in a worker process, to the current call."""
+    current = getattr(_local, "recording", None)
+    if current is not None:
+        for name, elapsed in durations.items():
+            current.durations[name] = current.durations.get(name, 0) + elapsed
+
+
+def count(name: str, amount: int = 1):
+    """Count an event (an error, a cache hit) against the call being recorded on this thread."""
+    current = getattr(_local, "recording", None)
+    if current is not None:
+        current.counters[name] = current.counters.get(name, 0) + amount
+
+
+class ServerStats:
+    """Calls, counters and stage latency histograms per tool, shared by every worker thread."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started = time.time()
+            self._tools = {}
+
+    def record(self, tool: str, call: Recording, total_ns: int):
+        """Add one finished call: its total latency, stage durations and counters."""
+        with self._lock:
+            entry = self._tools.get(tool)
+            if entry is None:
+                entry = self._tools[tool] = {"calls": 0, "counters": {}, "stages": {}}
+            entry["calls"] += 1
+            for name, amount in call.counters.items():
+                entry["counters"][name] = entry["counters"].get(name, 0) + amount
+            for name, elapsed in (("total", total_ns), *call.durations.items()):
+                histogram = entry["stages"].get(name)
+                if histogram is None:
+                    histogram = entry["stages"][name] = LatencyHistogram()
+                histogram.add(elapsed)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Per-tool calls, counters and latency summaries of every stage, slowest total first."""
+        with self._lock:
+            tools = {
+                tool: {
+                    "calls": entry["calls"],
+                    **entry["counters"],
+                    "stages": {
+                        name: histogram.summary()
+                        for name, histogram in sorted(
+                            entry["stages"].items(), key=lambda item: (item[0] != "total", -item[1].total_ns)
+                        )
+                    }
+                }
+                for tool, entry in sorted(self._tools.items(), key=lambda item: -item[1]["stages"]["total"].total_ns)
+            }
+            return {"uptime_seconds": round(time.time() - self.started, 1), "tools": tools}
+
+    def log_line(self) -> str:
+        """One line with the calls and total p50/p99 of every tool."""
+        with self._lock:
+            parts = []
+            for tool, entry in sorted(self._tools.items()):
+                total = entry["stages"]["total"]
+                parts.append(
+                    f"{tool} calls={entry['calls']} "
+                    f"p50={total.percentile(50) / 1e6:.1f}ms p99={total.percentile(99) / 1e6:.1f}ms"
+                )
+            return "stats: " + ("; ".join(parts) if parts else "no calls")
+
+
+def stats_interval() -> float | None:
+    """Seconds between periodic stats lines, from PATENT_TOOLS_STATS_INTERVAL, or None when off."""
+    interval = os.environ.get("PATENT_TOOLS_STATS_INTERVAL")
+    return float(interval) if interval and float(interval) > 0 else None
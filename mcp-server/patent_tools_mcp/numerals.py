@@ -0,0 +1,270 @@
+"""
+Reference numeral consistency.
+
+Every element shown in the drawings keeps one reference numeral throughout
+the specification: "substrate 102" in one paragraph and "substrate 104" in
+another, or 102 for both the substrate and the gate electrode, draws a
+formal objection. Every "element numeral" pair ("the gate electrode 104",
+"fin 106a", "substrate (102)") is extracted in a single regular expression
+pass and indexed both ways, element to numerals and numeral to elements.
+
+The pass runs over the reversed text, so each match starts at a numeral and
+takes up to MAX_NAME_WORDS words before it; the element name is what is left
+after the last article, preposition or verb ("of the upper substrate" gives
+"upper substrate"), lowercase and singular. A shorter name used with the
+same numeral stands for the longer one ("the electrode 104" after "gate
+electrode 104"), so it neither conflicts with the longer name nor makes the
+bare "electrode" look renumbered.
+
+Two kinds of conflict are reported, with the line and context of each use:
+
+    numeral_reused      one numeral labels different elements
+    element_renumbered  one element appears with different numerals
+                        (102a and 102b are variants of 102, not a conflict)
+"""
+
+import re
+import sys
+import json
+import argparse
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+from .support import PHRASE_BREAK_WORDS, normalize_words
+
+
+# Words taken before a numeral; the element name is at most this long
+MAX_NAME_WORDS = 3
+
+# Uses listed with line and context per element and numeral of a conflict
+LISTED_OCCURRENCES = 5
+
+# Characters of context on each side of a reported use
+CONTEXT_CHARS = 40
+
+# On the reversed text: a numeral of up to four digits with an optional
+# letter suffix and primes (before an optional comma, full stop, semicolon or
+# closing parenthesis, and after an optional opening one), a space, and up to
+# MAX_NAME_WORDS whole words. Labels such as "Step 1:" or "[Feature 1]" are not matched.
+# A word is matched atomically, captured by a lookahead and consumed by a
+# backreference, so that no part of a word passes for a whole one (possessive
+# quantifiers would say the same, but need Python 3.11). Groups 1 to 3 are
+# the suffix, the digits and the words.
+NAME_WORD = r"(?=([A-Za-z][A-Za-z-]*))\%d(?![\w'])"
+REVERSED_PAIR_PATTERN = re.compile(
+    r" [,.;)]?('*[a-z]?)([0-9]{1,4})\(? (%s(?: %s){0,%d})" % (NAME_WORD % 4, NAME_WORD % 5, MAX_NAME_WORDS - 1)
+)
+
+# Words that end an element name rather than belong to it
+NAME_BREAK_WORDS = PHRASE_BREAK_WORDS | frozenset({
+    'about', 'above', 'again', 'all', 'also', 'any', 'approximately', 'around', 'below', 'both', 'can',
+    'contains', 'contain', 'could', 'either', 'every', 'exceeds', 'herein', 'least', 'less', 'may', 'more',
+    'most', 'nearly', 'not', 'only', 'other', 'per', 'shown', 'some', 'substantially', 'than', 'then',
+    'through', 'up', 'using', 'via', 'was', 'were', 'when', 'where', 'whether', 'will', 'within', 'without',
+    'would'
+})
+
+# Words before a number that make it a cross-reference or quantity, not a reference numeral
+NON_ELEMENT_WORDS = frozenset({
+    'chapter', 'claim', 'claims', 'col', 'column', 'columns', 'embodiment', 'eq', 'equation', 'equations',
+    'example', 'examples', 'fig', 'figs', 'figure', 'figures', 'line', 'lines', 'no', 'number', 'page',
+    'pages', 'paragraph', 'paragraphs', 'section', 'sections', 'table', 'tables', 'version'
+})
+
+
+def element_name(words: str) -> str | None:
+    """The element named by the words before a numeral, lowercase and singular, or None."""
+    name = []
+    for word in reversed(words.lower().split()):
+        if word in NAME_BREAK_WORDS:
+            break
+        name.append(word)
+    if not name or name[0] in NON_ELEMENT_WORDS:
+        return None
+    return " ".join(normalize_words(" ".join(reversed(name)))) or None
+
+
+def numeral_base(numeral: str) -> str:
+    """A numeral without its letter suffix and primes: 102 for 102a and 102'."""
+    return numeral.rstrip("'").rstrip("abcdefghijklmnopqrstuvwxyz")
+
+
+def numeral_sort_key(numeral: str) -> tuple[int, str]:
+    return int(numeral_base(numeral)), numeral
+
+
+def is_name_suffix(short: str, name: str) -> bool:
+    """Whether a name is a shorter way of saying another: "electrode" of "gate electrode"."""
+    return short == name or name.endswith(" " + short)
+
+
+# Line breaks that join lines for matching: not those before a numbered list item,
+# whose number would otherwise read as a numeral of the previous line's last words
+JOINED_LINE_BREAK = re.compile(r"\n(?![ \t]*[0-9])")
+
+
+class ReferenceNumeralIndex:
+    """Element and numeral pairs of a text, indexed both ways, with the position of every use."""
+
+    def __init__(self, text: str):
+        self.text = text
+        # Line breaks are spaces for matching, so a numeral ending a line is found too, and
+        # a trailing space lets the text end with one; offsets into the text are unchanged
+        self._reversed = (JOINED_LINE_BREAK.sub(" ", text) + " ")[::-1]
+
+        # One pass: raw (suffix, digits, words) of each match, all reversed, and where it starts
+        raw = {}
+        for match in REVERSED_PAIR_PATTERN.finditer(self._reversed):
+            key = match.group(1, 2, 3)
+            positions = raw.get(key)
+            if positions is None:
+                positions = raw[key] = []
+            positions.append(match.start())
+
+        # Each distinct match is decoded once
+        self.uses = {}
+        for (suffix, digits, words), positions in raw.items():
+            name = element_name(words[::-1])
+            if name is None:
+                continue
+            self.uses.setdefault((name, digits[::-1] + suffix[::-1]), []).extend(positions)
+
+        # Shorter names stand for the longest name they end, per numeral
+        names_by_numeral = {}
+        for name, numeral in self.uses:
+            names_by_numeral.setdefault(numeral, set()).add(name)
+        self.canonical = {}
+        for numeral, names in names_by_numeral.items():
+            for name in names:
+                longer = [other for other in names if is_name_suffix(name, other)]
+                self.canonical[name, numeral] = max(
+                    longer, key=lambda other: (len(other.split()), len(self.uses[other, numeral]), other)
+                )
+
+        self.by_numeral = {}
+        self.by_element = {}
+        for (name, numeral), positions in self.uses.items():
+            element = self.canonical[name, numeral]
+            self.by_numeral.setdefault(numeral, Counter())[element] += len(positions)
+            self.by_element.setdefault(element, Counter())[numeral] += len(positions)
+
+    def conflicts(self) -> list[dict[str, Any]]:
+        """Numerals labelling several elements, then elements carrying several numerals."""
+        conflicts = []
+        for numeral in sorted(self.by_numeral, key=numeral_sort_key):
+            elements = self.by_numeral[numeral]
+            if len(elements) > 1:
+                conflicts.append({
+                    "kind": "numeral_reused",
+                    "numeral": numeral,
+                    "uses": [self.describe(element, numeral) for element, _ in elements.most_common()]
+                })
+        for element in sorted(self.by_element):
+            numerals = self.by_element[element]
+            if len({numeral_base(numeral) for numeral in numerals}) > 1:
+                conflicts.append({
+                    "kind": "element_renumbered",
+                    "element": element,
+                    "uses": [self.describe(element, numeral) for numeral, _ in numerals.most_common()]
+                })
+        self._add_lines(conflicts)
+        return conflicts
+
+    def describe(self, element: str, numeral: str) -> dict[str, Any]:
+        """One element and numeral pair with the number of uses and the first few of them."""
+        positions = sorted(
+            position
+            for (name, name_numeral), uses in self.uses.items()
+            if name_numeral == numeral and self.canonical[name, numeral] == element
+            for position in uses
+        )
+        length = len(self._reversed)
+        occurrences = []
+        for position in positions[-LISTED_OCCURRENCES:][::-1]:
+            # Reversed positions run backwards through the text
+            match = REVERSED_PAIR_PATTERN.match(self._reversed, position)
+            start, end = length - match.end(), length - match.start(1)
+            occurrences.append({"start": start, "end": end})
+        return {"element": element, "numeral": numeral, "count": len(positions), "occurrences": occurrences}
+
+    def _add_lines(self, conflicts: list[dict[str, Any]]):
+        """Line numbers and context of the listed uses, counted in one pass in order of position."""
+        occurrences = sorted(
+            (occurrence for conflict in conflicts for use in conflict["uses"] for occurrence in use["occurrences"]),
+            key=lambda occurrence: occurrence["start"]
+        )
+        line = 1
+        position = 0
+        for occurrence in occurrences:
+            start, end = occurrence["start"], occurrence["end"]
+            line += self.text.count('\n', position, start)
+            position = start
+            occurrence["line"] = line
+            occurrence["context"] = " ".join(self.text[max(0, start - CONTEXT_CHARS):end + CONTEXT_CHARS].split())
+
+
+def check_reference_numerals(content: str) -> dict[str, Any]:
+    """Index the reference numerals of a document and report inconsistent ones."""
+    index = ReferenceNumeralIndex(content)
+    conflicts = index.conflicts()
+    return {
+        "references_found": sum(len(positions) for positions in index.uses.values()),
+        "element_count": len(index.by_element),
+        "numeral_count": len(index.by_numeral),
+        "conflict_count": len(conflicts),
+        "conflicts": conflicts,
+        "numerals": {
+            numeral: dict(index.by_numeral[numeral].most_common())
+            for numeral in sorted(index.by_numeral, key=numeral_sort_key)
+        },
+        "elements": {
+            element: dict(sorted(index.by_element[element].items(), key=lambda item: numeral_sort_key(item[0])))
+            for element in sorted(index.by_element)
+        }
+    }
+
+
+def format_conflict(conflict: dict[str, Any]) -> str:
+    """One line naming the conflicting uses, with the lines of all but the most common."""
+    uses = []
+    for rank, use in enumerate(conflict["uses"]):
+        label = f"'{use['element']}'" if conflict["kind"] == "numeral_reused" else use["numeral"]
+        detail = f"{use['count']}x"
+        if rank:
+            lines = ", ".join(str(occurrence["line"]) for occurrence in use["occurrences"])
+            detail += f", line{'s' if len(use['occurrences']) > 1 else ''} {lines}"
+            if use["count"] > len(use["occurrences"]):
+                detail += ", ..."
+        uses.append(f"{label} ({detail})")
+
+    if conflict["kind"] == "numeral_reused":
+        return f"Numeral {conflict['numeral']} used for " + " and ".join(uses)
+    return f"'{conflict['element']}' numbered " + " and ".join(uses)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that every element keeps one reference numeral.")
+    parser.add_argument("document", help="Specification or application to check")
+    parser.add_argument("--json", action="store_true", help="Print the result, with both indexes, as JSON")
+    args = parser.parse_args()
+
+    try:
+        content = Path(args.document).read_text(encoding='utf-8')
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    result = check_reference_numerals(content)
+    if args.json:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+        return
+
+    print(f"{result['references_found']} references to {result['numeral_count']} numerals, "
+          f"{result['conflict_count']} conflicts")
+    for conflict in result["conflicts"]:
+        print(f"✗ {format_conflict(conflict)}")
+
+
+if __name__ == "__main__":
+    main()
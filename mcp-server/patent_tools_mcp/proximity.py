@@ -0,0 +1,192 @@
+"""
+Proximity and phrase queries from term co-occurrence.
+
+ANDing the top keywords matches any document that mentions them anywhere;
+the professional databases also take proximity operators, which keep terms
+that belong together close together. The top keywords of a document are
+counted in every window of PROXIMITY_WINDOW words into a term x term x
+distance co-occurrence matrix, for all windows at once with NumPy: only
+the positions of the keywords are visited, one vectorized pass per lag.
+
+Distances are counted the way the search systems count them: every word
+and number takes a position, so "gate 104 electrode" is gate ADJ2
+electrode, and no window spans the end of a sentence or clause (. , ; : !
+? or a blank line).
+
+Pairs that co-occur much more often than their frequencies predict (local
+mutual information, count x log2(count / expected)) become queries, with
+the operator their co-occurrences call for:
+
+    "gate electrode"        the terms are almost always adjacent, in this order
+    gate ADJ3 dielectric    in this order, within the distance covering most uses
+    trench NEAR5 isolation  in either order, within that distance
+
+The syntax is that of the USPTO search systems; Espacenet and others have
+equivalents. Without NumPy the matrix is counted in pure Python, with the
+same results.
+"""
+
+import re
+import math
+from collections import Counter
+from typing import Any, Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Largest distance, in words, at which two terms count as co-occurring
+PROXIMITY_WINDOW = 5
+
+MAX_PROXIMITY_QUERIES = 8
+
+# Fewest co-occurrences for a pair to become a query
+MIN_PAIR_COUNT = 3
+
+# Share of a pair's co-occurrences in one order for an ordered (ADJ) query
+ORDERED_SHARE = 0.9
+
+# Share of a pair's co-occurrences that are adjacent, in order, for a phrase query
+PHRASE_SHARE = 0.8
+
+# Share of a pair's co-occurrences the distance of its query covers
+DISTANCE_COVERAGE = 0.8
+
+# Words and numbers of lowercase text, and the clause punctuation and blank lines between them
+PROXIMITY_TOKEN_PATTERN = re.compile(r'[a-z0-9]+|[.,;:!?]|\n(?=[ \t]*\n)')
+
+CLAUSE_BREAKS = ".,;:!?\n"
+
+# Token id of a clause break; other tokens are a term id, or -1 for other words
+BREAK = -2
+
+
+def cooccurrence_counts(ids: Sequence[int], term_count: int, window: int = PROXIMITY_WINDOW) -> dict[tuple[int, int, int], int]:
+    """Count the ordered term pairs of a token stream by distance.
+
+    ids holds the term of each word, -1 for words that are not terms, and
+    BREAK for clause breaks, which no co-occurrence spans. The result maps
+    (first term, second term, distance) to the number of times the first
+    occurs that many words before the second; pairs that never occur are
+    left out.
+    """
+    if np is None:
+        return _cooccurrence_counts_python(ids, window)
+
+    ids = np.asarray(ids, dtype=np.int64)
+    selected = np.flatnonzero(ids >= 0)
+    terms = ids[selected]
+    # Every break moves the words after it out of reach of those before
+    positions = selected + np.cumsum(ids == BREAK)[selected] * window
+    counts = np.zeros(term_count * term_count * window, dtype=np.int64)
+    # At most window term occurrences fit within a distance of window words
+    for lag in range(1, min(window, len(positions) - 1) + 1):
+        distance = positions[lag:] - positions[:-lag]
+        near = distance <= window
+        if not near.any():
+            break
+        keys = (terms[:-lag][near] * term_count + terms[lag:][near]) * window + distance[near] - 1
+        counts += np.bincount(keys, minlength=counts.size)
+
+    found = np.flatnonzero(counts)
+    pairs, distances = np.divmod(found, window)
+    firsts, seconds = np.divmod(pairs, term_count)
+    return {
+        (int(first), int(second), int(distance) + 1): int(count)
+        for first, second, distance, count in zip(firsts, seconds, distances, counts[found])
+    }
+
+
+def _cooccurrence_counts_python(ids: Sequence[int], window: int) -> dict[tuple[int, int, int], int]:
+    occurrences = []
+    shift = 0
+    for position, term in enumerate(ids):
+        if term >= 0:
+            occurrences.append((position + shift, term))
+        elif term == BREAK:
+            shift += window
+    counts = Counter()
+    for index, (position, term) in enumerate(occurrences):
+        for later, other in occurrences[index + 1:index + 1 + window]:
+            if later - position > window:
+                break
+            counts[term, other, later - position] += 1
+    return dict(counts)
+
+
+def pair_query(first: str, second: str, by_distance: dict[int, int], reverse: dict[int, int]) -> dict[str, Any]:
+    """The query for a pair, given its co-occurrences by distance in each order."""
+    forward_count = sum(by_distance.values())
+    count = forward_count + sum(reverse.values())
+    if by_distance.get(1, 0) >= PHRASE_SHARE * count:
+        return {"query": f'"{first} {second}"', "operator": "phrase", "distance": 1}
+    if forward_count >= ORDERED_SHARE * count:
+        distances = by_distance
+        operator = "ADJ"
+    else:
+        distances = Counter(by_distance) + Counter(reverse)
+        operator = "NEAR"
+
+    covered = 0
+    for distance in sorted(distances):
+        covered += distances[distance]
+        if covered >= DISTANCE_COVERAGE * count:
+            break
+    suffix = "" if operator == "ADJ" and distance == 1 else str(distance)
+    return {"query": f"{first} {operator}{suffix} {second}", "operator": operator, "distance": distance}
+
+
+def token_ids(text: str, terms: Sequence[str]) -> list[int]:
+    """The token stream of a text for cooccurrence_counts, with the index of each term in terms."""
+    lookup = dict.fromkeys(CLAUSE_BREAKS, BREAK)
+    lookup.update((term, index) for index, term in enumerate(terms))
+    return [lookup.get(token, -1) for token in PROXIMITY_TOKEN_PATTERN.findall(text.lower())]
+
+
+def generate_proximity_queries(
+    text: str,
+    terms: Sequence[str],
+    window: int = PROXIMITY_WINDOW,
+    limit: int = MAX_PROXIMITY_QUERIES
+) -> list[dict[str, Any]]:
+    """Proximity and phrase queries for the most strongly associated pairs of terms.
+
+    terms are the keywords of the text to pair up. Each query comes with
+    its two terms, operator, distance, co-occurrence count and association
+    score, strongest first.
+    """
+    ids = token_ids(text, terms)
+    counts = cooccurrence_counts(ids, len(terms), window)
+    word_count = len(ids) - ids.count(BREAK)
+
+    frequencies = Counter(term for term in ids if term >= 0)
+    by_pair = {}
+    for (first, second, distance), count in counts.items():
+        if first != second:
+            by_pair.setdefault((first, second), {})[distance] = count
+
+    scored = []
+    for (first, second), by_distance in by_pair.items():
+        reverse = by_pair.get((second, first), {})
+        forward_count, reverse_count = sum(by_distance.values()), sum(reverse.values())
+        # Each unordered pair once, from its more common order
+        if (reverse_count, first) > (forward_count, second):
+            continue
+        count = forward_count + reverse_count
+        if count < MIN_PAIR_COUNT:
+            continue
+        # Co-occurrences expected if the terms were placed independently
+        expected = frequencies[first] * frequencies[second] * 2 * window / word_count
+        if count <= expected:
+            continue
+        score = count * math.log2(count / expected)
+        scored.append((score, count, terms[first], terms[second], by_distance, reverse))
+
+    scored.sort(key=lambda item: (-item[0], item[2], item[3]))
+    queries = []
+    for score, count, first, second, by_distance, reverse in scored[:limit]:
+        query = pair_query(first, second, by_distance, reverse)
+        queries.append({**query, "terms": [first, second], "count": count, "score": round(score, 2)})
+    return queries
@@ -0,0 +1,294 @@
+"""
+Local full-text prior art search.
+
+Indexes a directory of patent documents, such as a bulk text dump, into an
+on-disk SQLite FTS5 inverted index and runs Boolean queries against it,
+ranking matches with BM25 and returning a snippet around the matched terms.
+SQLite ships with Python, so this needs no network and no extra packages.
+
+Indexing is incremental: a document is only re-read when its size or
+modification time changed, and documents deleted from the directory are
+dropped from the index. Words are stemmed (Porter), so "electrodes" matches
+a query for "electrode".
+
+The index used by generate_prior_art_search can be set with the
+PATENT_TOOLS_PRIOR_ART_INDEX environment variable.
+"""
+
+import os
+import re
+import sys
+import sqlite3
+import argparse
+from pathlib import Path
+from typing import Any, Iterable
+
+from .batch import collect_documents
+
+
+# Hits returned per query unless asked otherwise
+DEFAULT_MAX_HITS = 5
+
+# Tokens of context in each snippet
+SNIPPET_TOKENS = 24
+
+# Documents indexed between commits
+COMMIT_EVERY = 1000
+
+# BM25 weights of the title and body columns
+TITLE_WEIGHT = 2.0
+BODY_WEIGHT = 1.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS passages USING fts5(title, body, tokenize = 'porter unicode61');
+"""
+
+TITLE_PATTERN = re.compile(r'^#{1,2}\s+(.+?)\s*$', re.MULTILINE)
+
+# Parentheses, quoted phrases and bare terms of a Boolean query
+QUERY_TOKEN_PATTERN = re.compile(r'[()]|"[^"]*"|[^\s()"]+')
+
+QUERY_OPERATORS = frozenset({"AND", "OR", "NOT"})
+
+
+def default_index_path() -> str | None:
+    """The index configured through PATENT_TOOLS_PRIOR_ART_INDEX, if any."""
+    return os.environ.get("PATENT_TOOLS_PRIOR_ART_INDEX") or None
+
+
+def to_match_expression(query: str) -> str:
+    """Translate a Boolean query such as 'gate AND (oxide OR dielectric)' into FTS5 syntax.
+
+    AND, OR, NOT and parentheses are kept ("a AND NOT b" becomes FTS5's
+    binary "a NOT b"); every other term or quoted phrase is quoted, so words
+    like "near" are never taken for FTS5 operators.
+    """
+    parts = []
+    for token in QUERY_TOKEN_PATTERN.findall(query):
+        if token == "NOT" and parts and parts[-1] == "AND":
+            parts.pop()
+        if token in ("(", ")") or token in QUERY_OPERATORS:
+            parts.append(token)
+            continue
+        phrase = token.strip('"').strip()
+        if phrase:
+            parts.append('"' + phrase.replace('"', '""') + '"')
+    return " ".join(parts)
+
+
+def document_title(text: str, path: Path) -> str:
+    """The first top-level heading of a document, or its file name."""
+    match = TITLE_PATTERN.search(text, 0, 4096)
+    return match.group(1) if match else path.stem
+
+
+class PriorArtIndex:
+    """An on-disk full-text index of patent documents."""
+
+    def __init__(self, path: str | Path, create: bool = False):
+        self.path = Path(path)
+        if not create and not self.path.exists():
+            raise FileNotFoundError(f"Prior art index '{self.path}' not found. Build it with index_prior_art.")
+        if create:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.connection = sqlite3.connect(self.path)
+        if create:
+            # Searches are not blocked while the index is being updated
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            with self.connection:
+                self.connection.executescript(SCHEMA)
+            return
+
+        # A file that is not SQLite, or a database without the index tables, fails here rather than mid-search
+        try:
+            self.connection.execute("SELECT 1 FROM documents, passages LIMIT 0")
+        except sqlite3.DatabaseError as e:
+            self.connection.close()
+            raise ValueError(f"Prior art index '{self.path}' cannot be read: {e}") from e
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def document_count(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def update(self, target: str, pattern: str = "*.md") -> dict[str, int]:
+        """Bring the index up to date with a directory, file or glob of documents.
+
+        Only new and modified documents are read. Indexed documents under a
+        directory target that no longer exist are removed.
+        """
+        paths = [Path(os.path.abspath(path)) for path in collect_documents(target, pattern)]
+        known = {
+            path: (doc_id, size, mtime_ns)
+            for doc_id, path, size, mtime_ns in self.connection.execute(
+                "SELECT id, path, size, mtime_ns FROM documents"
+            )
+        }
+        stats = {"added": 0, "updated": 0, "unchanged": 0, "removed": 0, "failed": 0}
+        pending = 0
+
+        try:
+            for path in paths:
+                try:
+                    stat = path.stat()
+                    entry = known.get(str(path))
+                    if entry and entry[1:] == (stat.st_size, stat.st_mtime_ns):
+                        stats["unchanged"] += 1
+                        continue
+                    text = path.read_text(encoding='utf-8', errors='replace')
+                except OSError:
+                    stats["failed"] += 1
+                    continue
+
+                if entry:
+                    self._delete(entry[0])
+                    stats["updated"] += 1
+                else:
+                    stats["added"] += 1
+                cursor = self.connection.execute(
+                    "INSERT INTO documents(path, size, mtime_ns) VALUES(?, ?, ?)",
+                    (str(path), stat.st_size, stat.st_mtime_ns)
+                )
+                self.connection.execute(
+                    "INSERT INTO passages(rowid, title, body) VALUES(?, ?, ?)",
+                    (cursor.lastrowid, document_title(text, path), text)
+                )
+
+                pending += 1
+                if pending >= COMMIT_EVERY:
+                    self.connection.commit()
+                    pending = 0
+
+            root = Path(target)
+            if root.is_dir():
+                prefix = os.path.join(os.path.abspath(root), '')
+                seen = {str(path) for path in paths}
+                for path, (doc_id, _, _) in known.items():
+                    if path.startswith(prefix) and path not in seen:
+                        self._delete(doc_id)
+                        stats["removed"] += 1
+
+            self.connection.commit()
+        except BaseException:
+            self.connection.rollback()
+            raise
+
+        return stats
+
+    def _delete(self, doc_id: int):
+        self.connection.execute("DELETE FROM passages WHERE rowid = ?", (doc_id,))
+        self.connection.execute("DELETE FROM documents WHERE id = ?", (doc_id,))
+
+    def search(self, query: str, max_hits: int = DEFAULT_MAX_HITS) -> list[dict[str, Any]]:
+        """Run a Boolean query and return the best matches by BM25, with snippets."""
+        expression = to_match_expression(query)
+        if not expression:
+            return []
+
+        try:
+            rows = self.connection.execute(
+                "SELECT documents.path, passages.title, "
+                "snippet(passages, 1, '[', ']', ' … ', ?), bm25(passages, ?, ?) AS rank "
+                "FROM passages JOIN documents ON documents.id = passages.rowid "
+                "WHERE passages MATCH ? ORDER BY rank LIMIT ?",
+                (SNIPPET_TOKENS, TITLE_WEIGHT, BODY_WEIGHT, expression, max_hits)
+            ).fetchall()
+        except sqlite3.OperationalError as e:
+            raise ValueError(f"Invalid search query '{query}': {e}") from e
+        except sqlite3.DatabaseError as e:
+            raise ValueError(f"Prior art index '{self.path}' cannot be read: {e}") from e
+
+        return [
+            {
+                "path": path,
+                "title": title,
+                # FTS5 ranks better matches lower; report BM25 as a positive score
+                "score": round(-rank, 6),
+                "snippet": " ".join(snippet.split())
+            }
+            for path, title, snippet, rank in rows
+        ]
+
+
+def search_prior_art(index_path: str | Path, queries: Iterable[str], max_hits: int = DEFAULT_MAX_HITS) -> dict[str, Any]:
+    """Run each query against a local index; the result is added to the prior art search output.
+
+    Raises FileNotFoundError for a missing index, and OSError or ValueError
+    for one that cannot be opened or is not an index.
+    """
+    try:
+        with PriorArtIndex(index_path) as index:
+            return {
+                "index_path": str(index_path),
+                "documents": index.document_count(),
+                "results": [{"query": query, "hits": index.search(query, max_hits)} for query in queries]
+            }
+    except sqlite3.DatabaseError as e:
+        raise ValueError(f"Prior art index '{index_path}' cannot be read: {e}") from e
+
+
+def index_version(index_path: str | Path) -> list[int] | None:
+    """Size and modification time of an index, so that cached results change when it is updated."""
+    versions = []
+    for suffix in ("", "-wal"):
+        try:
+            stat = os.stat(f"{index_path}{suffix}")
+        except OSError:
+            continue
+        versions += [stat.st_size, stat.st_mtime_ns]
+    return versions or None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and search a local prior art index.")
+    parser.add_argument("--index", default=default_index_path(),
+                        help="Index file (default: $PATENT_TOOLS_PRIOR_ART_INDEX)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    index_command = commands.add_parser("index", help="Add new and modified documents to the index")
+    index_command.add_argument("target", help="Directory (searched recursively), file or glob of documents")
+    index_command.add_argument("--pattern", default="*.md", help="File pattern for directories (default: *.md)")
+
+    search_command = commands.add_parser("search", help="Run a Boolean query against the index")
+    search_command.add_argument("query", help="Query such as 'gate AND (oxide OR dielectric)'")
+    search_command.add_argument("--max-hits", type=int, default=10, help="Number of hits (default: 10)")
+
+    args = parser.parse_args()
+    if not args.index:
+        parser.error("no index given: pass --index or set PATENT_TOOLS_PRIOR_ART_INDEX")
+
+    if args.command == "index":
+        with PriorArtIndex(args.index, create=True) as index:
+            stats = index.update(args.target, args.pattern)
+            print(", ".join(f"{count} {name}" for name, count in stats.items()), f"({index.document_count()} documents)")
+        return
+
+    try:
+        with PriorArtIndex(args.index) as index:
+            hits = index.search(args.query, args.max_hits)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    for i, hit in enumerate(hits, 1):
+        print(f"{i:2d}. {hit['title']} ({hit['score']:.4g})\n    {hit['path']}\n    {hit['snippet']}\n")
+    if not hits:
+        print("No matches.")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,360 +3,68 @@
 Patent Tools MCP Server
 
 Exposes patent analysis tools through the Model Context Protocol (MCP).
-Provides three main tools:
+Provides these main tools:
 1. analyze_patent_word_count - Word count analysis for patent documents
 2. analyze_patent_claims - Claims structure and antecedent basis analysis
-3. generate_prior_art_search - Prior art search query generation
+3. batch_analyze_patents - All analyses over a directory of documents
+4. generate_prior_art_search - Prior art search query generation
+5. index_prior_art / search_prior_art_index - Local full-text prior art index
+6. find_duplicate_claims - Near-duplicate claims within and across applications
+7. check_terminology - Mixed synonyms and non-preferred terms
+8. check_claim_support - Claim terms missing from the specification
+9. check_reference_numerals - Elements and reference numerals that do not match one to one
+10. get_cache_stats / get_server_stats - Cache counters, and call latencies per tool and stage
 """
 
 import sys
-import re
+import os
+import json
+import mmap
+import time
+import asyncio
 from pathlib import Path
-from collections import defaultdict, Counter
 from typing import Any
 
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 
-
-# Import the analysis functions from the tools directory
-sys.path.insert(0, str(Path(__file__).parent.parent.parent / "tools"))
-
-
-def count_words(text: str) -> int:
-    """Count words in text, excluding markdown formatting."""
-    # Remove markdown headers
-    text = re.sub(r'#+\s+', '', text)
-    # Remove markdown links but keep the text
-    text = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', text)
-    # Remove markdown bold/italic
-    text = re.sub(r'\*\*([^\*]+)\*\*', r'\1', text)
-    text = re.sub(r'\*([^\*]+)\*', r'\1', text)
-    # Remove code blocks
-    text = re.sub(r'```[^`]*```', '', text, flags=re.DOTALL)
-    text = re.sub(r'`[^`]+`', '', text)
-    # Split on whitespace and count
-    words = text.split()
-    return len(words)
-
-
-def analyze_word_count(content: str, file_name: str = "") -> dict[str, Any]:
-    """Analyze word count in a patent document."""
-    total_words = count_words(content)
-
-    result = {
-        "total_words": total_words,
-        "file_name": file_name,
-        "sections_found": {},
-        "abstract_check": None
-    }
-
-    # Check if it's an abstract
-    if 'abstract' in file_name.lower() or re.search(r'##\s+ABSTRACT', content, re.IGNORECASE):
-        max_words = 150
-        result["abstract_check"] = {
-            "max_allowed": max_words,
-            "current_count": total_words,
-            "within_limit": total_words <= max_words,
-            "remaining": max_words - total_words if total_words <= max_words else None,
-            "exceeds_by": total_words - max_words if total_words > max_words else None
-        }
-
-    # Check for sections
-    sections = {
-        'Background': r'##\s+BACKGROUND',
-        'Summary': r'##\s+.*SUMMARY',
-        'Description': r'##\s+.*DESCRIPTION',
-        'Claims': r'##\s+CLAIMS',
-        'Abstract': r'##\s+ABSTRACT'
-    }
-
-    for section_name, pattern in sections.items():
-        result["sections_found"][section_name] = bool(re.search(pattern, content, re.IGNORECASE))
-
-    return result
-
-
-def extract_claims(content: str) -> dict[int, str]:
-    """Extract individual claims from the document."""
-    claims = {}
-    # Match claim numbers and their content
-    pattern = r'\*\*Claim\s+(\d+)\.\*\*\s+(.*?)(?=\*\*Claim\s+\d+\.\*\*|$)'
-    matches = re.finditer(pattern, content, re.DOTALL)
-
-    for match in matches:
-        claim_num = int(match.group(1))
-        claim_text = match.group(2).strip()
-        claims[claim_num] = claim_text
-
-    return claims
-
-
-def analyze_antecedent_basis(claim_text: str) -> list[str]:
-    """Check for antecedent basis issues."""
-    issues = []
-
-    # Find all uses of "the" followed by a noun
-    the_pattern = r'\bthe\s+([a-z]+(?:\s+[a-z]+)?)'
-    the_matches = re.finditer(the_pattern, claim_text, re.IGNORECASE)
-
-    for match in the_matches:
-        element = match.group(1)
-        # Check if "a" or "an" appears before this element
-        a_pattern = r'\b(?:a|an)\s+' + re.escape(element)
-        if not re.search(a_pattern, claim_text, re.IGNORECASE):
-            issues.append(f"Possible antecedent basis issue: 'the {element}' without prior 'a/an {element}'")
-
-    return issues
-
-
-def analyze_claim_structure(claim_num: int, claim_text: str) -> dict[str, Any]:
-    """Analyze claim structure and formatting."""
-    issues = []
-    warnings = []
-    suggestions = []
-
-    # Check for preamble
-    if not re.match(r'^A\s+\w+|^The\s+\w+|^\d+\.', claim_text):
-        issues.append("Missing or unclear preamble")
-
-    # Check for transition phrase
-    has_transition = False
-    transition_type = None
-    if 'comprising' in claim_text.lower():
-        has_transition = True
-        transition_type = "comprising (open-ended)"
-    elif 'consisting of' in claim_text.lower():
-        has_transition = True
-        transition_type = "consisting of (closed)"
-    elif 'consisting essentially of' in claim_text.lower():
-        has_transition = True
-        transition_type = "consisting essentially of (partially closed)"
-
-    if not has_transition:
-        warnings.append("No clear transition phrase (comprising, consisting of, etc.)")
-
-    # Check claim length
-    word_count = len(claim_text.split())
-    if word_count > 200:
-        warnings.append(f"Very long ({word_count} words) - consider simplifying")
-
-    # Check for unclear antecedents
-    if claim_text.count('said') > 0:
-        suggestions.append("Consider replacing 'said' with 'the' for clarity")
-
-    return {
-        "issues": issues,
-        "warnings": warnings,
-        "suggestions": suggestions,
-        "word_count": word_count,
-        "transition_type": transition_type
-    }
-
-
-def check_claim_dependencies(claims: dict[int, str]) -> tuple[list[int], dict[int, list[int]]]:
-    """Check claim dependency tree."""
-    independent_claims = []
-    dependent_claims = defaultdict(list)
-
-    for claim_num, claim_text in claims.items():
-        # Check if claim depends on another
-        dep_match = re.search(r'claim\s+(\d+)', claim_text, re.IGNORECASE)
-        if dep_match:
-            depends_on = int(dep_match.group(1))
-            dependent_claims[depends_on].append(claim_num)
-        else:
-            independent_claims.append(claim_num)
-
-    return independent_claims, dict(dependent_claims)
-
-
-def analyze_claims(content: str) -> dict[str, Any]:
-    """Analyze patent claims for structure, antecedent basis, and dependencies."""
-    claims = extract_claims(content)
-
-    if not claims:
-        return {
-            "error": "No claims found in document",
-            "claims_count": 0
-        }
-
-    independent, dependent = check_claim_dependencies(claims)
-
-    result = {
-        "total_claims": len(claims),
-        "independent_claims": independent,
-        "independent_count": len(independent),
-        "dependent_count": len(claims) - len(independent),
-        "claim_analysis": {}
-    }
-
-    for claim_num in sorted(claims.keys()):
-        claim_text = claims[claim_num]
-
-        # Determine claim type
-        claim_type = "independent"
-        depends_on = None
-        if claim_num not in independent:
-            dep_match = re.search(r'claim\s+(\d+)', claim_text, re.IGNORECASE)
-            if dep_match:
-                claim_type = "dependent"
-                depends_on = int(dep_match.group(1))
-
-        # Analyze structure
-        structure = analyze_claim_structure(claim_num, claim_text)
-
-        # Check antecedent basis
-        antecedent_issues = analyze_antecedent_basis(claim_text)
-
-        result["claim_analysis"][claim_num] = {
-            "type": claim_type,
-            "depends_on": depends_on,
-            "word_count": structure["word_count"],
-            "transition_type": structure["transition_type"],
-            "structure_issues": structure["issues"],
-            "warnings": structure["warnings"],
-            "suggestions": structure["suggestions"],
-            "antecedent_issues": antecedent_issues
-        }
-
-    return result
-
-
-def extract_keywords(text: str) -> list[str]:
-    """Extract potential keywords from text."""
-    common_words = {
-        'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
-        'of', 'with', 'by', 'from', 'as', 'is', 'was', 'are', 'were', 'be',
-        'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will',
-        'would', 'should', 'could', 'may', 'might', 'can', 'this', 'that',
-        'these', 'those', 'it', 'its', 'which', 'what', 'who', 'when', 'where',
-        'why', 'how', 'said', 'such', 'other', 'also', 'into', 'through'
-    }
-
-    # Extract words (2+ characters, alphabetic)
-    words = re.findall(r'\b[a-z]{2,}\b', text.lower())
-
-    # Filter out common words
-    keywords = [w for w in words if w not in common_words]
-
-    return keywords
-
-
-def extract_technical_terms(text: str) -> list[str]:
-    """Extract multi-word technical terms."""
-    technical_terms = set()
-
-    tech_patterns = [
-        r'\b\w+-\w+(?:-\w+)?\b',  # hyphenated terms
-        r'\b(?:neural|machine|deep|artificial)\s+(?:network|learning|intelligence)\b',
-        r'\b(?:data|image|signal|video)\s+(?:processing|compression|analysis)\b',
-        r'\b(?:user|graphical)\s+interface\b',
-        r'\b(?:computer|processor|memory|storage)\s+\w+\b',
-    ]
-
-    for pattern in tech_patterns:
-        matches = re.finditer(pattern, text, re.IGNORECASE)
-        for match in matches:
-            technical_terms.add(match.group(0))
-
-    return sorted(technical_terms)
-
-
-def generate_boolean_queries(keywords: list[str], max_keywords: int = 5) -> list[str]:
-    """Generate Boolean search queries."""
-    queries = []
-
-    keyword_freq = Counter(keywords)
-    top_keywords = [k for k, v in keyword_freq.most_common(max_keywords)]
-
-    if len(top_keywords) >= 2:
-        # AND query with top keywords
-        queries.append(" AND ".join(top_keywords))
-
-        # OR variations
-        queries.append(" OR ".join(top_keywords[:3]))
-
-        # Mixed queries
-        if len(top_keywords) >= 3:
-            queries.append(f"{top_keywords[0]} AND ({top_keywords[1]} OR {top_keywords[2]})")
-
-    return queries
-
-
-def suggest_cpc_classifications(text: str) -> list[dict[str, str]]:
-    """Suggest potential CPC classifications based on text content."""
-    cpc_keywords = {
-        'G06F': ['computer', 'data processing', 'computing', 'processor', 'software'],
-        'G06N': ['artificial intelligence', 'machine learning', 'neural network', 'AI'],
-        'G06T': ['image processing', 'graphics', 'visualization', 'rendering'],
-        'G06Q': ['business', 'commerce', 'management', 'financial', 'payment'],
-        'H04L': ['communication', 'network', 'transmission', 'protocol', 'data transfer'],
-        'H04N': ['video', 'television', 'streaming', 'broadcasting'],
-        'H04W': ['wireless', 'mobile', 'cellular', 'radio'],
-        'A61B': ['medical', 'diagnostic', 'healthcare', 'patient', 'clinical'],
-        'G01N': ['measuring', 'testing', 'analysis', 'detection', 'sensor'],
-        'G05B': ['control', 'automation', 'regulating', 'feedback'],
-        'G16H': ['healthcare IT', 'medical records', 'health informatics'],
-        'B60W': ['vehicle', 'automotive', 'driving', 'autonomous'],
-        'E21B': ['drilling', 'mining', 'extraction', 'well'],
-    }
-
-    text_lower = text.lower()
-    suggested = []
-
-    for cpc, keywords in cpc_keywords.items():
-        for keyword in keywords:
-            if keyword in text_lower:
-                suggested.append({
-                    "classification": cpc,
-                    "matched_keyword": keyword
-                })
-                break
-
-    return suggested
-
-
-def generate_prior_art_search(content: str) -> dict[str, Any]:
-    """Generate prior art search strategy."""
-    keywords = extract_keywords(content)
-    technical_terms = extract_technical_terms(content)
-    queries = generate_boolean_queries(keywords)
-    cpcs = suggest_cpc_classifications(content)
-
-    keyword_freq = Counter(keywords)
-    top_keywords = [{"keyword": k, "frequency": v} for k, v in keyword_freq.most_common(20)]
-
-    result = {
-        "recommended_databases": [
-            "USPTO Patent Full-Text Database (https://patft.uspto.gov/)",
-            "Google Patents (https://patents.google.com/)",
-            "Espacenet (https://worldwide.espacenet.com/)",
-            "WIPO PatentScope (https://patentscope.wipo.int/)",
-            "IEEE Xplore (for non-patent literature)",
-            "Google Scholar (for academic papers)"
-        ],
-        "top_keywords": top_keywords,
-        "technical_terms": technical_terms,
-        "boolean_queries": queries,
-        "suggested_cpc_classifications": cpcs,
-        "search_strategy": [
-            "Start with keyword searches using the first Boolean query",
-            "Review results and refine keywords",
-            "Add CPC classification filters",
-            "Search non-patent literature",
-            "Review citations from relevant patents",
-            "Document all searches in prior-art-analysis.md"
-        ]
-    }
-
-    return result
+from . import ingest, metrics, parallel
+from .batch import BATCH_ANALYSES, collect_documents, run_batch
+from .cache import ResultCache, content_digest
+from .executor import AnalysisExecutor
+from .core import (
+    analyze_word_count,
+    extract_claims,
+    analyze_claims,
+    analyze_extracted_claims,
+    generate_prior_art_search
+)
+from .cpc import default_matcher
+from .idf import default_idf_table
+from .incremental import analyze_claims_in_session
+from .ingest import analyze_word_count_mapped
+from .search_index import DEFAULT_MAX_HITS, PriorArtIndex, default_index_path, index_version
+from .similarity import DEFAULT_THRESHOLD, find_near_duplicate_claims, format_pair, read_documents
+from .support import check_claim_support, format_unsupported
+from .numerals import check_reference_numerals, format_conflict
+from .terminology import check_terminology, default_checker, format_finding
 
 
 # Create the MCP server
 app = Server("patent-tools-mcp-server")
 
+OUTPUT_FORMATS = ("text", "json")
+
+OUTPUT_FORMAT_PROPERTY = {
+    "type": "string",
+    "enum": list(OUTPUT_FORMATS),
+    "description": (
+        "Response format: 'text' (default) for a readable report, or 'json' for the "
+        "compact JSON of the underlying result, which skips text formatting entirely"
+    )
+}
+
 
 @app.list_tools()
 async def list_tools() -> list[Tool]:
@@ -384,7 +92,8 @@ async def list_tools() -> list[Tool]:
                     "file_name": {
                         "type": "string",
                         "description": "Optional file name for context (helps identify if document is an abstract)"
-                    }
+                    },
+                    "output_format": OUTPUT_FORMAT_PROPERTY
                 },
                 "required": []
             }
@@ -408,17 +117,64 @@ async def list_tools() -> list[Tool]:
                     "file_path": {
                         "type": "string",
                         "description": "Optional file path to read content from. If provided, content parameter is ignored."
-                    }
+                    },
+                    "session_id": {
+                        "type": "string",
+                        "description": (
+                            "Optional stable identifier for the document being edited (e.g. its path). "
+                            "The server remembers the last claim set for this id and only re-checks "
+                            "edited claims and their dependents. Results are identical to a full run."
+                        )
+                    },
+                    "output_format": OUTPUT_FORMAT_PROPERTY
                 },
                 "required": []
             }
         ),
+        Tool(
+            name="batch_analyze_patents",
+            description=(
+                "Runs word count, claims and prior art analyses over a directory or glob of patent documents. "
+                "Documents are spread across a pool of worker processes and a result record is produced "
+                "for each document as it finishes. A document that fails to analyze is reported and "
+                "does not stop the run. Use for docketing or reviewing many drafts at once."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "path": {
+                        "type": "string",
+                        "description": "Directory (searched recursively), single file, or glob pattern such as 'drafts/**/*.md'"
+                    },
+                    "pattern": {
+                        "type": "string",
+                        "description": "File pattern used when path is a directory (default: *.md)"
+                    },
+                    "analyses": {
+                        "type": "array",
+                        "items": {"type": "string", "enum": ["word_count", "claims", "prior_art"]},
+                        "description": "Analyses to run on each document (default: all three)"
+                    },
+                    "workers": {
+                        "type": "integer",
+                        "description": "Number of worker processes (default: CPU count)"
+                    },
+                    "output_path": {
+                        "type": "string",
+                        "description": "Optional file to write one JSON record per document (JSON Lines)"
+                    },
+                    "output_format": OUTPUT_FORMAT_PROPERTY
+                },
+                "required": ["path"]
+            }
+        ),
         Tool(
             name="generate_prior_art_search",
             description=(
                 "Generates prior art search strategy from invention description. "
                 "Extracts keywords and technical terms from the invention. "
-                "Generates Boolean search queries for patent databases. "
+                "Generates Boolean search queries for patent databases, and proximity (NEAR/ADJ) "
+                "and phrase queries from the terms that co-occur most strongly. "
                 "Suggests relevant CPC (Cooperative Patent Classification) codes. "
                 "Provides recommended databases and search strategy steps. "
                 "Critical for conducting thorough prior art searches."
@@ -433,6 +189,210 @@ async def list_tools() -> list[Tool]:
                     "file_path": {
                         "type": "string",
                         "description": "Optional file path to read content from. If provided, content parameter is ignored."
+                    },
+                    "index_path": {
+                        "type": "string",
+                        "description": (
+                            "Optional local prior art index built with index_prior_art "
+                            "(default: $PATENT_TOOLS_PRIOR_ART_INDEX). When set, the Boolean queries "
+                            "are run against it and the best matches are returned with snippets."
+                        )
+                    },
+                    "max_hits": {
+                        "type": "integer",
+                        "description": f"Local index matches per query (default: {DEFAULT_MAX_HITS})"
+                    },
+                    "output_format": OUTPUT_FORMAT_PROPERTY
+                },
+                "required": []
+            }
+        ),
+        Tool(
+            name="index_prior_art",
+            description=(
+                "Builds or updates a local full-text prior art index from a directory of patent documents, "
+                "such as a bulk text dump. Only new and modified documents are read, and deleted ones are "
+                "dropped. The index is searched offline by generate_prior_art_search and search_prior_art_index."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "path": {
+                        "type": "string",
+                        "description": "Directory (searched recursively), single file, or glob pattern of documents"
+                    },
+                    "pattern": {
+                        "type": "string",
+                        "description": "File pattern used when path is a directory (default: *.md)"
+                    },
+                    "index_path": {
+                        "type": "string",
+                        "description": "Index file to create or update (default: $PATENT_TOOLS_PRIOR_ART_INDEX)"
+                    },
+                    "output_format": OUTPUT_FORMAT_PROPERTY
+                },
+                "required": ["path"]
+            }
+        ),
+        Tool(
+            name="search_prior_art_index",
+            description=(
+                "Runs a Boolean query (AND, OR, NOT, parentheses, quoted phrases) against a local prior art "
+                "index and returns the best matching documents ranked by BM25, with snippets."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "query": {
+                        "type": "string",
+                        "description": "Query such as 'gate AND (oxide OR dielectric) AND NOT \"bipolar transistor\"'"
+                    },
+                    "index_path": {
+                        "type": "string",
+                        "description": "Index to search (default: $PATENT_TOOLS_PRIOR_ART_INDEX)"
+                    },
+                    "max_hits": {
+                        "type": "integer",
+                        "description": "Number of matches to return (default: 10)"
+                    },
+                    "output_format": OUTPUT_FORMAT_PROPERTY
+                },
+                "required": ["query"]
+            }
+        ),
+        Tool(
+            name="find_duplicate_claims",
+            description=(
+                "Finds near-duplicate claims within one application or across a family of applications "
+                "(continuations, divisionals) for claim differentiation and double patenting review. "
+                "Claims are compared through MinHash signatures and locality-sensitive hashing, so "
+                "tens of thousands of claims are handled without comparing every pair. Returns each "
+                "pair with its estimated Jaccard similarity. Requires NumPy."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "path": {
+                        "type": "string",
+                        "description": "Directory (searched recursively), single file, or glob pattern of the applications"
+                    },
+                    "pattern": {
+                        "type": "string",
+                        "description": "File pattern used when path is a directory (default: *.md)"
+                    },
+                    "content": {
+                        "type": "string",
+                        "description": "Claims of a single application, instead of path"
+                    },
+                    "threshold": {
+                        "type": "number",
+                        "description": f"Minimum estimated Jaccard similarity of a reported pair (default: {DEFAULT_THRESHOLD})"
+                    },
+                    "output_format": OUTPUT_FORMAT_PROPERTY
+                },
+                "required": []
+            }
+        ),
+        Tool(
+            name="check_terminology",
+            description=(
+                "Checks that a patent application uses its terms consistently, following the H01L "
+                "terminology reference. Reports every use of a non-preferred term (e.g. 'wafer' for "
+                "'substrate', 'insulating layer' for 'dielectric layer') and every switch between "
+                "interchangeable terms, with line numbers. The whole document is scanned in one pass."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "content": {
+                        "type": "string",
+                        "description": "The patent document content to check"
+                    },
+                    "file_path": {
+                        "type": "string",
+                        "description": "Optional file path to read content from. If provided, content parameter is ignored."
+                    },
+                    "output_format": OUTPUT_FORMAT_PROPERTY
+                },
+                "required": []
+            }
+        ),
+        Tool(
+            name="check_claim_support",
+            description=(
+                "Checks that every claim element appears in the detailed description. The noun phrases "
+                "introduced or referred to in the claims ('a gate electrode', 'the drift region') are "
+                "looked up in an index of the specification's word n-grams; each term that is not found "
+                "is reported with the claims using it and the nearest phrases of the specification."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "content": {
+                        "type": "string",
+                        "description": "The patent application, with its specification and claims"
+                    },
+                    "file_path": {
+                        "type": "string",
+                        "description": "Optional file path to read content from. If provided, content parameter is ignored."
+                    },
+                    "output_format": OUTPUT_FORMAT_PROPERTY
+                },
+                "required": []
+            }
+        ),
+        Tool(
+            name="check_reference_numerals",
+            description=(
+                "Checks that every element keeps one reference numeral. Every 'element numeral' pair "
+                "('substrate 102', 'the gate electrode 104', 'fin 106a') is extracted in one pass and "
+                "indexed from element to numerals and from numeral to elements; numerals used for different "
+                "elements and elements given different numerals are reported with their lines. The JSON "
+                "output also includes both indexes."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "content": {
+                        "type": "string",
+                        "description": "The specification or application to check"
+                    },
+                    "file_path": {
+                        "type": "string",
+                        "description": "Optional file path to read content from. If provided, content parameter is ignored."
+                    },
+                    "output_format": OUTPUT_FORMAT_PROPERTY
+                },
+                "required": []
+            }
+        ),
+        Tool(
+            name="get_cache_stats",
+            description=(
+                "Reports result cache statistics: hits, misses, hit rate, evictions, "
+                "unchanged-file skips and current entry counts. Useful for sizing the cache "
+                "(PATENT_TOOLS_CACHE_SIZE, PATENT_TOOLS_CACHE_DIR)."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {},
+                "required": []
+            }
+        ),
+        Tool(
+            name="get_server_stats",
+            description=(
+                "Reports where time goes in the server: per tool, the number of calls, errors and "
+                "cache hits, and latency (mean, p50, p90, p99, max) of the whole call and of each "
+                "stage: waiting for a worker, reading, cache lookup, analysis and its own stages "
+                "(claim extraction, per-claim checks, ...), and formatting."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "reset": {
+                        "type": "boolean",
+                        "description": "Clear the statistics after reporting them (default: false)"
                     }
                 },
                 "required": []
@@ -441,177 +401,706 @@ async def list_tools() -> list[Tool]:
     ]
 
 
-@app.call_tool()
-async def call_tool(name: str, arguments: dict) -> list[TextContent]:
-    """Handle tool calls."""
+def to_json(result: Any) -> str:
+    """Serialize a result as compact JSON."""
+    return json.dumps(result, ensure_ascii=False, separators=(",", ":"))
+
+
+def error_content(message: str, output_format: str = "text") -> list[TextContent]:
+    """Report an error as text, or as {"error": ...} for JSON callers."""
+    metrics.count("errors")
+    text = to_json({"error": message}) if output_format == "json" else f"Error: {message}"
+    return [TextContent(type="text", text=text)]
+
+
+def run_batch_tool(arguments: dict, output_format: str = "text") -> list[TextContent]:
+    """Run the batch analysis tool and summarize each document's outcome."""
+    if not arguments.get("path"):
+        return error_content("'path' parameter is required.", output_format)
+
+    paths = collect_documents(arguments["path"], arguments.get("pattern") or "*.md")
+    if not paths:
+        return error_content(f"No documents found for '{arguments['path']}'.", output_format)
+
+    analyses = tuple(arguments.get("analyses") or BATCH_ANALYSES)
+    output_path = arguments.get("output_path")
+
+    try:
+        records = []
+        out = open(output_path, 'w', encoding='utf-8') if output_path else None
+        try:
+            for record in run_batch(paths, analyses, arguments.get("workers")):
+                if out:
+                    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    out.flush()
+                records.append(record)
+        finally:
+            if out:
+                out.close()
+    except Exception as e:
+        if output_format == "json":
+            return error_content(f"Batch analysis failed: {str(e)}", output_format)
+        metrics.count("errors")
+        return [TextContent(type="text", text=f"Error during batch analysis: {str(e)}")]
+
+    failures = [r for r in records if r["status"] != "ok"]
+    if output_format == "json":
+        return [TextContent(type="text", text=to_json({
+            "documents": len(records),
+            "succeeded": len(records) - len(failures),
+            "failed": len(failures),
+            "output_path": output_path,
+            "records": sorted(records, key=lambda r: r["file"])
+        }))]
+
+    output_lines = [
+        "=== Batch Patent Analysis ===\n",
+        f"Documents: {len(records)}",
+        f"Succeeded: {len(records) - len(failures)}",
+        f"Failed: {len(failures)}"
+    ]
+    if output_path:
+        output_lines.append(f"Records written to: {output_path}")
+    output_lines.append("")
+
+    for record in sorted(records, key=lambda r: r["file"]):
+        if record["status"] != "ok":
+            output_lines.append(f"✗ {record['file']}: {record['error']}")
+            continue
+
+        details = []
+        results = record["results"]
+        if "word_count" in results:
+            details.append(f"{results['word_count']['total_words']} words")
+        if "claims" in results:
+            claims = results["claims"]
+            antecedent_count = sum(
+                len(analysis["antecedent_issues"]) for analysis in claims.get("claim_analysis", {}).values()
+            )
+            details.append(f"{claims.get('total_claims', 0)} claims, {antecedent_count} antecedent issues")
+        if "prior_art" in results and results["prior_art"]["boolean_queries"]:
+            details.append(f"query: {results['prior_art']['boolean_queries'][0]}")
+        output_lines.append(f"✓ {record['file']} ({record['elapsed_seconds']:.2f}s) - {'; '.join(details)}")
+
+    return [TextContent(
+        type="text",
+        text="\n".join(output_lines)
+    )]
+
+
+def run_index_tool(arguments: dict, output_format: str = "text") -> list[TextContent]:
+    """Create or update a local prior art index."""
+    if not arguments.get("path"):
+        return error_content("'path' parameter is required.", output_format)
+    index_path = arguments.get("index_path") or default_index_path()
+    if not index_path:
+        return error_content("'index_path' parameter is required when PATENT_TOOLS_PRIOR_ART_INDEX is not set.", output_format)
+
+    try:
+        with PriorArtIndex(index_path, create=True) as index:
+            stats = index.update(arguments["path"], arguments.get("pattern") or "*.md")
+            documents = index.document_count()
+    except Exception as e:
+        return error_content(f"Indexing failed: {str(e)}", output_format)
+
+    if output_format == "json":
+        return [TextContent(type="text", text=to_json({"index_path": index_path, "documents": documents, **stats}))]
+
+    output_lines = [
+        "=== Prior Art Index ===\n",
+        f"Index: {index_path}",
+        f"Documents: {documents}",
+        f"Added: {stats['added']}, updated: {stats['updated']}, unchanged: {stats['unchanged']}, "
+        f"removed: {stats['removed']}, failed: {stats['failed']}"
+    ]
+    return [TextContent(type="text", text="\n".join(output_lines))]
+
+
+def run_search_tool(arguments: dict, output_format: str = "text") -> list[TextContent]:
+    """Run one Boolean query against a local prior art index."""
+    if not arguments.get("query"):
+        return error_content("'query' parameter is required.", output_format)
+    index_path = arguments.get("index_path") or default_index_path()
+    if not index_path:
+        return error_content("'index_path' parameter is required when PATENT_TOOLS_PRIOR_ART_INDEX is not set.", output_format)
+
+    try:
+        with PriorArtIndex(index_path) as index:
+            hits = index.search(arguments["query"], arguments.get("max_hits") or 10)
+    except (FileNotFoundError, ValueError) as e:
+        return error_content(str(e), output_format)
+
+    if output_format == "json":
+        return [TextContent(type="text", text=to_json({"query": arguments["query"], "hits": hits}))]
+
+    output_lines = ["=== Prior Art Index Search ===\n", f"Query: {arguments['query']}", f"Matches: {len(hits)}\n"]
+    output_lines += format_search_hits(hits, "")
+    return [TextContent(type="text", text="\n".join(output_lines))]
+
+
+def run_duplicates_tool(arguments: dict, output_format: str = "text") -> list[TextContent]:
+    """Find near-duplicate claims in one document or across a set of documents."""
+    if arguments.get("path"):
+        paths = collect_documents(arguments["path"], arguments.get("pattern") or "*.md")
+        if not paths:
+            return error_content(f"No documents found for '{arguments['path']}'.", output_format)
+    elif arguments.get("content"):
+        paths = None
+    else:
+        return error_content("Either 'path' or 'content' parameter is required.", output_format)
 
+    try:
+        documents = read_documents(paths) if paths else {"content": arguments["content"]}
+        result = find_near_duplicate_claims(documents, arguments.get("threshold") or DEFAULT_THRESHOLD)
+    except (ImportError, OSError, ValueError) as e:
+        return error_content(str(e), output_format)
+
+    if output_format == "json":
+        return [TextContent(type="text", text=to_json(result))]
+
+    output_lines = [
+        "=== Near-Duplicate Claims ===\n",
+        f"Documents: {result['documents']}",
+        f"Claims: {result['claims']}",
+        f"Pairs at or above {result['threshold']:.0%} similarity: {len(result['pairs'])}\n"
+    ]
+    output_lines += [f"⚠ {format_pair(pair)}" for pair in result["pairs"]]
+    return [TextContent(type="text", text="\n".join(output_lines))]
+
+
+def format_search_hits(hits: list[dict[str, Any]], indent: str) -> list[str]:
+    """Readable lines for ranked local index matches."""
+    lines = []
+    for i, hit in enumerate(hits, 1):
+        lines.append(f"{indent}{i}. {hit['title']} (score {hit['score']:.4g})")
+        lines.append(f"{indent}   {hit['path']}")
+        lines.append(f"{indent}   {hit['snippet']}")
+    return lines
+
+
+# Tools whose results are computed from document content and can be cached
+ANALYSIS_TOOLS = (
+    "analyze_patent_word_count",
+    "analyze_patent_claims",
+    "generate_prior_art_search",
+    "check_terminology",
+    "check_claim_support",
+    "check_reference_numerals"
+)
+
+result_cache = ResultCache.from_environment()
+
+executor = AnalysisExecutor.from_environment()
+
+server_stats = metrics.ServerStats()
+
+
+def format_word_count_result(result: dict[str, Any]) -> str:
+    """Format a word count result as readable text."""
+    output_lines = [
+        "=== Patent Word Count Analysis ===\n",
+        f"File: {result['file_name'] or 'Provided content'}",
+        f"Total words: {result['total_words']}\n"
+    ]
+
+    if result["abstract_check"]:
+        check = result["abstract_check"]
+        output_lines.append("Abstract Requirements:")
+        output_lines.append(f"  Maximum allowed: {check['max_allowed']} words")
+        output_lines.append(f"  Current count: {check['current_count']} words")
+        if check['within_limit']:
+            output_lines.append(f"  ✓ Within limit ({check['remaining']} words remaining)")
+        else:
+            output_lines.append(f"  ✗ EXCEEDS limit by {check['exceeds_by']} words")
+        output_lines.append("")
+
+    output_lines.append("Document Structure:")
+    for section, found in result["sections_found"].items():
+        marker = "✓" if found else "-"
+        output_lines.append(f"  {marker} {section} section {'found' if found else 'not found'}")
+
+    if any(section["heading"] for section in result["sections"]):
+        output_lines.append("\nWords per Section:")
+        for section in result["sections"]:
+            output_lines.append(f"  {section['heading'] or '(before first heading)'}: {section['word_count']} words")
+
+    return "\n".join(output_lines)
+
+
+def format_claims_result(result: dict[str, Any]) -> str:
+    """Format a claims analysis result as readable text."""
+    if "error" in result:
+        return f"Error: {result['error']}"
+
+    # Format result as readable text
+    output_lines = [
+        "=== Patent Claims Analysis ===\n",
+        f"Total claims: {result['total_claims']}",
+        f"Independent claims: {result['independent_count']} - {result['independent_claims']}",
+        f"Dependent claims: {result['dependent_count']}\n",
+        "=== Claim-by-Claim Analysis ===\n"
+    ]
+
+    for claim_num, analysis in result["claim_analysis"].items():
+        output_lines.append(f"Claim {claim_num}:")
+        output_lines.append(f"  Type: {analysis['type'].capitalize()}")
+        if len(analysis['dependencies']) > 1:
+            output_lines.append(f"  Depends on: Claims {', '.join(map(str, analysis['dependencies']))} (multiple dependent)")
+        elif analysis['depends_on']:
+            output_lines.append(f"  Depends on: Claim {analysis['depends_on']}")
+        output_lines.append(f"  Word count: {analysis['word_count']}")
+        if analysis['transition_type']:
+            output_lines.append(f"  Transition: {analysis['transition_type']}")
+
+        for issue in analysis['dependency_issues']:
+            output_lines.append(f"  ✗ {issue}")
+
+        if analysis['structure_issues']:
+            for issue in analysis['structure_issues']:
+                output_lines.append(f"  ⚠ {issue}")
+
+        if analysis['antecedent_issues']:
+            for issue in analysis['antecedent_issues']:
+                output_lines.append(f"  ⚠ {issue}")
+
+        if analysis['warnings']:
+            for warning in analysis['warnings']:
+                output_lines.append(f"  ⚠ {warning}")
+
+        if analysis['suggestions']:
+            for suggestion in analysis['suggestions']:
+                output_lines.append(f"  💡 {suggestion}")
+
+        output_lines.append("")
+
+    return "\n".join(output_lines)
+
+
+def format_prior_art_result(result: dict[str, Any]) -> str:
+    """Format a prior art search strategy as readable text."""
+    output_lines = [
+        "=== Prior Art Search Strategy ===\n",
+        "1. RECOMMENDED DATABASES:"
+    ]
+    for db in result["recommended_databases"]:
+        output_lines.append(f"   - {db}")
+
+    output_lines.append("\n2. TOP KEYWORDS:")
+    for i, kw in enumerate(result["top_keywords"][:20], 1):
+        score = f", TF-IDF {kw['tf_idf']:.1f}" if "tf_idf" in kw else ""
+        output_lines.append(f"   {i:2d}. {kw['keyword']} ({kw['frequency']} occurrences{score})")
+
+    if result["technical_terms"]:
+        output_lines.append("\n3. TECHNICAL TERMS/PHRASES:")
+        for i, term in enumerate(result["technical_terms"], 1):
+            output_lines.append(f"   {i:2d}. {term}")
+
+    output_lines.append("\n4. BOOLEAN SEARCH QUERIES:")
+    for i, query in enumerate(result["boolean_queries"], 1):
+        output_lines.append(f"   Query {i}: {query}")
+    if result.get("proximity_queries"):
+        output_lines.append("\n   Proximity and phrase queries (USPTO syntax):")
+        for i, query in enumerate(result["proximity_queries"], 1):
+            output_lines.append(f"   Proximity {i}: {query['query']} ({query['count']} co-occurrences)")
+
+    if result["suggested_cpc_classifications"]:
+        output_lines.append("\n5. SUGGESTED CPC CLASSIFICATIONS:")
+        for cpc in result["suggested_cpc_classifications"]:
+            matched = ", ".join(f"{keyword} ({count})" for keyword, count in list(cpc["matched_keywords"].items())[:5])
+            output_lines.append(f"   - {cpc['classification']}: {cpc['hits']} hits (matched: {matched})")
+
+    output_lines.append("\n6. SEARCH STRATEGY:")
+    for i, step in enumerate(result["search_strategy"], 1):
+        output_lines.append(f"   Step {i}: {step}")
+
+    if "local_search" in result:
+        local_search = result["local_search"]
+        if "error" in local_search:
+            output_lines.append(f"\n7. LOCAL INDEX MATCHES: not searched. {local_search['error']}")
+            return "\n".join(output_lines)
+        output_lines.append(f"\n7. LOCAL INDEX MATCHES ({local_search['documents']} documents in {local_search['index_path']}):")
+        for i, search in enumerate(local_search["results"], 1):
+            output_lines.append(f"   Query {i}: {search['query']}")
+            output_lines += format_search_hits(search["hits"], "      ") or ["      No matches"]
+
+    return "\n".join(output_lines)
+
+
+def format_terminology_result(result: dict[str, Any]) -> str:
+    """Format a terminology check as readable text."""
+    output_lines = [
+        "=== Terminology Consistency ===\n",
+        f"Synonym groups checked: {result['groups_checked']}",
+        f"Uses of grouped terms: {result['terms_found']}",
+        f"Issues: {result['issue_count']}\n"
+    ]
+    if not result["issues"]:
+        output_lines.append("✓ Terms are used consistently")
+    output_lines += [f"⚠ {format_finding(finding)}" for finding in result["issues"]]
+    return "\n".join(output_lines)
+
+
+def format_support_result(result: dict[str, Any]) -> str:
+    """Format a claim support check as readable text."""
+    if "error" in result:
+        return f"Error: {result['error']}"
+
+    output_lines = [
+        "=== Claim Support in the Specification ===\n",
+        f"Specification: {', '.join(result['specification_sections']) or 'whole document'} "
+        f"({result['specification_words']} words)",
+        f"Claim terms checked: {result['terms_checked']}",
+        f"Not found in the specification: {result['unsupported_count']}\n"
+    ]
+    if not result["unsupported"]:
+        output_lines.append("✓ Every claim term appears in the specification")
+    for entry in result["unsupported"]:
+        output_lines += format_unsupported(entry)
+    return "\n".join(output_lines)
+
+
+def format_numerals_result(result: dict[str, Any]) -> str:
+    """Format a reference numeral check as readable text."""
+    output_lines = [
+        "=== Reference Numerals ===\n",
+        f"Reference numerals: {result['numeral_count']} ({result['element_count']} elements, "
+        f"{result['references_found']} references)",
+        f"Conflicts: {result['conflict_count']}\n"
+    ]
+    if not result["conflicts"]:
+        output_lines.append("✓ Every element keeps one reference numeral")
+    output_lines += [f"✗ {format_conflict(conflict)}" for conflict in result["conflicts"]]
+    return "\n".join(output_lines)
+
+
+RESULT_FORMATTERS = {
+    "analyze_patent_word_count": format_word_count_result,
+    "analyze_patent_claims": format_claims_result,
+    "generate_prior_art_search": format_prior_art_result,
+    "check_terminology": format_terminology_result,
+    "check_claim_support": format_support_result,
+    "check_reference_numerals": format_numerals_result
+}
+
+
+def run_analysis(
+    name: str,
+    content: str,
+    file_name: str,
+    session_id: str | None = None,
+    index_path: str | None = None,
+    max_hits: int = DEFAULT_MAX_HITS
+) -> dict[str, Any]:
+    """Run the named analysis on document content."""
+    if name == "analyze_patent_word_count":
+        return analyze_word_count(content, file_name)
+    elif name == "analyze_patent_claims":
+        if session_id:
+            return analyze_claims_in_session(session_id, extract_claims(content))
+        return analyze_claims(content)
+    elif name == "generate_prior_art_search":
+        return generate_prior_art_search(content, index_path, max_hits)
+    elif name == "check_terminology":
+        return check_terminology(content)
+    elif name == "check_claim_support":
+        return check_claim_support(content)
+    elif name == "check_reference_numerals":
+        return check_reference_numerals(content)
+
+    raise ValueError(f"Unknown tool '{name}'")
+
+
+def run_mapped_analysis(
+    name: str,
+    data: mmap.mmap | bytes,
+    file_name: str,
+    session_id: str | None = None,
+    index_path: str | None = None,
+    max_hits: int = DEFAULT_MAX_HITS
+) -> dict[str, Any]:
+    """Run the named analysis on a memory-mapped document without reading it into one string."""
+    if name == "analyze_patent_word_count":
+        return analyze_word_count_mapped(data, file_name)
+    elif name == "analyze_patent_claims":
+        with metrics.stage("claims.extract"):
+            claims = ingest.extract_claims(data)
+        if session_id:
+            return analyze_claims_in_session(session_id, claims)
+        return analyze_extracted_claims(claims)
+
+    # Keyword extraction, the terminology, support and numeral checks need the whole text
+    return run_analysis(name, ingest.decode_text(data[:]), file_name, index_path=index_path, max_hits=max_hits)
+
+
+def lookup_cached_output(
+    name: str,
+    document: str | mmap.mmap | bytes,
+    options: dict[str, Any],
+    file_path: Path | None = None,
+    file_stat: os.stat_result | None = None
+) -> tuple[str | None, str | None]:
+    """Hash a document and look up its cached output, returning (cache key, output).
+
+    file_stat is the stat of file_path taken before the document was read.
+    """
+    if not result_cache.enabled:
+        return None, None
+
+    digest = content_digest(document)
+    if file_path is not None and file_stat is not None:
+        result_cache.remember_file(file_path, digest, file_stat)
+    cache_key = result_cache.make_key(name, digest, options)
+    return cache_key, result_cache.get(cache_key)
+
+
+def format_result(name: str, result: dict[str, Any], output_format: str) -> str:
+    """Render a result dict; JSON callers get the dict as is, without building the text report."""
+    return to_json(result) if output_format == "json" else RESULT_FORMATTERS[name](result)
+
+
+def render_analysis(
+    name: str,
+    content: str,
+    file_name: str,
+    index_path: str | None,
+    max_hits: int,
+    output_format: str
+) -> tuple[str, dict[str, int]]:
+    """Analyze document content and render the output, with the durations of its stages.
+
+    Runs in a worker process in process mode.
+    """
+    with metrics.recording() as call:
+        with metrics.stage("analysis"):
+            result = run_analysis(name, content, file_name, index_path=index_path, max_hits=max_hits)
+        with metrics.stage("format"):
+            output = format_result(name, result, output_format)
+    return output, call.durations
+
+
+def render_mapped_analysis(
+    name: str,
+    file_path: str,
+    file_name: str,
+    index_path: str | None,
+    max_hits: int,
+    output_format: str
+) -> tuple[str, dict[str, int]]:
+    """Memory-map a very large file, analyze it and render the output, with the durations of its stages.
+
+    Runs in a worker process in process mode.
+    """
+    with metrics.recording() as call:
+        with ingest.map_document(Path(file_path)) as data, metrics.stage("analysis"):
+            result = run_mapped_analysis(name, data, file_name, index_path=index_path, max_hits=max_hits)
+        with metrics.stage("format"):
+            output = format_result(name, result, output_format)
+    return output, call.durations
+
+
+def run_analysis_tool(name: str, arguments: dict, output_format: str = "text") -> list[TextContent]:
+    """Read the document, consult the cache and run one of the ANALYSIS_TOOLS. Runs in a worker thread."""
     # Get content from file_path or content parameter
     content = None
+    file_path = None
     file_name = arguments.get("file_name", "")
 
     if "file_path" in arguments and arguments["file_path"]:
         file_path = Path(arguments["file_path"])
         if not file_path.exists():
-            return [TextContent(
-                type="text",
-                text=f"Error: File '{file_path}' not found."
-            )]
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+            return error_content(f"File '{file_path}' not found.", output_format)
         if not file_name:
             file_name = file_path.name
     elif "content" in arguments and arguments["content"]:
         content = arguments["content"]
     else:
-        return [TextContent(
-            type="text",
-            text="Error: Either 'content' or 'file_path' parameter is required."
-        )]
+        return error_content("Either 'content' or 'file_path' parameter is required.", output_format)
+
+    options = {"file_name": file_name} if name == "analyze_patent_word_count" else {}
+    if output_format != "text":
+        options["output_format"] = output_format
+    session_id = arguments.get("session_id") if name == "analyze_patent_claims" else None
+    index_path = None
+    max_hits = arguments.get("max_hits") or DEFAULT_MAX_HITS
+    if name == "generate_prior_art_search":
+        # A different CPC keyword table or IDF table changes the result
+        options["cpc_version"] = default_matcher().version
+        idf_table = default_idf_table()
+        if idf_table is not None:
+            options["idf_version"] = idf_table.version
+        index_path = arguments.get("index_path") or default_index_path()
+        if index_path:
+            # Updating the index changes its version and so the cached result
+            options.update(index_path=index_path, index_version=index_version(index_path), max_hits=max_hits)
+    if name == "check_terminology":
+        # A different terminology reference changes the result
+        options["terminology_version"] = default_checker().version
+    cache_key = None
+
+    # An unchanged file is looked up by its remembered digest without being read
+    if result_cache.enabled and file_path is not None:
+        with metrics.stage("cache"):
+            digest = result_cache.file_digest(file_path)
+            if digest is not None:
+                cache_key = result_cache.make_key(name, digest, options)
+                cached = result_cache.get(cache_key)
+        if digest is not None and cached is not None:
+            metrics.count("cache_hits")
+            return [TextContent(type="text", text=cached)]
 
-    # Route to appropriate analysis function
     try:
-        if name == "analyze_patent_word_count":
-            result = analyze_word_count(content, file_name)
-
-            # Format result as readable text
-            output_lines = [
-                "=== Patent Word Count Analysis ===\n",
-                f"File: {result['file_name'] or 'Provided content'}",
-                f"Total words: {result['total_words']}\n"
-            ]
-
-            if result["abstract_check"]:
-                check = result["abstract_check"]
-                output_lines.append("Abstract Requirements:")
-                output_lines.append(f"  Maximum allowed: {check['max_allowed']} words")
-                output_lines.append(f"  Current count: {check['current_count']} words")
-                if check['within_limit']:
-                    output_lines.append(f"  ✓ Within limit ({check['remaining']} words remaining)")
-                else:
-                    output_lines.append(f"  ✗ EXCEEDS limit by {check['exceeds_by']} words")
-                output_lines.append("")
-
-            output_lines.append("Document Structure:")
-            for section, found in result["sections_found"].items():
-                marker = "✓" if found else "-"
-                output_lines.append(f"  {marker} {section} section {'found' if found else 'not found'}")
-
-            return [TextContent(
-                type="text",
-                text="\n".join(output_lines)
-            )]
-
-        elif name == "analyze_patent_claims":
-            result = analyze_claims(content)
-
-            if "error" in result:
-                return [TextContent(
-                    type="text",
-                    text=f"Error: {result['error']}"
-                )]
-
-            # Format result as readable text
-            output_lines = [
-                "=== Patent Claims Analysis ===\n",
-                f"Total claims: {result['total_claims']}",
-                f"Independent claims: {result['independent_count']} - {result['independent_claims']}",
-                f"Dependent claims: {result['dependent_count']}\n",
-                "=== Claim-by-Claim Analysis ===\n"
-            ]
-
-            for claim_num, analysis in result["claim_analysis"].items():
-                output_lines.append(f"Claim {claim_num}:")
-                output_lines.append(f"  Type: {analysis['type'].capitalize()}")
-                if analysis['depends_on']:
-                    output_lines.append(f"  Depends on: Claim {analysis['depends_on']}")
-                output_lines.append(f"  Word count: {analysis['word_count']}")
-                if analysis['transition_type']:
-                    output_lines.append(f"  Transition: {analysis['transition_type']}")
-
-                if analysis['structure_issues']:
-                    for issue in analysis['structure_issues']:
-                        output_lines.append(f"  ⚠ {issue}")
-
-                if analysis['antecedent_issues']:
-                    for issue in analysis['antecedent_issues']:
-                        output_lines.append(f"  ⚠ {issue}")
-
-                if analysis['warnings']:
-                    for warning in analysis['warnings']:
-                        output_lines.append(f"  ⚠ {warning}")
-
-                if analysis['suggestions']:
-                    for suggestion in analysis['suggestions']:
-                        output_lines.append(f"  💡 {suggestion}")
-
-                output_lines.append("")
-
-            return [TextContent(
-                type="text",
-                text="\n".join(output_lines)
-            )]
-
-        elif name == "generate_prior_art_search":
-            result = generate_prior_art_search(content)
-
-            # Format result as readable text
-            output_lines = [
-                "=== Prior Art Search Strategy ===\n",
-                "1. RECOMMENDED DATABASES:"
-            ]
-            for db in result["recommended_databases"]:
-                output_lines.append(f"   - {db}")
-
-            output_lines.append("\n2. TOP KEYWORDS:")
-            for i, kw in enumerate(result["top_keywords"][:20], 1):
-                output_lines.append(f"   {i:2d}. {kw['keyword']} ({kw['frequency']} occurrences)")
-
-            if result["technical_terms"]:
-                output_lines.append("\n3. TECHNICAL TERMS/PHRASES:")
-                for i, term in enumerate(result["technical_terms"], 1):
-                    output_lines.append(f"   {i:2d}. {term}")
-
-            output_lines.append("\n4. BOOLEAN SEARCH QUERIES:")
-            for i, query in enumerate(result["boolean_queries"], 1):
-                output_lines.append(f"   Query {i}: {query}")
-
-            if result["suggested_cpc_classifications"]:
-                output_lines.append("\n5. SUGGESTED CPC CLASSIFICATIONS:")
-                for cpc in result["suggested_cpc_classifications"]:
-                    output_lines.append(f"   - {cpc['classification']} (matched: {cpc['matched_keyword']})")
-
-            output_lines.append("\n6. SEARCH STRATEGY:")
-            for i, step in enumerate(result["search_strategy"], 1):
-                output_lines.append(f"   Step {i}: {step}")
-
-            return [TextContent(
-                type="text",
-                text="\n".join(output_lines)
-            )]
-
+        # Taken before reading, for the cache's memo of unchanged files
+        file_stat = file_path.stat() if file_path is not None else None
+        if file_stat is not None and file_stat.st_size >= ingest.STREAMING_THRESHOLD:
+            # Very large files are memory-mapped and scanned in place rather than copied
+            with ingest.map_document(file_path) as data:
+                if cache_key is None:
+                    with metrics.stage("cache"):
+                        cache_key, cached = lookup_cached_output(name, data, options, file_path, file_stat)
+                    if cached is not None:
+                        metrics.count("cache_hits")
+                        return [TextContent(type="text", text=cached)]
+                if session_id:
+                    # Sessions live in this process, so their analyses stay here
+                    with metrics.stage("analysis"):
+                        result = run_mapped_analysis(name, data, file_name, session_id)
+                    with metrics.stage("format"):
+                        output = format_result(name, result, output_format)
+            if not session_id:
+                output, durations = executor.compute(
+                    render_mapped_analysis, name, str(file_path), file_name, index_path, max_hits, output_format
+                )
+                metrics.add_durations(durations)
         else:
-            return [TextContent(
-                type="text",
-                text=f"Error: Unknown tool '{name}'"
-            )]
-
+            if file_path is not None:
+                with metrics.stage("read"), open(file_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+            if cache_key is None:
+                with metrics.stage("cache"):
+                    cache_key, cached = lookup_cached_output(name, content, options, file_path, file_stat)
+                if cached is not None:
+                    metrics.count("cache_hits")
+                    return [TextContent(type="text", text=cached)]
+            if session_id:
+                with metrics.stage("analysis"):
+                    result = run_analysis(name, content, file_name, session_id)
+                with metrics.stage("format"):
+                    output = format_result(name, result, output_format)
+            else:
+                output, durations = executor.compute(
+                    render_analysis, name, content, file_name, index_path, max_hits, output_format
+                )
+                metrics.add_durations(durations)
+        if cache_key is not None:
+            metrics.count("cache_misses")
     except Exception as e:
+        if output_format == "json":
+            return error_content(f"Analysis failed: {str(e)}", output_format)
+        metrics.count("errors")
         return [TextContent(
             type="text",
             text=f"Error during analysis: {str(e)}"
         )]
 
+    if cache_key is not None:
+        with metrics.stage("cache"):
+            result_cache.put(cache_key, output)
+
+    return [TextContent(
+        type="text",
+        text=output
+    )]
+
+
+def run_recorded(tool: str, submitted_ns: int, runner, *args) -> list[TextContent]:
+    """Run a tool in a worker thread and add its total latency and stage durations to server_stats.
+
+    The time between the call arriving and a worker picking it up is the "queue" stage.
+    """
+    with metrics.recording() as call:
+        call.durations["queue"] = time.perf_counter_ns() - submitted_ns
+        try:
+            return runner(*args)
+        except Exception:
+            metrics.count("exceptions")
+            raise
+        finally:
+            server_stats.record(tool, call, time.perf_counter_ns() - submitted_ns)
+
+
+# Tools other than the ANALYSIS_TOOLS, each run in a worker thread
+TOOL_RUNNERS = {
+    "batch_analyze_patents": run_batch_tool,
+    "index_prior_art": run_index_tool,
+    "search_prior_art_index": run_search_tool,
+    "find_duplicate_claims": run_duplicates_tool
+}
+
+
+@app.call_tool()
+async def call_tool(name: str, arguments: dict) -> list[TextContent]:
+    """Handle tool calls.
+
+    File reads and analyses block, so they run on the worker pools of
+    executor; the event loop keeps serving other calls meanwhile.
+    """
+
+    output_format = arguments.get("output_format") or "text"
+    if output_format not in OUTPUT_FORMATS:
+        return error_content(f"Unknown output_format '{output_format}'. Use 'text' or 'json'.")
+
+    submitted = time.perf_counter_ns()
+
+    if name in TOOL_RUNNERS:
+        return await executor.run(run_recorded, name, submitted, TOOL_RUNNERS[name], arguments, output_format)
+
+    if name == "get_cache_stats":
+        return [TextContent(type="text", text=json.dumps(result_cache.stats(), indent=2))]
+
+    if name == "get_server_stats":
+        stats = {**server_stats.snapshot(), "executor": {"kind": executor.kind, "workers": executor.workers}}
+        if arguments.get("reset"):
+            server_stats.reset()
+        return [TextContent(type="text", text=json.dumps(stats, indent=2))]
+
+    if name not in ANALYSIS_TOOLS:
+        return error_content(f"Unknown tool '{name}'", output_format)
+
+    return await executor.run(run_recorded, name, submitted, run_analysis_tool, name, arguments, output_format)
+
+
+async def log_stats(interval: float):
+    """Write a line of call latencies to stderr every interval seconds; stdout carries the protocol."""
+    while True:
+        await asyncio.sleep(interval)
+        print(server_stats.log_line(), file=sys.stderr, flush=True)
+
 
 async def main():
     """Run the MCP server."""
-    async with stdio_server() as (read_stream, write_stream):
-        await app.run(
-            read_stream,
-            write_stream,
-            app.create_initialization_options()
-        )
+    # Map the IDF table and compile the CPC table and terminology now so that bad
+    # PATENT_TOOLS_IDF_TABLE, PATENT_TOOLS_CPC_TABLE or PATENT_TOOLS_TERMINOLOGY
+    # settings fail at startup
+    default_idf_table()
+    default_matcher()
+    default_checker()
+    # A long-running server is where a worker pool for very large claim sets pays off
+    parallel.enable()
+    interval = metrics.stats_interval()
+    stats_logger = asyncio.create_task(log_stats(interval)) if interval else None
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await app.run(
+                read_stream,
+                write_stream,
+                app.create_initialization_options()
+            )
+    finally:
+        if stats_logger is not None:
+            stats_logger.cancel()
+        executor.shutdown()
+        parallel.shutdown()
 
 
 if __name__ == "__main__":
-    import asyncio
     asyncio.run(main())
@@ -0,0 +1,318 @@
+"""
+Near-duplicate claim detection with MinHash and locality-sensitive hashing.
+
+Claims that are nearly identical, within one application or across a family
+of continuations, matter for claim differentiation and double patenting.
+Comparing every pair is quadratic in the number of claims, so each claim is
+instead reduced to a set of word shingles and a MinHash signature, computed
+for all claims at once with NumPy. Signatures are cut into bands and only
+claims sharing a whole band become candidate pairs, whose Jaccard similarity
+is then estimated from their signatures. Tens of thousands of claims take
+seconds.
+
+Claim references are blanked before shingling ("The device of claim 3" and
+"The device of claim 5" read the same), so a dependent claim repeated under
+a different parent is still found.
+
+NumPy is an optional dependency of this analysis:
+
+    pip install "patent-tools-mcp-server[similarity]"
+"""
+
+import re
+import sys
+import zlib
+import argparse
+from pathlib import Path
+from typing import Any, Iterable
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .batch import collect_documents
+from .claim_graph import CLAIM_REFERENCE_PATTERN
+from .core import extract_claims
+
+
+DEFAULT_THRESHOLD = 0.8
+
+# Signature length; longer signatures estimate similarity more precisely
+DEFAULT_NUM_PERM = 128
+
+# Words per shingle
+DEFAULT_SHINGLE_SIZE = 3
+
+DEFAULT_SEED = 1
+
+# Probability that a pair exactly at the threshold becomes an LSH candidate
+CANDIDATE_RECALL = 0.99
+
+# Shingles hashed, or candidate pairs compared, per NumPy block, bounding
+# the (block x num_perm) temporaries
+HASH_BLOCK = 1 << 13
+
+WORD_PATTERN = re.compile(r'[a-z0-9]+')
+
+# Multipliers combining the word hashes of a shingle (odd 64-bit constants)
+SHINGLE_MULTIPLIERS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0x27D4EB2F165667C5)
+
+
+def require_numpy():
+    if np is None:
+        raise ImportError(
+            "Near-duplicate claim detection needs NumPy. "
+            "Install it with: pip install \"patent-tools-mcp-server[similarity]\""
+        )
+
+
+def claim_words(claim_text: str) -> list[str]:
+    """Lowercase words of a claim with the numbers of claim references removed."""
+    return WORD_PATTERN.findall(CLAIM_REFERENCE_PATTERN.sub("claim", claim_text.lower()))
+
+
+def choose_bands(num_perm: int, threshold: float) -> tuple[int, int]:
+    """Pick bands x rows = num_perm with as many rows as possible (fewest candidates)
+    while a pair at the threshold still shares a band with probability CANDIDATE_RECALL.
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        if 1 - (1 - threshold ** rows) ** bands >= CANDIDATE_RECALL:
+            best = (bands, rows)
+    return best
+
+
+class MinHasher:
+    """MinHash signatures over 32-bit shingle hashes.
+
+    Each of the num_perm hash functions is the multiply-add-shift function
+    h(x) = ((a * x + b) mod 2^64) >> 32 with random 64-bit a (odd) and b;
+    NumPy's wrapping uint64 arithmetic computes the modulus for free.
+    """
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM, seed: int = DEFAULT_SEED):
+        require_numpy()
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.a = rng.integers(0, 1 << 63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self.b = rng.integers(0, 1 << 63, size=num_perm, dtype=np.uint64)
+
+    def signatures(self, shingles: "np.ndarray", owners: "np.ndarray", count: int) -> "np.ndarray":
+        """Signatures of count sets, given every set's shingle hashes and the set each belongs to.
+
+        owners must be sorted. A set without shingles keeps an all-0xFFFFFFFF signature.
+        """
+        signatures = np.full((count, self.num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+        shift = np.uint64(32)
+
+        for start in range(0, len(shingles), HASH_BLOCK):
+            block = shingles[start:start + HASH_BLOCK, None]
+            block_owners = owners[start:start + HASH_BLOCK]
+            hashed = ((block * self.a + self.b) >> shift).astype(np.uint32)
+
+            # One row per set in the block; a set cut by the block edge is merged below
+            first = np.flatnonzero(np.r_[True, block_owners[1:] != block_owners[:-1]])
+            minima = np.minimum.reduceat(hashed, first, axis=0)
+            rows = block_owners[first]
+            signatures[rows] = np.minimum(signatures[rows], minima)
+
+        return signatures
+
+
+def shingle_claims(claims: list[str], shingle_size: int = DEFAULT_SHINGLE_SIZE) -> tuple["np.ndarray", "np.ndarray"]:
+    """Hash the word shingles of every claim, returning (shingle hashes, claim index) sorted by claim.
+
+    A claim shorter than one shingle contributes a single shingle of all its words.
+    """
+    word_hashes = {}
+    words = []
+    lengths = []
+    for claim in claims:
+        tokens = claim_words(claim)
+        for token in tokens:
+            if token not in word_hashes:
+                word_hashes[token] = zlib.crc32(token.encode())
+        words.extend(word_hashes[token] for token in tokens)
+        lengths.append(len(tokens))
+
+    words = np.array(words, dtype=np.uint64)
+    lengths = np.array(lengths, dtype=np.int64)
+    ends = np.cumsum(lengths)
+    owner_of_word = np.repeat(np.arange(len(claims)), lengths)
+    multipliers = np.array(SHINGLE_MULTIPLIERS * shingle_size, dtype=np.uint64)[:shingle_size]
+
+    # Shingles starting at every word, kept where they end inside the same claim
+    windows = max(len(words) - shingle_size + 1, 0)
+    combined = np.zeros(windows, dtype=np.uint64)
+    for offset in range(shingle_size):
+        combined += words[offset:offset + windows] * multipliers[offset]
+    owners = owner_of_word[:windows]
+    keep = np.arange(windows) + shingle_size <= ends[owners]
+    combined, owners = combined[keep], owners[keep]
+
+    short = np.flatnonzero((lengths > 0) & (lengths < shingle_size))
+    if len(short):
+        extra = []
+        for claim in short:
+            end = ends[claim]
+            extra.append((words[end - lengths[claim]:end] * multipliers[:lengths[claim]]).sum(dtype=np.uint64))
+        combined = np.concatenate([combined, np.array(extra, dtype=np.uint64)])
+        owners = np.concatenate([owners, short])
+        order = np.argsort(owners, kind="stable")
+        combined, owners = combined[order], owners[order]
+
+    # Fold to 32 bits for the MinHash functions
+    folded = (combined ^ (combined >> np.uint64(32))) & np.uint64(0xFFFFFFFF)
+    return folded, owners
+
+
+def lsh_candidates(signatures: "np.ndarray", bands: int, rows: int) -> "np.ndarray":
+    """Index pairs (i < j) of signatures that agree on every row of at least one band."""
+    count = len(signatures)
+    band_multipliers = np.array((SHINGLE_MULTIPLIERS * rows)[:rows], dtype=np.uint64)
+    codes = []
+
+    for band in range(bands):
+        band_rows = signatures[:, band * rows:(band + 1) * rows].astype(np.uint64)
+        keys = (band_rows * band_multipliers).sum(axis=1)
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+
+        # Pair each position of a run of equal keys with every later position of the run
+        boundaries = np.flatnonzero(sorted_keys[1:] != sorted_keys[:-1]) + 1
+        run_ends = np.repeat(np.r_[boundaries, count], np.diff(np.r_[0, boundaries, count]))
+        later = run_ends - np.arange(count) - 1
+        total = int(later.sum())
+        if not total:
+            continue
+        left = np.repeat(np.arange(count), later)
+        first_pair = np.cumsum(later) - later
+        right = left + 1 + np.arange(total) - np.repeat(first_pair, later)
+
+        first, second = order[left], order[right]
+        codes.append(np.minimum(first, second) * count + np.maximum(first, second))
+
+    if not codes:
+        return np.empty((0, 2), dtype=np.int64)
+    codes = np.sort(np.concatenate(codes))
+    codes = codes[np.r_[True, codes[1:] != codes[:-1]]]
+    return np.stack([codes // count, codes % count], axis=1)
+
+
+def find_near_duplicate_claims(
+    documents: dict[str, str],
+    threshold: float = DEFAULT_THRESHOLD,
+    num_perm: int = DEFAULT_NUM_PERM,
+    shingle_size: int = DEFAULT_SHINGLE_SIZE,
+    seed: int = DEFAULT_SEED
+) -> dict[str, Any]:
+    """Find pairs of claims, within and across documents, with estimated Jaccard similarity >= threshold.
+
+    documents maps a document name (such as its path) to its content.
+    """
+    require_numpy()
+    if not 0 < threshold <= 1:
+        raise ValueError("threshold must be greater than 0 and at most 1")
+
+    sources = []
+    texts = []
+    for name, content in documents.items():
+        for claim_num, claim_text in extract_claims(content).items():
+            sources.append((name, claim_num))
+            texts.append(claim_text)
+
+    bands, rows = choose_bands(num_perm, threshold)
+    result = {
+        "documents": len(documents),
+        "claims": len(texts),
+        "threshold": threshold,
+        "num_perm": num_perm,
+        "bands": bands,
+        "rows": rows,
+        "pairs": []
+    }
+    if len(texts) < 2:
+        return result
+
+    shingles, owners = shingle_claims(texts, shingle_size)
+    signatures = MinHasher(num_perm, seed).signatures(shingles, owners, len(texts))
+
+    # Claims without words have no signature and are left out
+    present = owners[np.r_[True, owners[1:] != owners[:-1]]] if len(owners) else owners
+    if len(present) < 2:
+        return result
+    candidates = lsh_candidates(signatures[present], bands, rows)
+    if not len(candidates):
+        return result
+
+    first, second = present[candidates[:, 0]], present[candidates[:, 1]]
+    similarity = np.empty(len(candidates))
+    for start in range(0, len(candidates), HASH_BLOCK):
+        block = slice(start, start + HASH_BLOCK)
+        similarity[block] = (signatures[first[block]] == signatures[second[block]]).mean(axis=1)
+    matched = np.flatnonzero(similarity >= threshold)
+    matched = matched[np.lexsort((second[matched], first[matched], -similarity[matched]))]
+
+    for i in matched.tolist():
+        (first_document, first_claim), (second_document, second_claim) = sources[first[i]], sources[second[i]]
+        result["pairs"].append({
+            "first": {"document": first_document, "claim": first_claim},
+            "second": {"document": second_document, "claim": second_claim},
+            "similarity": round(float(similarity[i]), 3),
+            "same_document": first_document == second_document
+        })
+
+    return result
+
+
+def read_documents(paths: Iterable[Path]) -> dict[str, str]:
+    """Contents of each document by path."""
+    return {str(path): path.read_text(encoding="utf-8") for path in paths}
+
+
+def format_pair(pair: dict[str, Any]) -> str:
+    """One readable line for a near-duplicate pair."""
+    first, second = pair["first"], pair["second"]
+    if pair["same_document"]:
+        return f"Claim {first['claim']} ~ claim {second['claim']} ({pair['similarity']:.0%}) in {first['document']}"
+    return (
+        f"Claim {first['claim']} of {first['document']} ~ "
+        f"claim {second['claim']} of {second['document']} ({pair['similarity']:.0%})"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find near-duplicate claims within and across patent documents.")
+    parser.add_argument("target", help="Directory (searched recursively), file or glob of documents")
+    parser.add_argument("--pattern", default="*.md", help="File pattern for directories (default: *.md)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Minimum estimated Jaccard similarity (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--num-perm", type=int, default=DEFAULT_NUM_PERM,
+                        help=f"MinHash signature length (default: {DEFAULT_NUM_PERM})")
+    parser.add_argument("--shingle-size", type=int, default=DEFAULT_SHINGLE_SIZE,
+                        help=f"Words per shingle (default: {DEFAULT_SHINGLE_SIZE})")
+    args = parser.parse_args()
+
+    paths = collect_documents(args.target, args.pattern)
+    if not paths:
+        print(f"Error: No documents found for '{args.target}'.", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        result = find_near_duplicate_claims(read_documents(paths), args.threshold, args.num_perm, args.shingle_size)
+    except (ImportError, OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"{result['claims']} claims in {result['documents']} documents, "
+          f"{len(result['pairs'])} near-duplicate pairs (similarity >= {args.threshold:.0%}):")
+    for pair in result["pairs"]:
+        print(f"  {format_pair(pair)}")
+
+
+if __name__ == "__main__":
+    main()
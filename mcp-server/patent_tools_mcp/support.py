@@ -0,0 +1,336 @@
+"""
+Claim-term support in the specification.
+
+Every element a claim introduces or refers back to should appear in the
+detailed description. The specification's word n-grams are indexed once;
+each noun phrase after "a", "an" or "the" in the claims ("a gate
+electrode", "the lightly doped drift region"), up to the first word that
+cannot belong to it, is then a single lookup, however long the
+specification and however many claims there are. Unsupported terms are
+reported with the phrases of the specification that come nearest to them,
+found through the words they share and, for words the specification never
+uses, through words spelled alike.
+
+Words are compared in lowercase and singular form, so "gate electrodes" in
+the description supports "a gate electrode" in the claims. The indexes of
+recently checked specifications are kept, by a digest of their text, so
+re-checking edited claims against an unchanged specification skips indexing.
+"""
+
+import re
+import sys
+import argparse
+import threading
+from collections import Counter, OrderedDict
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Any
+
+from .cache import content_digest
+from .core import extract_claims, scan_sections
+from .cpc import TOKEN_PATTERN, normalize_token
+from .metrics import stage
+
+
+# Longest n-gram indexed; longer terms are looked up as phrases in the specification
+MAX_NGRAM = 3
+
+# Most words taken into a claim term
+MAX_TERM_WORDS = 6
+
+# Nearest specification phrases reported per unsupported term
+NEAREST_MATCHES = 3
+
+# Claims listed per unsupported term in the text report
+LISTED_CLAIMS = 8
+
+# Candidate phrases scored for each unsupported term, and the lowest score reported
+NEAREST_CANDIDATES = 200
+NEAREST_MIN_SCORE = 0.5
+
+# Spelling neighbours looked up for a claim word the specification never uses
+SIMILAR_WORDS = 5
+SIMILAR_WORD_MIN_SCORE = 0.4
+
+# Specification words, summed over the kept indexes, beyond which the least recently used is dropped
+INDEX_CACHE_WORDS = 2_000_000
+
+DETAILED_DESCRIPTION_PATTERN = re.compile(r'DETAILED\s+DESCRIPTION', re.IGNORECASE)
+OMITTED_SECTION_PATTERN = re.compile(r'CLAIMS|ABSTRACT', re.IGNORECASE)
+
+# Words that end a claim element rather than belong to it ("a layer having", "the device of",
+# "a material selected from")
+PHRASE_BREAK_WORDS = frozenset({
+    'a', 'about', 'above', 'across', 'adapted', 'adjacent', 'after', 'along', 'an', 'and', 'are',
+    'arranged', 'as', 'at', 'attached', 'be', 'being', 'below', 'beneath', 'between', 'by', 'capable',
+    'comprises', 'comprising', 'configured', 'connected', 'consisting', 'contacting', 'coupled',
+    'covering', 'disposed', 'during', 'each', 'extending', 'for', 'formed', 'from', 'further', 'has',
+    'have', 'having', 'in', 'includes', 'including', 'into', 'is', 'its', 'located', 'made', 'mounted',
+    'not', 'of', 'on', 'onto', 'operable', 'or', 'over', 'plurality', 'positioned', 'said', 'selected',
+    'so', 'such', 'surrounding', 'than', 'that', 'the', 'their', 'there', 'thereof', 'thereon',
+    'therein', 'through', 'to', 'under', 'upon', 'used', 'when', 'where', 'which', 'wherein', 'whereby',
+    'with', 'within', 'without'
+})
+
+# Every "a", "an" and "the" with the words that follow it, up to a line of MAX_TERM_WORDS. The words
+# sit in a lookahead so that an article inside them starts a term of its own.
+CLAIM_TERM_PATTERN = re.compile(
+    r'\b(?:the|an?)\s+(?=([a-z]+(?:\s+[a-z]+){0,%d}))' % (MAX_TERM_WORDS - 1), re.IGNORECASE
+)
+
+
+def normalize_words(text: str) -> list[str]:
+    """Lowercase singular word tokens, as indexed and looked up."""
+    normalized = {}
+    words = []
+    for word in TOKEN_PATTERN.findall(text.lower()):
+        token = normalized.get(word)
+        if token is None:
+            token = normalized[word] = normalize_token(word)
+        words.append(token)
+    return words
+
+
+def specification_text(content: str) -> tuple[str, list[str]]:
+    """The detailed description of a document, or everything but its claims and abstract.
+
+    Returns the text and the headings of the sections it was taken from.
+    """
+    _, boundaries = scan_sections(content)
+    ends = [start for start, _ in boundaries[1:]] + [len(content)]
+    sections = [(heading, start, end) for (start, heading), end in zip(boundaries, ends)]
+
+    chosen = [section for section in sections if section[0] and DETAILED_DESCRIPTION_PATTERN.search(section[0])]
+    if not chosen:
+        chosen = [section for section in sections if not (section[0] and OMITTED_SECTION_PATTERN.match(section[0]))]
+
+    return "\n".join(content[start:end] for _, start, end in chosen), [heading or "" for heading, _, _ in chosen]
+
+
+def claim_terms(claims: dict[int, str]) -> dict[str, list[int]]:
+    """The noun phrases introduced ("a/an") or referred to ("the") in each claim, with the claims using them.
+
+    A term runs from the article to the first word that ends an element, a
+    number or a punctuation mark, and holds at most MAX_TERM_WORDS words.
+    """
+    terms = {}
+    for claim_num, claim_text in claims.items():
+        for match in CLAIM_TERM_PATTERN.finditer(claim_text):
+            words = []
+            for word in match.group(1).lower().split():
+                if word in PHRASE_BREAK_WORDS:
+                    break
+                words.append(word)
+            if words:
+                claim_nums = terms.setdefault(" ".join(words), [])
+                if not claim_nums or claim_nums[-1] != claim_num:
+                    claim_nums.append(claim_num)
+    return terms
+
+
+class SpecificationIndex:
+    """Word n-grams of a specification, with lazily built lookups for nearest matches."""
+
+    def __init__(self, text: str):
+        words = normalize_words(text)
+        self.word_count = len(words)
+        self.ngrams = Counter()
+        for n in range(1, MAX_NGRAM + 1):
+            self.ngrams.update(" ".join(words[i:i + n]) for i in range(len(words) - n + 1))
+        # The normalized words, for terms longer than the n-grams
+        self._words = f" {' '.join(words)} "
+        self._phrases_by_word = None
+        self._words_by_trigram = None
+
+    def occurrences(self, term: str) -> int:
+        """How often a term appears as a whole, in normalized words."""
+        words = normalize_words(term)
+        if not words:
+            return 0
+        if len(words) <= MAX_NGRAM:
+            return self.ngrams.get(" ".join(words), 0)
+        # Only a term whose every window is indexed can appear; the rest need no scan
+        if not all(self.ngrams.get(" ".join(words[i:i + MAX_NGRAM])) for i in range(len(words) - MAX_NGRAM + 1)):
+            return 0
+        return self._words.count(f" {' '.join(words)} ")
+
+    def _phrase_lookup(self) -> dict[str, list[str]]:
+        """Word -> the phrases containing it, leaving out phrases that start or end on a function word or number."""
+        if self._phrases_by_word is None:
+            self._phrases_by_word = {}
+            for phrase in self.ngrams:
+                words = phrase.split()
+                if is_phrase_edge(words[0]) or is_phrase_edge(words[-1]):
+                    continue
+                for word in set(words):
+                    self._phrases_by_word.setdefault(word, []).append(phrase)
+        return self._phrases_by_word
+
+    def _trigram_lookup(self) -> dict[str, list[str]]:
+        if self._words_by_trigram is None:
+            self._words_by_trigram = {}
+            for word in self._phrase_lookup():
+                for trigram in word_trigrams(word):
+                    self._words_by_trigram.setdefault(trigram, []).append(word)
+        return self._words_by_trigram
+
+    def similar_words(self, word: str) -> list[str]:
+        """Specification words spelled most like a word, by Jaccard similarity of their letter trigrams."""
+        trigrams = word_trigrams(word)
+        shared = Counter()
+        lookup = self._trigram_lookup()
+        for trigram in trigrams:
+            shared.update(lookup.get(trigram, ()))
+        scored = [
+            (count / (len(trigrams) + len(word_trigrams(other)) - count), other)
+            for other, count in shared.items()
+        ]
+        return [other for score, other in sorted(scored, reverse=True)[:SIMILAR_WORDS] if score >= SIMILAR_WORD_MIN_SCORE]
+
+    def nearest(self, term: str) -> list[dict[str, Any]]:
+        """The specification phrases closest to a term: sharing its words, or words spelled like them."""
+        words = normalize_words(term)
+        lookup = self._phrase_lookup()
+        anchors = set()
+        for word in words:
+            anchors.update([word] if word in lookup else self.similar_words(word))
+
+        # Phrases sharing the most anchor words, then the most frequent, are scored; a term
+        # longer than the n-grams is compared with the longest
+        length = min(len(words), MAX_NGRAM)
+        shared = Counter()
+        for anchor in anchors:
+            shared.update(phrase for phrase in lookup.get(anchor, ()) if abs(phrase.count(" ") + 1 - length) <= 1)
+        candidates = sorted(shared, key=lambda phrase: (-shared[phrase], -self.ngrams[phrase], phrase))[:NEAREST_CANDIDATES]
+
+        query = " ".join(words)
+        scored = []
+        for phrase in candidates:
+            score = SequenceMatcher(None, query, phrase, autojunk=False).ratio()
+            if score >= NEAREST_MIN_SCORE:
+                scored.append((-score, -self.ngrams[phrase], phrase))
+
+        return [
+            {"phrase": phrase, "score": round(-score, 3), "occurrences": -count}
+            for score, count, phrase in sorted(scored)[:NEAREST_MATCHES]
+        ]
+
+
+def is_phrase_edge(word: str) -> bool:
+    """Whether a word cannot start or end a suggested phrase."""
+    return word in PHRASE_BREAK_WORDS or word.isdigit()
+
+
+def word_trigrams(word: str) -> set[str]:
+    padded = f" {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+_index_cache = OrderedDict()
+_index_cache_words = 0
+_index_cache_lock = threading.Lock()
+
+
+def specification_index(text: str) -> SpecificationIndex:
+    """The index of a specification, reused while the specification is unchanged.
+
+    Indexes are kept by a digest of the text rather than the text itself, and
+    the least recently used are dropped once the kept indexes cover more than
+    INDEX_CACHE_WORDS words.
+    """
+    global _index_cache_words
+    key = content_digest(text)
+    with _index_cache_lock:
+        index = _index_cache.get(key)
+        if index is not None:
+            _index_cache.move_to_end(key)
+            return index
+
+    index = SpecificationIndex(text)
+    with _index_cache_lock:
+        if key not in _index_cache:
+            _index_cache[key] = index
+            _index_cache_words += index.word_count
+        while _index_cache_words > INDEX_CACHE_WORDS and len(_index_cache) > 1:
+            _index_cache_words -= _index_cache.popitem(last=False)[1].word_count
+    return index
+
+
+def clear_index_cache():
+    """Drop every kept specification index."""
+    global _index_cache_words
+    with _index_cache_lock:
+        _index_cache.clear()
+        _index_cache_words = 0
+
+
+def check_claim_support(content: str) -> dict[str, Any]:
+    """Report the claim terms that do not appear in the specification of a document."""
+    claims = extract_claims(content)
+    if not claims:
+        return {
+            "error": "No claims found in document",
+            "claims_count": 0
+        }
+
+    with stage("support.index"):
+        text, headings = specification_text(content)
+        index = specification_index(text)
+
+    with stage("support.lookup"):
+        terms = claim_terms(claims)
+        missing = [(term, claim_nums) for term, claim_nums in terms.items() if not index.occurrences(term)]
+
+    with stage("support.nearest"):
+        unsupported = [
+            {"term": term, "claims": claim_nums, "nearest": index.nearest(term)} for term, claim_nums in missing
+        ]
+
+    return {
+        "total_claims": len(claims),
+        "specification_sections": headings,
+        "specification_words": index.word_count,
+        "terms_checked": len(terms),
+        "supported_count": len(terms) - len(unsupported),
+        "unsupported_count": len(unsupported),
+        "unsupported": unsupported
+    }
+
+
+def format_unsupported(entry: dict[str, Any]) -> list[str]:
+    """Readable lines for one unsupported term and its nearest matches."""
+    claims = ", ".join(map(str, entry["claims"][:LISTED_CLAIMS]))
+    if len(entry["claims"]) > LISTED_CLAIMS:
+        claims += f" and {len(entry['claims']) - LISTED_CLAIMS} more"
+    lines = [f"⚠ '{entry['term']}' (claim{'s' if len(entry['claims']) > 1 else ''} {claims}) not found in the specification"]
+    if entry["nearest"]:
+        lines.append("  Nearest: " + ", ".join(
+            f"'{match['phrase']}' ({match['occurrences']}x)" for match in entry["nearest"]
+        ))
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that every claim term appears in the specification.")
+    parser.add_argument("document", help="Patent application containing the claims and the specification")
+    args = parser.parse_args()
+
+    try:
+        content = Path(args.document).read_text(encoding='utf-8')
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    result = check_claim_support(content)
+    if "error" in result:
+        print(f"Error: {result['error']}", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"{result['terms_checked']} claim terms, {result['unsupported_count']} not found in "
+          f"{result['specification_words']} words of specification")
+    for entry in result["unsupported"]:
+        print("\n".join(format_unsupported(entry)))
+
+
+if __name__ == "__main__":
+    main()
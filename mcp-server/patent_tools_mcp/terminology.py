@@ -0,0 +1,367 @@
+"""
+Terminology consistency checking.
+
+The terminology reference (docs/h01l-terminology-reference.md) asks that a
+drafter pick one term and stick to it: "substrate", not sometimes "wafer";
+"dielectric layer", not sometimes "insulating layer". Its tables and best
+practices are compiled into groups of interchangeable terms, each with the
+preferred term when the reference names one:
+
+    "Same as X" / "Same as above"     the row's term is a synonym of X
+    also called "Y" / Also called Y   Y is a synonym of the row's term
+    "Preferred ... term"              the row's term is preferred
+    ✓ "X" ... ✗ "Y"                   X is preferred over Y within one rule
+    Mixing / switch(ing) between /    the quoted terms are interchangeable;
+    alternate between "X" and "Y"     a table term is preferred over the rest
+
+Every term of a group, together with every other term of the reference, is
+compiled into one phrase automaton (cpc.PhraseMatcher), so a document is
+scanned in a single pass however many terms there are. Overlapping matches
+are resolved in favour of the longest, so "wafer" inside "handle wafer" is
+left alone. Each use of a non-preferred term is reported; in a group without
+a preferred term, the first term the document uses is the one to keep and
+every use of another is reported.
+
+Notation the word tokens cannot tell apart ("n+"), phrases with numbers and
+an alternative that is just a word of the preferred term ("gate" for "gate
+electrode") are left out of the groups.
+
+The compiled groups of the built-in reference are kept in
+data/terminology.json, built with
+
+    python -m patent_tools_mcp.terminology compile docs/h01l-terminology-reference.md -o data/terminology.json
+
+A further reference (markdown or compiled JSON) can be added through
+PATENT_TOOLS_TERMINOLOGY.
+"""
+
+import os
+import re
+import sys
+import json
+import hashlib
+import argparse
+from pathlib import Path
+from typing import Any
+
+from .cpc import (
+    PARENTHETICAL_PATTERN,
+    PhraseMatcher,
+    terminology_keywords,
+    tokenize
+)
+
+
+BUILTIN_TERMINOLOGY_PATH = Path(__file__).parent / "data" / "terminology.json"
+
+# Characters of context on each side of a reported use
+CONTEXT_CHARS = 40
+
+# Bold first cell of a table row and the cells that follow it
+TERM_ROW_PATTERN = re.compile(r'^\|\s*\*\*([^*|]+)\*\*([^|\n]*)((?:\|[^|\n]*)*)\|\s*$', re.MULTILINE)
+
+SAME_AS_PATTERN = re.compile(r'\bsame as\s+(above|[^|()]+?)\s*(?:\(|$)', re.IGNORECASE)
+ALSO_CALLED_PATTERN = re.compile(r'\balso called\s+"?([^"|()]+?)"?\s*(?:\)|$)', re.IGNORECASE)
+PREFERRED_PATTERN = re.compile(r'\bpreferred\b.*\bterm\b', re.IGNORECASE)
+
+# Numbered best-practice rules and the ✓ / ✗ lines within them
+RULE_PATTERN = re.compile(r'^\d+\.\s', re.MULTILINE)
+QUOTED_PATTERN = re.compile(r'"([^"]+)"')
+MIXING_PATTERN = re.compile(r'\b(?:mixing|switch(?:ing)? between|alternat(?:e|ing) between)\b', re.IGNORECASE)
+
+# Terms the word tokens match faithfully: letters, spaces, hyphens and slashes
+MATCHABLE_TERM_PATTERN = re.compile(r'^[A-Za-z][A-Za-z\s/-]*$')
+
+
+def clean_term(term: str) -> str:
+    return term.strip().strip(',.;:').strip()
+
+
+def term_key(term: str) -> str:
+    return " ".join(tokenize(term))
+
+
+class TermGroups:
+    """Groups of interchangeable terms, merged whenever two groups share a term."""
+
+    def __init__(self):
+        self.groups = []
+        self._group_of = {}
+
+    def add(self, terms: list[str], preferred: str | None = None, rules: list[str] = ()):
+        terms = [clean_term(term) for term in terms]
+        preferred = clean_term(preferred) if preferred else None
+        terms = [term for term in dict.fromkeys(terms) if MATCHABLE_TERM_PATTERN.match(term)]
+        if preferred is not None and preferred not in terms:
+            preferred = None
+        if preferred is not None:
+            # "gate" for "gate electrode" cannot be told apart from the start of the preferred term
+            words = set(tokenize(preferred))
+            terms = [term for term in terms if term == preferred or not set(tokenize(term)) <= words]
+        if len(terms) < 2:
+            return
+
+        merged = {"preferred": preferred, "terms": [], "rules": []}
+        for term in terms:
+            index = self._group_of.get(term_key(term))
+            if index is not None and self.groups[index] is not None and self.groups[index] is not merged:
+                existing = self.groups[index]
+                self.groups[index] = None
+                merged["preferred"] = merged["preferred"] or existing["preferred"]
+                merged["terms"] += [t for t in existing["terms"] if t not in merged["terms"]]
+                merged["rules"] += existing["rules"]
+        merged["terms"] += [term for term in terms if term not in merged["terms"]]
+        merged["rules"] += [rule for rule in rules if rule not in merged["rules"]]
+
+        self.groups.append(merged)
+        for term in merged["terms"]:
+            self._group_of[term_key(term)] = len(self.groups) - 1
+
+    def mark_preferred(self, term: str):
+        index = self._group_of.get(term_key(term))
+        if index is not None and self.groups[index]["preferred"] is None:
+            self.groups[index]["preferred"] = clean_term(term)
+
+    def to_list(self) -> list[dict[str, Any]]:
+        return [group for group in self.groups if group is not None]
+
+
+def compile_terminology_reference(text: str) -> dict[str, Any]:
+    """Compile a markdown terminology reference into its terms and groups of interchangeable terms."""
+    terms = terminology_keywords(text)
+    table_terms = {term_key(term) for term in terms}
+    groups = TermGroups()
+    preferred_terms = []
+
+    previous = None
+    for row in TERM_ROW_PATTERN.finditer(text):
+        term = PARENTHETICAL_PATTERN.sub('', row.group(1)).strip()
+        cells = row.group(2) + row.group(3)
+        rule = " ".join(row.group(0).split())
+        for cell in cells.split('|'):
+            cell = cell.strip()
+            if match := SAME_AS_PATTERN.search(cell):
+                target = previous if match.group(1).lower() == "above" else match.group(1)
+                if target:
+                    groups.add([target, term], preferred=target, rules=[rule])
+            # An acronym ("Also called LDD") is shorthand to define, not a synonym to avoid
+            if (match := ALSO_CALLED_PATTERN.search(cell)) and not match.group(1).isupper():
+                groups.add([term, match.group(1)], preferred=term, rules=[rule])
+            if PREFERRED_PATTERN.search(cell):
+                preferred_terms.append(term)
+        previous = term
+
+    # Best-practice rules: a ✓ term is preferred over the ✗ terms of the same rule
+    rule_starts = [match.start() for match in RULE_PATTERN.finditer(text)] + [len(text)]
+    for start, end in zip(rule_starts, rule_starts[1:]):
+        preferred = None
+        for line in text[start:end].split('\n'):
+            if line.lstrip().startswith('#'):
+                break
+            quoted = QUOTED_PATTERN.findall(line)
+            if '✓' in line and quoted:
+                preferred = preferred or quoted[0]
+            elif '✗' in line and quoted and preferred:
+                groups.add([preferred] + quoted, preferred=preferred, rules=[" ".join(line.split())])
+
+    # "Mixing X and Y", "switching between X and Y" anywhere in the reference
+    for line in text.split('\n'):
+        if MIXING_PATTERN.search(line) and '✓' not in line and '✗' not in line:
+            quoted = [clean_term(term) for term in QUOTED_PATTERN.findall(line)]
+            in_tables = [term for term in quoted if term_key(term) in table_terms]
+            preferred = in_tables[0] if len(in_tables) == 1 else None
+            groups.add(quoted, preferred=preferred, rules=[" ".join(line.strip(' -*').split())])
+
+    for term in preferred_terms:
+        groups.mark_preferred(term)
+
+    grouped = {term_key(term) for group in groups.to_list() for term in group["terms"]}
+    return {
+        "terms": [term for term in terms if term_key(term) not in grouped],
+        "groups": groups.to_list()
+    }
+
+
+def load_terminology(path: str | Path) -> dict[str, Any]:
+    """Load a compiled terminology (JSON) or compile a markdown reference."""
+    path = Path(path)
+    text = path.read_text(encoding='utf-8')
+    if path.suffix.lower() == '.json':
+        return json.loads(text)
+    return compile_terminology_reference(text)
+
+
+def merge_terminologies(terminologies: list[dict[str, Any]]) -> dict[str, Any]:
+    """Combine compiled terminologies, merging groups that share a term."""
+    groups = TermGroups()
+    terms = {}
+    for terminology in terminologies:
+        for term in terminology["terms"]:
+            terms.setdefault(term_key(term), term)
+        for group in terminology["groups"]:
+            groups.add(group["terms"], group["preferred"], group["rules"])
+
+    grouped = {term_key(term) for group in groups.to_list() for term in group["terms"]}
+    return {
+        "terms": [term for key, term in terms.items() if key not in grouped],
+        "groups": groups.to_list()
+    }
+
+
+class TerminologyChecker:
+    """A compiled terminology: one phrase automaton over every term of the reference."""
+
+    def __init__(self, terminology: dict[str, Any]):
+        self.groups = terminology["groups"]
+        table = {str(index): group["terms"] for index, group in enumerate(self.groups)}
+        table[""] = terminology["terms"]
+        self.matcher = PhraseMatcher(table)
+        # Digest of the compiled terminology, so that cached results change with the reference
+        self.version = hashlib.blake2b(
+            json.dumps(terminology, sort_keys=True).encode('utf-8'), digest_size=8
+        ).hexdigest()
+
+    def find_group_terms(self, text: str) -> list[tuple[int, int, int, str]]:
+        """Uses of grouped terms as (start, end, group, term), leaving those inside a longer term."""
+        matches = sorted(self.matcher.find(text), key=lambda match: (match[0], match[0] - match[1]))
+        uses = []
+        covered = 0
+        for start, end, code, term in matches:
+            if start < covered:
+                continue
+            covered = end
+            if code:
+                uses.append((start, end, int(code), term))
+        return uses
+
+    def check(self, text: str) -> dict[str, Any]:
+        """Report every use of a non-preferred term and every switch between interchangeable terms."""
+        uses = self.find_group_terms(text)
+
+        by_group = {}
+        for use in uses:
+            by_group.setdefault(use[2], []).append(use)
+
+        findings = []
+        flagged = []
+        for index, group_uses in by_group.items():
+            group = self.groups[index]
+            counts = {}
+            for _, _, _, term in group_uses:
+                counts[term] = counts.get(term, 0) + 1
+
+            if group["preferred"]:
+                keep, kind = group["preferred"], "non_preferred"
+            elif len(counts) > 1:
+                keep, kind = group_uses[0][3], "inconsistent"
+            else:
+                continue
+
+            offending = [use for use in group_uses if use[3] != keep]
+            if not offending:
+                continue
+            flagged += [(use, len(findings)) for use in offending]
+            findings.append({
+                "kind": kind,
+                "use": keep,
+                "counts": counts,
+                "rules": group["rules"],
+                "occurrences": []
+            })
+
+        # Line numbers in one pass over the document, in order of position
+        line = 1
+        position = 0
+        for (start, end, _, term), finding in sorted(flagged):
+            line += text.count('\n', position, start)
+            position = start
+            findings[finding]["occurrences"].append({
+                "term": term,
+                "line": line,
+                "start": start,
+                "end": end,
+                "context": " ".join(text[max(0, start - CONTEXT_CHARS):end + CONTEXT_CHARS].split())
+            })
+
+        findings.sort(key=lambda finding: finding["occurrences"][0]["start"])
+        return {
+            "groups_checked": len(self.groups),
+            "terms_found": len(uses),
+            "issue_count": sum(len(finding["occurrences"]) for finding in findings),
+            "issues": findings
+        }
+
+
+_default_checker = None
+
+
+def default_checker() -> TerminologyChecker:
+    """The checker for the built-in terminology plus PATENT_TOOLS_TERMINOLOGY, compiled on first use."""
+    global _default_checker
+    if _default_checker is None:
+        terminologies = [load_terminology(BUILTIN_TERMINOLOGY_PATH)]
+        for path in os.environ.get("PATENT_TOOLS_TERMINOLOGY", "").split(os.pathsep):
+            if path:
+                terminologies.append(load_terminology(path))
+        _default_checker = TerminologyChecker(
+            terminologies[0] if len(terminologies) == 1 else merge_terminologies(terminologies)
+        )
+    return _default_checker
+
+
+def check_terminology(content: str) -> dict[str, Any]:
+    """Check a document against the default terminology."""
+    return default_checker().check(content)
+
+
+def format_finding(finding: dict[str, Any]) -> str:
+    """One line naming the terms of a finding and where the replaced ones are used."""
+    replaced = sorted({occurrence["term"] for occurrence in finding["occurrences"]})
+    lines = ", ".join(str(occurrence["line"]) for occurrence in finding["occurrences"])
+    if finding["kind"] == "non_preferred":
+        advice = f"use '{finding['use']}' instead of " + ", ".join(f"'{term}'" for term in replaced)
+    else:
+        advice = ", ".join(f"'{term}'" for term in replaced) + f" mixed with '{finding['use']}'"
+    return f"{advice} (line{'s' if len(finding['occurrences']) > 1 else ''} {lines})"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile a terminology reference or check a document against it.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    compile_command = commands.add_parser("compile", help="Compile a markdown terminology reference to JSON")
+    compile_command.add_argument("reference", help="Markdown terminology reference")
+    compile_command.add_argument("-o", "--output", help="JSON file to write (default: standard output)")
+
+    check_command = commands.add_parser("check", help="Check a document's terminology")
+    check_command.add_argument("document", help="Document to check")
+    check_command.add_argument("--json", action="store_true", help="Print the result as JSON")
+
+    args = parser.parse_args()
+
+    if args.command == "compile":
+        compiled = json.dumps(load_terminology(args.reference), indent=2, ensure_ascii=False) + "\n"
+        if args.output:
+            Path(args.output).write_text(compiled, encoding='utf-8')
+        else:
+            sys.stdout.write(compiled)
+        return
+
+    try:
+        text = Path(args.document).read_text(encoding='utf-8')
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    result = check_terminology(text)
+    if args.json:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+        return
+    for finding in result["issues"]:
+        print(f"⚠ {format_finding(finding)}")
+    if not result["issues"]:
+        print("No terminology issues.")
+
+
+if __name__ == "__main__":
+    main()
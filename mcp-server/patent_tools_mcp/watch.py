@@ -0,0 +1,177 @@
+"""
+Watch mode for the command line tools.
+
+A Watcher polls the modification time and size of the watched files, and of
+the Markdown files under watched directories, and reports a file once it has
+stopped changing for the debounce interval, so an editor's burst of writes
+on save is analyzed once. watch() re-analyzes only the reported documents
+and prints the findings that appeared or were resolved since the previous
+run of each, rather than the whole report.
+
+Polling needs nothing outside the standard library and works the same on
+every platform and on network drives; a stat() per file every POLL_SECONDS
+is negligible next to an analysis.
+"""
+
+import os
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+
+# Seconds between scans of the watched paths
+POLL_SECONDS = 0.05
+
+# Seconds a file must stay unchanged before it is analyzed
+DEBOUNCE_SECONDS = 0.1
+
+WATCHED_SUFFIXES = (".md", ".markdown", ".txt")
+
+
+class Watcher:
+    """Reports watched files that were created, modified or removed, once each has settled."""
+
+    def __init__(self, paths: Iterable[str | Path], debounce: float = DEBOUNCE_SECONDS, poll: float = POLL_SECONDS):
+        self.paths = [Path(path) for path in paths]
+        self.debounce = debounce
+        self.poll = poll
+        self.signatures = self.scan()
+        self._pending = {}
+
+    def files(self) -> list[Path]:
+        """The files being watched right now, in a stable order."""
+        return sorted(self.signatures)
+
+    def scan(self) -> dict[Path, tuple[int, int]]:
+        """Modification time and size of every watched file."""
+        signatures = {}
+        for path in self.paths:
+            if path.is_dir():
+                for root, dirs, names in os.walk(path):
+                    dirs[:] = sorted(name for name in dirs if not name.startswith("."))
+                    for name in names:
+                        if name.endswith(WATCHED_SUFFIXES):
+                            self._stat(Path(root, name), signatures)
+            else:
+                self._stat(path, signatures)
+        return signatures
+
+    @staticmethod
+    def _stat(path: Path, signatures: dict[Path, tuple[int, int]]):
+        try:
+            stat = path.stat()
+        except OSError:
+            return
+        signatures[path] = (stat.st_mtime_ns, stat.st_size)
+
+    def poll_once(self, now: float | None = None) -> list[Path]:
+        """Scan once and return the files that changed and have since settled."""
+        now = time.monotonic() if now is None else now
+        signatures = self.scan()
+        for path in signatures.keys() | self.signatures.keys():
+            if signatures.get(path) != self.signatures.get(path):
+                # Every further write restarts the wait
+                self._pending[path] = now
+        self.signatures = signatures
+
+        settled = sorted(path for path, changed in self._pending.items() if now - changed >= self.debounce)
+        for path in settled:
+            del self._pending[path]
+        return settled
+
+    def changes(self) -> Iterator[list[Path]]:
+        """Yield each batch of settled changes, forever."""
+        while True:
+            time.sleep(self.poll)
+            settled = self.poll_once()
+            if settled:
+                yield settled
+
+
+def diff_findings(old: list[str], new: list[str]) -> tuple[list[str], list[str]]:
+    """The findings that were resolved and the findings that appeared, each in report order.
+
+    Findings are compared as a multiset, so a repeated finding that gains or
+    loses an occurrence is reported once for each.
+    """
+    remaining = Counter(new)
+    resolved = []
+    for finding in old:
+        if remaining[finding]:
+            remaining[finding] -= 1
+        else:
+            resolved.append(finding)
+
+    remaining = Counter(old)
+    appeared = []
+    for finding in new:
+        if remaining[finding]:
+            remaining[finding] -= 1
+        else:
+            appeared.append(finding)
+    return resolved, appeared
+
+
+def watch(
+    paths: Iterable[str | Path],
+    findings: Callable[[Path], list[str]],
+    debounce: float = DEBOUNCE_SECONDS,
+    forget: Callable[[Path], None] | None = None
+):
+    """Print the findings of every watched file, then only what changes, until interrupted.
+
+    findings(path) analyzes one document and returns its findings as lines;
+    forget(path), if given, drops any state kept for a removed document.
+    """
+    watcher = Watcher(paths, debounce=debounce)
+    previous = {}
+
+    def analyze(path: Path) -> tuple[list[str] | None, float]:
+        start = time.perf_counter()
+        try:
+            lines = findings(path)
+        except (OSError, UnicodeDecodeError, ValueError) as e:
+            # Caught mid-save or unreadable; the next write brings it back
+            print(f"{path}: error: {e}", file=sys.stderr)
+            lines = None
+        return lines, (time.perf_counter() - start) * 1000
+
+    for path in watcher.files():
+        lines, elapsed = analyze(path)
+        if lines is not None:
+            previous[path] = lines
+            print(f"== {path} ({elapsed:.0f} ms)")
+            for line in lines:
+                print(f"  {line}")
+    print(f"Watching {len(watcher.files())} file(s) for changes. Press Ctrl+C to stop.", flush=True)
+
+    try:
+        for batch in watcher.changes():
+            stamp = datetime.now().strftime("%H:%M:%S")
+            for path in batch:
+                if path not in watcher.signatures:
+                    previous.pop(path, None)
+                    if forget is not None:
+                        forget(path)
+                    print(f"[{stamp}] {path}: removed")
+                    continue
+
+                lines, elapsed = analyze(path)
+                if lines is None:
+                    continue
+                resolved, appeared = diff_findings(previous.get(path, []), lines)
+                previous[path] = lines
+                if not resolved and not appeared:
+                    print(f"[{stamp}] {path}: no changes in findings ({elapsed:.0f} ms)")
+                    continue
+                print(f"[{stamp}] {path}: {len(appeared)} new, {len(resolved)} resolved ({elapsed:.0f} ms)")
+                for line in resolved:
+                    print(f"  - {line}")
+                for line in appeared:
+                    print(f"  + {line}")
+            sys.stdout.flush()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,25 @@
+"""Shared fixtures for the patent tools tests."""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_environment(monkeypatch):
+    """Run every test without the PATENT_TOOLS_* settings of the shell that started it."""
+    import os
+    for name in list(os.environ):
+        if name.startswith("PATENT_TOOLS_"):
+            monkeypatch.delenv(name)
+
+
+@pytest.fixture
+def make_document():
+    """Build a patent document in the repository's markdown layout from claim texts and sections."""
+
+    def build(*claims: str, sections: dict[str, str] | None = None) -> str:
+        parts = [f"## {heading}\n\n{text}\n" for heading, text in (sections or {}).items()]
+        parts.append("## CLAIMS\n")
+        parts += [f"**Claim {number}.** {text}\n" for number, text in enumerate(claims, 1)]
+        return "\n".join(parts)
+
+    return build
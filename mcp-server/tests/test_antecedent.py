@@ -0,0 +1,54 @@
+import random
+import re
+
+from patent_tools_mcp.core import analyze_antecedent_basis, index_claim_elements
+
+
+def rescan_antecedent_basis(claim_text: str) -> list[str]:
+    """The original checker: one regular expression search over the claim per "the" reference."""
+    issues = []
+    for match in re.finditer(r'\bthe\s+([a-z]+(?:\s+[a-z]+)?)', claim_text, re.IGNORECASE):
+        element = match.group(1)
+        if not re.search(r'\b(?:a|an)\s+' + re.escape(element), claim_text, re.IGNORECASE):
+            issues.append(f"Possible antecedent basis issue: 'the {element}' without prior 'a/an {element}'")
+    return issues
+
+
+def test_introduced_element_supports_reference():
+    claim = "A device comprising a processor and a memory coupled to the processor."
+    assert analyze_antecedent_basis(claim) == []
+
+
+def test_reference_without_introduction_is_reported():
+    claim = "A device comprising a processor, wherein the memory stores data."
+    assert analyze_antecedent_basis(claim) == [
+        "Possible antecedent basis issue: 'the memory stores' without prior 'a/an memory stores'"
+    ]
+
+
+def test_two_word_elements_match_word_by_word():
+    assert analyze_antecedent_basis("A gate electrode on a substrate, the gate electrode being doped.") == []
+    assert analyze_antecedent_basis("A gate electrode on a substrate, the gate oxide being doped.") == [
+        "Possible antecedent basis issue: 'the gate oxide' without prior 'a/an gate oxide'"
+    ]
+
+
+def test_reference_matches_a_prefix_of_the_introduced_words():
+    # "the layer" is found in "a layers", as the original regular expression search found it
+    assert analyze_antecedent_basis("A stack of a layers, the layer.") == []
+
+
+def test_index_holds_prefixes_of_introduced_words():
+    introduced, references = index_claim_elements("An electrode and the electrode.")
+    assert {"e", "elect", "electrode"} <= introduced
+    assert references == [("electrode", "electrode")]
+
+
+def test_matches_the_rescanning_checker_on_random_claims():
+    rng = random.Random(7)
+    words = ["a", "an", "the", "The", "A", "gate", "gates", "electrode", "oxide", "layer", "of", "and"]
+    separators = [" ", " ", " ", "  ", "\n", ", "]
+    for _ in range(2000):
+        tokens = [rng.choice(words) for _ in range(rng.randint(1, 14))]
+        claim = "".join(token + rng.choice(separators) for token in tokens)
+        assert analyze_antecedent_basis(claim) == rescan_antecedent_basis(claim), claim
@@ -0,0 +1,63 @@
+import multiprocessing
+import os
+import signal
+
+import pytest
+
+from patent_tools_mcp.batch import analyze_document, collect_documents, run_batch
+
+
+def test_collect_documents_from_a_directory_and_a_glob(tmp_path):
+    (tmp_path / "sub").mkdir()
+    for name in ("a.md", "sub/b.md", "c.txt"):
+        (tmp_path / name).write_text("text", encoding="utf-8")
+    assert collect_documents(str(tmp_path)) == [tmp_path / "a.md", tmp_path / "sub" / "b.md"]
+    assert collect_documents(str(tmp_path / "*.txt")) == [tmp_path / "c.txt"]
+    assert collect_documents(str(tmp_path / "missing")) == []
+
+
+def test_analyze_document_reports_a_missing_file_as_an_error(tmp_path):
+    record = analyze_document(str(tmp_path / "missing.md"))
+    assert record["status"] == "error"
+    assert record["error"].startswith("FileNotFoundError")
+    assert record["results"] == {}
+
+
+def test_run_batch_yields_one_record_per_document(tmp_path, make_document):
+    good = tmp_path / "good.md"
+    good.write_text(make_document("A widget comprising a base."), encoding="utf-8")
+    missing = tmp_path / "missing.md"
+
+    records = {record["file"]: record for record in run_batch([good, missing], ("word_count", "claims"), workers=2)}
+
+    assert records[str(good)]["status"] == "ok"
+    assert records[str(good)]["results"]["claims"]["total_claims"] == 1
+    assert set(records[str(good)]["results"]) == {"word_count", "claims"}
+    assert records[str(missing)]["status"] == "error"
+
+
+def test_run_batch_rejects_an_unknown_analysis(tmp_path):
+    with pytest.raises(ValueError, match="Unknown analysis 'spelling'"):
+        list(run_batch([tmp_path / "a.md"], ("spelling",)))
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGKILL"), reason="needs SIGKILL")
+def test_run_batch_continues_after_a_worker_dies(tmp_path, make_document):
+    paths = []
+    for i in range(40):
+        path = tmp_path / f"draft-{i:02d}.md"
+        path.write_text(make_document(f"A widget comprising a base {i}."), encoding="utf-8")
+        paths.append(path)
+
+    records = []
+    for record in run_batch(paths, ("word_count",), workers=2):
+        if not records:
+            # Killed from outside, as the OOM killer would
+            os.kill(multiprocessing.active_children()[0].pid, signal.SIGKILL)
+        records.append(record)
+
+    assert sorted(record["file"] for record in records) == [str(path) for path in paths]
+    errors = [record for record in records if record["status"] == "error"]
+    # Only the documents in flight on the dead pool are lost
+    assert len(errors) <= 2
+    assert all("BrokenProcessPool" in record["error"] for record in errors)
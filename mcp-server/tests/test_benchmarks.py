@@ -0,0 +1,40 @@
+from benchmarks import runner
+from benchmarks.corpus import generate_cpc_table, generate_document
+from patent_tools_mcp import core, server
+
+
+def test_generated_document_is_reproducible_and_has_the_requested_claims():
+    document = generate_document(claims=12, spec_bytes=4096, seed=5)
+    assert document == generate_document(claims=12, spec_bytes=4096, seed=5)
+    assert document != generate_document(claims=12, spec_bytes=4096, seed=6)
+    assert sorted(core.extract_claims(document)) == list(range(1, 13))
+    assert core.find_sections(document) == dict.fromkeys(core.SECTION_TITLE_PATTERNS, True)
+
+
+def test_generated_cpc_table_has_the_requested_size():
+    table = generate_cpc_table(100, keywords_per_subclass=3)
+    assert len(table) == 100
+    assert table == generate_cpc_table(100, keywords_per_subclass=3)
+
+
+def test_run_benchmarks_times_the_selected_benchmarks(monkeypatch):
+    # run_benchmarks replaces the server's result cache; put it back afterwards
+    monkeypatch.setattr(server, "result_cache", server.result_cache)
+    results = runner.run_benchmarks(["small"], ["core.count_words", "core.analyze_claims"], min_time=0, max_repeats=2)
+    assert [record["name"] for record in results["results"]] == ["core.count_words", "core.analyze_claims"]
+    assert all(record["repeats"] >= 1 and record["min_seconds"] > 0 for record in results["results"])
+
+
+def test_compare_results_flags_regressions_over_the_threshold():
+    def results(seconds):
+        return {"results": [
+            {"name": name, "size": "small", "min_seconds": value, "document_digest": "d"}
+            for name, value in seconds.items()
+        ]}
+
+    lines, regressions = runner.compare_results(
+        results({"fast": 1.0, "slow": 1.0}), results({"fast": 1.05, "slow": 1.5, "new": 1.0}), threshold=0.1
+    )
+    assert regressions == 1
+    assert any(line.startswith("slow") and "REGRESSION" in line for line in lines)
+    assert any(line.startswith("new") and line.rstrip().endswith("new") for line in lines)
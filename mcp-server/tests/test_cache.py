@@ -0,0 +1,85 @@
+import asyncio
+import os
+
+import pytest
+
+from patent_tools_mcp import cache, server
+from patent_tools_mcp.cache import ResultCache, content_digest
+
+
+def test_least_recently_used_entry_is_evicted():
+    results = ResultCache(max_entries=2)
+    results.put("a", "1")
+    results.put("b", "2")
+    assert results.get("a") == "1"
+    results.put("c", "3")
+    assert results.get("b") is None
+    assert results.get("a") == "1"
+    assert results.stats()["evictions"] == 1
+
+
+def test_disk_store_survives_a_new_cache(tmp_path):
+    ResultCache(max_entries=1, disk_path=tmp_path / "results.sqlite3").put("key", "output")
+    reopened = ResultCache(max_entries=1, disk_path=tmp_path / "results.sqlite3")
+    assert reopened.get("key") == "output"
+    assert reopened.stats()["disk_hits"] == 1
+
+
+def test_disk_store_keeps_the_most_recently_used_entries(tmp_path):
+    results = ResultCache(max_entries=0, disk_path=tmp_path / "results.sqlite3", max_disk_entries=2)
+    for key in ("a", "b", "c"):
+        results.put(key, key)
+    assert results.get("a") is None
+    assert results.stats()["disk_entries"] == 2
+
+
+def test_key_depends_on_tool_content_options_and_schema_version(monkeypatch):
+    results = ResultCache()
+    digest = content_digest("text")
+    key = results.make_key("tool", digest, {"a": 1})
+    assert key == results.make_key("tool", content_digest(b"text"), {"a": 1})
+    assert key != results.make_key("other", digest, {"a": 1})
+    assert key != results.make_key("tool", content_digest("text!"), {"a": 1})
+    assert key != results.make_key("tool", digest, {"a": 2})
+    monkeypatch.setattr(cache, "CACHE_SCHEMA_VERSION", cache.CACHE_SCHEMA_VERSION + 1)
+    assert key != results.make_key("tool", digest, {"a": 1})
+
+
+def test_file_memo_matches_only_the_stat_it_was_taken_with(tmp_path):
+    results = ResultCache()
+    path = tmp_path / "doc.md"
+    path.write_text("first", encoding="utf-8")
+    stat = path.stat()
+    results.remember_file(path, content_digest("first"), stat)
+    assert results.file_digest(path) == content_digest("first")
+
+    # Rewritten after the stat was taken: the memo is stale and never matches
+    path.write_text("second!", encoding="utf-8")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert results.file_digest(path) is None
+
+
+@pytest.fixture
+def fresh_cache(monkeypatch):
+    results = ResultCache(max_entries=16)
+    monkeypatch.setattr(server, "result_cache", results)
+    return results
+
+
+def call(name, arguments):
+    return asyncio.run(server.call_tool(name, arguments))[0].text
+
+
+def test_edited_file_is_analyzed_again(tmp_path, fresh_cache, make_document):
+    path = tmp_path / "claims.md"
+    path.write_text(make_document("A widget comprising a base."), encoding="utf-8")
+    first = call("analyze_patent_claims", {"file_path": str(path)})
+    assert call("analyze_patent_claims", {"file_path": str(path)}) == first
+    assert fresh_cache.stats()["unchanged_file_skips"] == 1
+
+    stat = path.stat()
+    path.write_text(make_document("A widget comprising a base.", "The widget of claim 1."), encoding="utf-8")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    second = call("analyze_patent_claims", {"file_path": str(path)})
+    assert second != first
+    assert "Total claims: 2" in second
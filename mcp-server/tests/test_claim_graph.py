@@ -0,0 +1,82 @@
+import pytest
+
+from patent_tools_mcp.claim_graph import ClaimGraph, parse_claim_references
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("A device comprising a base.", []),
+    ("The device of claim 1, wherein", [1]),
+    ("The device of claim 1 or 2, wherein", [1, 2]),
+    ("The device of claims 1, 2 and 5, wherein", [1, 2, 5]),
+    ("The device of any one of claims 1 to 4, wherein", [1, 2, 3, 4]),
+    ("The device of any of claims 2-3, wherein", [2, 3]),
+    ("The device of claim 1 or claim 4, wherein", [1, 4]),
+    ("The method of claim 3 or 3, wherein", [3]),
+    ("The device of claim 2, as in claim 7", [2]),
+])
+def test_multiple_dependent_references_are_parsed(text, expected):
+    assert parse_claim_references(text) == expected
+
+
+def test_huge_ranges_are_not_expanded():
+    assert parse_claim_references("The device of claims 1 to 100000") == [1, 100000]
+
+
+def test_order_and_depth():
+    graph = ClaimGraph({1: [], 2: [1], 3: [2], 4: [1, 3], 5: []})
+    assert graph.order == [1, 5, 2, 3, 4]
+    assert graph.depth == {1: 0, 2: 1, 3: 2, 4: 3, 5: 0}
+    assert graph.independent == [1, 5]
+    assert graph.multiple_dependent == [4]
+    assert graph.descendants([2]) == {3, 4}
+    assert graph.ancestors(4) == {1, 2, 3}
+
+
+def test_cycles_are_detected_and_left_out_of_the_order():
+    graph = ClaimGraph({1: [], 2: [3], 3: [2], 4: [4], 5: [2], 6: [1]})
+    assert graph.cycles == [[2, 3], [4]]
+    assert graph.order == [1, 6]
+    assert set(graph.depth) == {1, 6}
+    assert graph.issues[2] == ["Depends on claim 3, which follows it; a dependent claim must refer to a preceding claim",
+                               "Circular dependency among claims 2, 3"]
+    assert graph.issues[3] == ["Circular dependency among claims 2, 3"]
+    assert graph.issues[4] == ["Depends on itself"]
+    # Depends on a cycle without being part of it
+    assert 5 not in graph.issues
+
+
+def test_long_cycle_does_not_recurse():
+    count = 5000
+    graph = ClaimGraph({n: [n % count + 1] for n in range(1, count + 1)})
+    assert graph.cycles == [list(range(1, count + 1))]
+
+
+def test_dangling_and_forward_references_are_reported():
+    graph = ClaimGraph({1: [], 2: [9], 3: [4], 4: [1]})
+    assert graph.dangling == {2: [9]}
+    assert graph.children[9] == [2]
+    assert graph.issues[2] == ["Depends on claim 9, which does not exist"]
+    assert graph.issues[3] == ["Depends on claim 4, which follows it; a dependent claim must refer to a preceding claim"]
+
+
+def test_multiple_dependent_on_multiple_dependent_is_reported():
+    graph = ClaimGraph({1: [], 2: [1], 3: [1, 2], 4: [2, 3]})
+    assert graph.issues[4] == ["Multiple dependent claim depends on multiple dependent claim 3"]
+    assert 3 not in graph.issues
+
+
+def test_summary():
+    graph = ClaimGraph.from_claims({1: "A device.", 2: "The device of claim 1.", 3: "The device of claim 8."})
+    assert graph.summary() == {
+        "order": [1, 3, 2],
+        "depth": {1: 0, 2: 1, 3: 1},
+        "max_depth": 1,
+        "multiple_dependent": [],
+        "dangling_references": {3: [8]},
+        "cycles": []
+    }
+
+
+def test_families_join_claims_through_any_dependency():
+    graph = ClaimGraph({1: [], 2: [1], 3: [], 4: [3], 5: [], 6: [4, 5], 7: [9], 8: [8]})
+    assert graph.families() == [[1, 2], [3, 4, 5, 6], [7], [8]]
@@ -0,0 +1,66 @@
+from patent_tools_mcp.core import analyze_claims, extract_claims
+
+
+def antecedent_issues(result, claim_num):
+    """The antecedent issues of a claim, apart from those about the "The widget of" preamble."""
+    return [
+        issue for issue in result["claim_analysis"][claim_num]["antecedent_issues"]
+        if "'the widget of'" not in issue
+    ]
+
+
+def test_extract_claims(make_document):
+    claims = extract_claims(make_document("A widget comprising a base.", "The widget of claim 1, wherein the base is flat."))
+    assert claims == {1: "A widget comprising a base.", 2: "The widget of claim 1, wherein the base is flat."}
+
+
+def test_dependent_claim_inherits_elements_of_its_ancestors(make_document):
+    result = analyze_claims(make_document(
+        "A widget comprising a base.",
+        "The widget of claim 1, further comprising a lid.",
+        "The widget of claim 2, wherein the lid, in use, covers the base.",
+    ))
+    assert antecedent_issues(result, 3) == []
+
+
+def test_elements_of_sibling_claims_are_not_inherited(make_document):
+    result = analyze_claims(make_document(
+        "A widget comprising a base.",
+        "The widget of claim 1, further comprising a lid.",
+        "The widget of claim 1, wherein the lid.",
+    ))
+    assert antecedent_issues(result, 3) == ["Possible antecedent basis issue: 'the lid' without prior 'a/an lid'"]
+
+
+def test_independent_claims_do_not_share_elements(make_document):
+    result = analyze_claims(make_document("A widget comprising a base.", "A method of using the base."))
+    assert antecedent_issues(result, 2) == ["Possible antecedent basis issue: 'the base' without prior 'a/an base'"]
+
+
+def test_multiple_dependent_claim_needs_the_element_along_every_alternative(make_document):
+    result = analyze_claims(make_document(
+        "A widget comprising a base.",
+        "The widget of claim 1, further comprising a lid.",
+        "The widget of claim 1, further comprising a handle.",
+        "The widget of claim 2 or 3, wherein the base.",
+        "The widget of claim 2 or 3, wherein the lid.",
+    ))
+    assert antecedent_issues(result, 4) == []
+    assert antecedent_issues(result, 5) == ["Possible antecedent basis issue: 'the lid' without prior 'a/an lid'"]
+
+
+def test_claim_depending_on_a_missing_claim_sees_only_its_own_elements(make_document):
+    result = analyze_claims(make_document("A widget comprising a base.", "The widget of claim 7, wherein the base."))
+    assert antecedent_issues(result, 2) == ["Possible antecedent basis issue: 'the base' without prior 'a/an base'"]
+    assert result["claim_analysis"][2]["dependency_issues"] == ["Depends on claim 7, which does not exist"]
+
+
+def test_claim_counts_and_types(make_document):
+    result = analyze_claims(make_document("A widget comprising a base.", "The widget of claim 1, wherein the base."))
+    assert (result["total_claims"], result["independent_count"], result["dependent_count"]) == (2, 1, 1)
+    assert result["claim_analysis"][2]["type"] == "dependent"
+    assert result["claim_analysis"][2]["depends_on"] == 1
+
+
+def test_document_without_claims():
+    assert analyze_claims("No claims here.") == {"error": "No claims found in document", "claims_count": 0}
@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+
+from patent_tools_mcp import cpc, server
+from patent_tools_mcp.cache import ResultCache
+from patent_tools_mcp.cpc import CPCMatcher, load_cpc_table, merge_tables
+
+
+def test_keywords_match_whole_words_and_plurals():
+    matcher = CPCMatcher({"H01L": ["gate electrode", "via"], "G06N": ["neural network"]})
+    suggestions = matcher.classify("Two gate electrodes and a viaduct, with neural networks and a neural network.")
+    assert [(s["classification"], s["hits"]) for s in suggestions] == [("G06N", 2), ("H01L", 1)]
+    assert suggestions[1]["matched_keywords"] == {"gate electrode": 1}
+
+
+def test_overlapping_keywords_are_all_found():
+    matcher = CPCMatcher({"A": ["field effect transistor"], "B": ["effect"], "C": ["transistor"]})
+    hits = {s["classification"]: s["hits"] for s in matcher.classify("a field effect transistor")}
+    assert hits == {"A": 1, "B": 1, "C": 1}
+    assert (2, 25, "A", "field effect transistor") in matcher.find("a Field Effect transistor")
+
+
+def test_tables_load_from_json_and_tab_separated_files(tmp_path):
+    (tmp_path / "a.json").write_text('{"H01L": ["spacer"]}', encoding="utf-8")
+    (tmp_path / "b.tsv").write_text("# comment\nH01L\tliner\nG06F\tcache line\n", encoding="utf-8")
+    merged = merge_tables([load_cpc_table(tmp_path / "a.json"), load_cpc_table(tmp_path / "b.tsv")])
+    assert merged == {"H01L": ["spacer", "liner"], "G06F": ["cache line"]}
+
+
+def test_version_follows_the_table():
+    assert CPCMatcher({"A": ["gate"]}).version == CPCMatcher({"A": ["gate"]}).version
+    assert CPCMatcher({"A": ["gate"]}).version != CPCMatcher({"A": ["gate", "drain"]}).version
+
+
+@pytest.fixture
+def fresh_matcher(monkeypatch):
+    monkeypatch.setattr(server, "result_cache", ResultCache(max_entries=16))
+    monkeypatch.setattr(cpc, "_default_matcher", None)
+
+
+def test_cached_prior_art_result_follows_the_cpc_table(tmp_path, monkeypatch, fresh_matcher):
+    path = tmp_path / "invention.md"
+    path.write_text("A widget with a sprocket and a sprocket housing.", encoding="utf-8")
+
+    def prior_art():
+        return asyncio.run(server.call_tool("generate_prior_art_search", {"file_path": str(path)}))[0].text
+
+    assert "F16H" not in prior_art()
+    table = tmp_path / "extra.tsv"
+    table.write_text("F16H\tsprocket\n", encoding="utf-8")
+    monkeypatch.setenv("PATENT_TOOLS_CPC_TABLE", str(table))
+    monkeypatch.setattr(cpc, "_default_matcher", None)
+    assert "F16H" in prior_art()
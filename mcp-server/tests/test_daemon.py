@@ -0,0 +1,89 @@
+import os
+import socket
+import tempfile
+import threading
+import time
+
+import pytest
+
+from patent_tools_mcp import daemon
+
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+
+
+@pytest.fixture
+def running_daemon(tmp_path, monkeypatch):
+    """A daemon serving on a socket in a temporary directory, in a background thread."""
+    path = str(tmp_path / "daemon.sock")
+    monkeypatch.setenv("PATENT_TOOLS_SOCKET", path)
+    monkeypatch.setenv("PATENT_TOOLS_DAEMON", "off")
+    server = daemon.ToolDaemon(path)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01})
+    thread.start()
+    yield server
+    server.shutdown()
+    thread.join()
+    server.server_close()
+
+
+def test_default_socket_is_in_a_private_directory(tmp_path, monkeypatch):
+    monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    path = daemon.socket_path()
+    assert path == str(tmp_path / f"patent-tools-{os.getuid()}" / "daemon.sock")
+
+    daemon.private_directory(os.path.dirname(path))
+    assert os.stat(os.path.dirname(path)).st_mode & 0o777 == 0o700
+
+
+def test_shared_directory_is_rejected(tmp_path):
+    shared = tmp_path / "shared"
+    shared.mkdir(mode=0o777)
+    shared.chmod(0o777)
+    with pytest.raises(PermissionError):
+        daemon.private_directory(str(shared))
+
+
+def test_tool_runs_with_the_request_settings(running_daemon, tmp_path):
+    document = tmp_path / "invention.md"
+    document.write_text("A sensor comprising a photodiode and an amplifier.", encoding="utf-8")
+    index = str(tmp_path / "missing-index.json")
+
+    reply = daemon.request({
+        "tool": "prior-art-search", "args": [str(document)], "cwd": str(tmp_path),
+        "env": {"PATENT_TOOLS_PRIOR_ART_INDEX": index}
+    }, timeout=None)
+    assert reply["exit_code"] == 0
+    assert "LOCAL INDEX MATCHES: not searched" in reply["stdout"]
+    assert "PATENT_TOOLS_PRIOR_ART_INDEX" not in os.environ
+
+    reply = daemon.request({"tool": "prior-art-search", "args": [str(document)], "cwd": str(tmp_path), "env": {}})
+    assert "LOCAL INDEX MATCHES" not in reply["stdout"]
+
+
+def test_run_with_other_tables_is_refused(running_daemon, tmp_path):
+    reply = daemon.request({
+        "tool": "word-count", "args": [], "cwd": str(tmp_path),
+        "env": {"PATENT_TOOLS_CPC_TABLE": str(tmp_path / "cpc.json")}
+    })
+    assert "PATENT_TOOLS_CPC_TABLE" in reply["refused"]
+
+
+def test_socket_owned_by_another_user_is_not_used(running_daemon, monkeypatch):
+    uid = os.getuid()
+    monkeypatch.setattr(os, "getuid", lambda: uid + 1)
+    assert daemon.request({"command": "status"}) is None
+
+
+def test_stalled_client_does_not_hold_the_daemon(running_daemon, monkeypatch):
+    monkeypatch.setattr(daemon.DaemonRequestHandler, "timeout", 0.1)
+    stalled = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stalled.connect(daemon.socket_path())
+    try:
+        start = time.monotonic()
+        reply = daemon.request({"command": "status"}, timeout=None)
+        assert reply["pid"] == os.getpid()
+        assert time.monotonic() - start < 2
+    finally:
+        stalled.close()
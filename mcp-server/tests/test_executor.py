@@ -0,0 +1,42 @@
+import asyncio
+import os
+import threading
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from patent_tools_mcp.executor import AnalysisExecutor
+
+
+def test_unknown_kind_is_rejected():
+    with pytest.raises(ValueError, match="Unknown executor 'fork'"):
+        AnalysisExecutor("fork")
+
+
+def test_configured_from_the_environment(monkeypatch):
+    monkeypatch.setenv("PATENT_TOOLS_EXECUTOR", "process")
+    monkeypatch.setenv("PATENT_TOOLS_WORKERS", "3")
+    executor = AnalysisExecutor.from_environment()
+    assert (executor.kind, executor.workers) == ("process", 3)
+
+
+def test_run_uses_a_worker_thread():
+    executor = AnalysisExecutor("thread", workers=2)
+    try:
+        name = asyncio.run(executor.run(lambda: threading.current_thread().name))
+        assert name.startswith("patent-tools")
+        assert executor.compute(pow, 2, 3) == 8
+    finally:
+        executor.shutdown()
+
+
+def test_process_pool_recovers_after_a_worker_dies():
+    executor = AnalysisExecutor("process", workers=1)
+    try:
+        assert executor.compute(os.getpid) != os.getpid()
+        # The call kills its worker on the first pool and on the replacement
+        with pytest.raises(BrokenProcessPool):
+            executor.compute(os._exit, 1)
+        assert executor.compute(pow, 2, 3) == 8
+    finally:
+        executor.shutdown()
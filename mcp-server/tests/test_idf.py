@@ -0,0 +1,44 @@
+import math
+
+import pytest
+
+from patent_tools_mcp import core, idf
+from patent_tools_mcp.idf import IDFTable, count_document_frequencies, write_idf_table
+
+
+def test_table_round_trips_document_frequencies(tmp_path):
+    frequencies = {f"term{i}": i + 1 for i in range(1000)}
+    write_idf_table(tmp_path / "idf.bin", frequencies, 5000)
+    with IDFTable(tmp_path / "idf.bin") as table:
+        assert (table.term_count, table.documents) == (1000, 5000)
+        assert all(table.document_frequency(term) == count for term, count in frequencies.items())
+        assert table.document_frequency("unseen") == 0
+        assert table.idf("term0") == pytest.approx(math.log(5001 / 2) + 1)
+
+
+def test_count_document_frequencies_counts_each_document_once():
+    frequencies, documents = count_document_frequencies([["gate", "gate", "oxide"], ["gate"]])
+    assert (frequencies, documents) == ({"gate": 2, "oxide": 1}, 2)
+
+
+def test_other_files_are_rejected(tmp_path):
+    (tmp_path / "short.bin").write_bytes(b"x")
+    (tmp_path / "other.bin").write_bytes(b"x" * 100)
+    for name in ("short.bin", "other.bin"):
+        with pytest.raises(ValueError, match="is not an IDF table"):
+            IDFTable(tmp_path / name)
+
+
+def test_keywords_are_ranked_by_tf_idf_with_a_table(tmp_path, monkeypatch):
+    # "layer" is in every corpus document, "nanosheet" in one
+    write_idf_table(tmp_path / "idf.bin", {"layer": 100, "nanosheet": 1}, 100)
+    keywords = ["layer"] * 3 + ["nanosheet"] * 2
+    assert [kw["keyword"] for kw in core.rank_keywords(keywords)] == ["layer", "nanosheet"]
+
+    monkeypatch.setenv("PATENT_TOOLS_IDF_TABLE", str(tmp_path / "idf.bin"))
+    monkeypatch.setattr(idf, "_default_table", None)
+    monkeypatch.setattr(idf, "_default_table_loaded", False)
+    ranked = core.rank_keywords(keywords)
+    assert [kw["keyword"] for kw in ranked] == ["nanosheet", "layer"]
+    assert ranked[0]["tf_idf"] > ranked[1]["tf_idf"]
+    idf.default_idf_table().close()
@@ -0,0 +1,85 @@
+import random
+
+from patent_tools_mcp.core import analyze_claims
+from patent_tools_mcp.incremental import ClaimSession, ClaimSessionStore
+
+
+CLAIMS = {
+    1: "A widget comprising a base.",
+    2: "The widget of claim 1, further comprising a lid.",
+    3: "The widget of claim 2, wherein the lid, in use, covers the base.",
+    4: "A method comprising a step.",
+}
+
+
+def full_analysis(claims):
+    return analyze_claims("".join(f"**Claim {n}.** {text}\n" for n, text in claims.items()))
+
+
+def test_first_run_matches_a_full_analysis():
+    session = ClaimSession()
+    assert session.analyze(CLAIMS) == full_analysis(CLAIMS)
+    assert session.last_reanalyzed == [1, 2, 3, 4]
+
+
+def test_unchanged_claims_are_reused():
+    session = ClaimSession()
+    session.analyze(CLAIMS)
+    assert session.analyze(dict(CLAIMS)) == full_analysis(CLAIMS)
+    assert session.last_reanalyzed == []
+
+
+def test_an_edit_reanalyzes_the_claim_and_its_dependents():
+    session = ClaimSession()
+    session.analyze(CLAIMS)
+    edited = {**CLAIMS, 2: "The widget of claim 1, further comprising a cover."}
+    result = session.analyze(edited)
+    assert session.last_reanalyzed == [2, 3]
+    assert result == full_analysis(edited)
+    assert result["claim_analysis"][3]["antecedent_issues"][-1] == (
+        "Possible antecedent basis issue: 'the lid' without prior 'a/an lid'"
+    )
+
+
+def test_removing_a_claim_reanalyzes_the_claims_that_referred_to_it():
+    session = ClaimSession()
+    session.analyze(CLAIMS)
+    edited = {n: text for n, text in CLAIMS.items() if n != 2}
+    result = session.analyze(edited)
+    assert session.last_reanalyzed == [3]
+    assert result == full_analysis(edited)
+    assert result["claim_analysis"][3]["dependency_issues"] == ["Depends on claim 2, which does not exist"]
+
+
+def test_random_edit_sequences_match_full_analyses():
+    rng = random.Random(3)
+    elements = ["base", "lid", "handle", "gate electrode"]
+    session = ClaimSession()
+    claims = dict(CLAIMS)
+    for _ in range(200):
+        claim_num = rng.randint(1, 8)
+        if rng.random() < 0.2:
+            claims.pop(claim_num, None)
+        else:
+            parent = rng.randint(0, claim_num - 1)
+            preamble = f"The widget of claim {parent}," if parent else "A widget"
+            claims[claim_num] = f"{preamble} comprising a {rng.choice(elements)}, wherein the {rng.choice(elements)}."
+        assert session.analyze(dict(sorted(claims.items()))) == full_analysis(dict(sorted(claims.items())))
+
+
+def test_empty_claim_set_resets_the_session():
+    session = ClaimSession()
+    session.analyze(CLAIMS)
+    assert session.analyze({}) == {"error": "No claims found in document", "claims_count": 0}
+    session.analyze(CLAIMS)
+    assert session.last_reanalyzed == [1, 2, 3, 4]
+
+
+def test_store_evicts_the_least_recently_used_session():
+    store = ClaimSessionStore(max_sessions=2)
+    first, second = store.get("a"), store.get("b")
+    assert store.get("a") is first
+    store.get("c")
+    assert store.get("a") is first
+    assert store.get("b") is not second
+
@@ -0,0 +1,62 @@
+from patent_tools_mcp import core, ingest
+
+
+DOCUMENT = (
+    "# Title\n\n## BACKGROUND\n\nSome **bold** and *italic* text with a [link](http://x).\n\n"
+    "## SUMMARY OF THE INVENTION\n\n```\ncode block\n```\nMore `inline` words.\n\n"
+    "## CLAIMS\n\n**Claim 1.** A widget comprising a base.\n\n**Claim 2.** The widget of claim 1, wherein the base.\n"
+)
+
+
+def mapped(tmp_path, text, newline=None):
+    path = tmp_path / "doc.md"
+    path.write_text(text, encoding="utf-8", newline=newline)
+    return path
+
+
+def test_mapped_word_count_matches_the_in_memory_analysis(tmp_path):
+    with ingest.map_document(mapped(tmp_path, DOCUMENT)) as data:
+        assert ingest.analyze_word_count_mapped(data, "doc.md") == core.analyze_word_count(DOCUMENT, "doc.md")
+
+
+def test_mapped_claims_match_the_in_memory_extraction(tmp_path):
+    with ingest.map_document(mapped(tmp_path, DOCUMENT)) as data:
+        assert ingest.extract_claims(data) == core.extract_claims(DOCUMENT)
+
+
+def test_crlf_files_decode_like_a_text_mode_read(tmp_path):
+    path = mapped(tmp_path, DOCUMENT, newline="\r\n")
+    with ingest.map_document(path) as data:
+        assert ingest.decode_text(data[:]) == DOCUMENT
+        assert ingest.extract_claims(data) == core.extract_claims(DOCUMENT)
+        assert ingest.analyze_word_count_mapped(data)["total_words"] == core.count_words(DOCUMENT)
+
+
+def test_empty_file_maps_to_empty_bytes(tmp_path):
+    with ingest.map_document(mapped(tmp_path, "")) as data:
+        assert data == b""
+        assert ingest.analyze_word_count_mapped(data)["total_words"] == 0
+
+
+def test_sections_are_counted_slice_by_slice(tmp_path, monkeypatch):
+    # Slices much smaller than the sections, cutting through words and markdown spans
+    monkeypatch.setattr(ingest, "BLOCK_SIZE", 5)
+    with ingest.map_document(mapped(tmp_path, DOCUMENT)) as data:
+        assert ingest.segment_sections(data) == core.segment_sections(DOCUMENT)
+
+
+def test_server_maps_files_over_the_threshold(tmp_path, monkeypatch):
+    import asyncio
+    from patent_tools_mcp import server
+    from patent_tools_mcp.cache import ResultCache
+
+    monkeypatch.setattr(server, "result_cache", ResultCache(max_entries=0))
+    path = mapped(tmp_path, DOCUMENT)
+    tools = ("analyze_patent_word_count", "analyze_patent_claims")
+
+    def outputs():
+        return [asyncio.run(server.call_tool(tool, {"file_path": str(path)}))[0].text for tool in tools]
+
+    read = outputs()
+    monkeypatch.setattr(ingest, "STREAMING_THRESHOLD", 0)
+    assert outputs() == read
@@ -0,0 +1,81 @@
+import asyncio
+import json
+import random
+
+import pytest
+
+from patent_tools_mcp import metrics, server
+from patent_tools_mcp.cache import ResultCache
+from patent_tools_mcp.metrics import LatencyHistogram, ServerStats, bucket_index, bucket_upper_bound
+
+
+def test_buckets_bound_their_durations_within_a_quarter():
+    rng = random.Random(4)
+    for duration in [0, 1, 1023, 1024, 1 << 20, (1 << 36) - 1] + [rng.randrange(1, 1 << 36) for _ in range(2000)]:
+        index = bucket_index(duration)
+        assert duration <= bucket_upper_bound(index)
+        if index:
+            assert duration > bucket_upper_bound(index - 1)
+            assert bucket_upper_bound(index) <= duration * 1.25 + 1
+
+
+def test_percentiles_are_close_to_the_exact_ones():
+    histogram = LatencyHistogram()
+    durations = list(range(1_000_000, 101_000_000, 1_000_000))
+    for duration in durations:
+        histogram.add(duration)
+    assert durations[49] <= histogram.percentile(50) <= durations[49] * 1.25
+    assert histogram.percentile(100) == durations[-1]
+    assert histogram.summary()["count"] == 100
+
+
+def test_stages_are_only_timed_while_recording():
+    with metrics.stage("outside"):
+        pass
+    with metrics.recording() as call:
+        for _ in range(2):
+            with metrics.stage("analysis"):
+                pass
+        metrics.count("cache_hits")
+        metrics.add_durations({"worker": 5})
+    assert set(call.durations) == {"analysis", "worker"}
+    assert call.durations["worker"] == 5
+    assert call.counters == {"cache_hits": 1}
+
+
+def test_server_stats_aggregate_calls():
+    stats = ServerStats()
+    call = metrics.Recording()
+    call.durations = {"analysis": 2_000_000}
+    call.counters = {"errors": 1}
+    stats.record("tool", call, 3_000_000)
+    stats.record("tool", call, 5_000_000)
+    snapshot = stats.snapshot()["tools"]["tool"]
+    assert (snapshot["calls"], snapshot["errors"]) == (2, 2)
+    assert list(snapshot["stages"]) == ["total", "analysis"]
+    assert snapshot["stages"]["total"]["max_ms"] == 5.0
+    assert stats.log_line().startswith("stats: tool calls=2 ")
+
+
+def test_stats_interval(monkeypatch):
+    assert metrics.stats_interval() is None
+    monkeypatch.setenv("PATENT_TOOLS_STATS_INTERVAL", "30")
+    assert metrics.stats_interval() == 30.0
+
+
+@pytest.fixture
+def fresh_stats(monkeypatch):
+    monkeypatch.setattr(server, "result_cache", ResultCache(max_entries=16))
+    monkeypatch.setattr(server, "server_stats", ServerStats())
+
+
+def test_server_stats_tool_reports_the_stages_of_each_call(fresh_stats, make_document):
+    document = make_document("A widget comprising a base.")
+    for _ in range(2):
+        asyncio.run(server.call_tool("analyze_patent_claims", {"content": document}))
+    stats = json.loads(asyncio.run(server.call_tool("get_server_stats", {"reset": True}))[0].text)
+    claims = stats["tools"]["analyze_patent_claims"]
+    assert claims["calls"] == 2
+    assert claims["cache_hits"] == 1
+    assert {"total", "cache", "analysis", "claims.extract", "claims.check"} <= set(claims["stages"])
+    assert json.loads(asyncio.run(server.call_tool("get_server_stats", {}))[0].text)["tools"] == {}
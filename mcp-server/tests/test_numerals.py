@@ -0,0 +1,56 @@
+import re
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from patent_tools_mcp import numerals
+from patent_tools_mcp.numerals import check_reference_numerals
+
+PACKAGE_ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_reused_and_renumbered_elements_are_reported():
+    result = check_reference_numerals(
+        "The gate electrode 104 is on the substrate 102.\n"
+        "The substrate 104 is doped, and the electrode 104 is thin."
+    )
+    assert result["numerals"] == {"102": {"substrate": 1}, "104": {"gate electrode": 2, "substrate": 1}}
+    assert [(conflict["kind"], conflict.get("numeral") or conflict["element"]) for conflict in result["conflicts"]] == [
+        ("numeral_reused", "104"), ("element_renumbered", "substrate")
+    ]
+    assert result["conflicts"][0]["uses"][1]["occurrences"][0]["line"] == 2
+
+
+def test_only_whole_words_name_an_element():
+    # "fin's" and "x_y" are not words of a name, and "Step 1:" is a label
+    result = check_reference_numerals("The fin's 106 edge, a x_y 108, Step 1: and a fin 106a.")
+    assert result["elements"] == {"fin": {"106a": 1}}
+
+
+def test_patterns_run_on_the_oldest_supported_python():
+    # Possessive quantifiers and atomic groups fail to compile before Python 3.11
+    for name, value in vars(numerals).items():
+        if isinstance(value, re.Pattern):
+            assert not re.search(r"[*+?}]\+|\(\?>", value.pattern), name
+
+
+def python_3_10() -> str | None:
+    """A working python3.10 on the PATH (version manager shims may not run), if any."""
+    path = shutil.which("python3.10")
+    if path is None or subprocess.run([path, "-c", ""], capture_output=True).returncode:
+        return None
+    return path
+
+
+def test_imports_and_runs_on_python_3_10():
+    interpreter = python_3_10()
+    if interpreter is None:
+        pytest.skip("needs python3.10")
+    code = (
+        "from patent_tools_mcp.numerals import check_reference_numerals; "
+        "print(check_reference_numerals('a substrate 102 and the substrate 104')['conflict_count'])"
+    )
+    completed = subprocess.run([interpreter, "-c", code], cwd=PACKAGE_ROOT, capture_output=True, text=True)
+    assert completed.stdout.strip() == "1", completed.stderr
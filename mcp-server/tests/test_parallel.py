@@ -0,0 +1,67 @@
+import multiprocessing
+import os
+
+import pytest
+
+from benchmarks.corpus import generate_document
+from patent_tools_mcp import core, parallel
+
+
+@pytest.fixture
+def pool_enabled(monkeypatch):
+    """Analyze every claim set over two worker processes, and stop them afterwards."""
+    monkeypatch.setenv("PATENT_TOOLS_WORKERS", "2")
+    monkeypatch.setenv("PATENT_TOOLS_PARALLEL_CLAIMS", "1")
+    monkeypatch.setattr(parallel, "_enabled", True)
+    yield
+    parallel.shutdown()
+
+
+def double_or_die(items):
+    # Kills a worker process, but runs normally in the calling process
+    if multiprocessing.parent_process() is not None:
+        os._exit(1)
+    return [item * 2 for item in items]
+
+
+def test_pool_is_off_unless_enabled(monkeypatch):
+    monkeypatch.setenv("PATENT_TOOLS_WORKERS", "2")
+    assert not parallel.use_pool(100_000)
+    monkeypatch.setattr(parallel, "_enabled", True)
+    assert parallel.use_pool(100_000)
+    assert not parallel.use_pool(parallel.DEFAULT_PARALLEL_CLAIM_THRESHOLD - 1)
+
+
+def test_pack_groups_keeps_groups_whole():
+    groups = [[1, 2, 3], [4], [5, 6], [7, 8, 9, 10], [11]]
+    chunks = parallel.pack_groups(groups, 4)
+    assert [item for chunk in chunks for item in chunk] == list(range(1, 12))
+    assert chunks == [[1, 2, 3], [4, 5, 6], [7, 8, 9, 10], [11]]
+
+
+def test_parallel_analysis_matches_serial(pool_enabled):
+    claims = core.extract_claims(generate_document(120, 1024))
+    claims.update({
+        121: "A widget comprising a lever.",
+        122: "The widget of claim 123, wherein the lever is bent.",
+        123: "The widget of claim 122, wherein the spring is coiled.",
+        124: "The widget of claim 999, comprising a spring.",
+        125: "The widget of claim 1 or 121, wherein the lever is straight."
+    })
+    assert parallel.use_pool(len(claims))
+
+    parallel_result = core.analyze_extracted_claims(claims)
+    assert parallel._pool is not None
+    parallel.enable(False)
+    try:
+        assert parallel_result == core.analyze_extracted_claims(claims)
+    finally:
+        parallel.enable(True)
+
+
+def test_broken_pool_is_replaced_and_run_serially(pool_enabled):
+    groups = [[i] for i in range(20)]
+    assert parallel.map_in_chunks(double_or_die, groups) == [i * 2 for i in range(20)]
+    assert parallel._pool is None
+
+    assert parallel.map_in_chunks(double_or_die, groups) == [i * 2 for i in range(20)]
@@ -0,0 +1,46 @@
+import pytest
+
+from benchmarks.corpus import generate_document
+from patent_tools_mcp import core, proximity
+from patent_tools_mcp.proximity import generate_proximity_queries
+
+TERMS = ["gate", "electrode", "substrate", "trench", "isolation"]
+
+# Sentences without any of the terms, so that the pairs stand out
+FILLER = " ".join(f"Word{i} alpha beta gamma delta." for i in range(40))
+
+
+def queries(sentence: str) -> list[str]:
+    return [query["query"] for query in generate_proximity_queries(sentence * 5 + FILLER, TERMS)]
+
+
+def test_adjacent_terms_in_one_order_become_a_phrase():
+    assert '"gate electrode"' in queries("The gate electrode is formed on a substrate. ")
+
+
+def test_numerals_and_short_words_count_toward_the_distance():
+    found = queries("The gate 104 electrode is formed on a substrate. ")
+    assert "gate ADJ2 electrode" in found
+    assert "electrode ADJ5 substrate" in found
+
+
+def test_no_pair_spans_a_clause_break():
+    assert queries("The gate, electrode is formed. ") == []
+    assert queries("The gate is formed.\n\nElectrode layers follow. ") == []
+    assert queries("The gate is formed; the electrode follows. ") == []
+
+
+def test_terms_in_either_order_are_near():
+    assert queries("A trench near the isolation. The isolation of the trench. ") == ["trench NEAR3 isolation"]
+
+
+def test_pure_python_counts_match_numpy(monkeypatch):
+    if proximity.np is None:
+        pytest.skip("needs numpy")
+    text = generate_document(20, 64 * 1024)
+    terms = [keyword["keyword"] for keyword in core.rank_keywords(core.extract_keywords(text))]
+    expected = generate_proximity_queries(text, terms)
+    assert expected
+
+    monkeypatch.setattr(proximity, "np", None)
+    assert generate_proximity_queries(text, terms) == expected
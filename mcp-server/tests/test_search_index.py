@@ -0,0 +1,101 @@
+import asyncio
+import json
+import sqlite3
+
+import pytest
+
+from patent_tools_mcp import server
+from patent_tools_mcp.cache import ResultCache
+from patent_tools_mcp.core import generate_prior_art_search
+from patent_tools_mcp.search_index import PriorArtIndex, search_prior_art, to_match_expression
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    documents = tmp_path / "docs"
+    documents.mkdir()
+    (documents / "gate.md").write_text("# Gate stack\n\nA gate electrode on a gate dielectric.\n", encoding="utf-8")
+    (documents / "trench.md").write_text("# Trench\n\nShallow trench isolation between transistors.\n", encoding="utf-8")
+    return documents
+
+
+@pytest.fixture
+def index_path(tmp_path, corpus):
+    path = tmp_path / "index.db"
+    with PriorArtIndex(path, create=True) as index:
+        index.update(str(corpus))
+    return path
+
+
+def test_boolean_queries_translate_to_fts5():
+    assert to_match_expression('gate AND (oxide OR "high k")') == '"gate" AND ( "oxide" OR "high k" )'
+    assert to_match_expression("gate AND NOT near") == '"gate" NOT "near"'
+
+
+def test_search_ranks_stemmed_matches(index_path):
+    with PriorArtIndex(index_path) as index:
+        hits = index.search("electrodes AND dielectric")
+    assert [hit["title"] for hit in hits] == ["Gate stack"]
+    assert "[electrode]" in hits[0]["snippet"]
+
+
+def test_update_only_reads_changed_documents_and_drops_deleted_ones(index_path, corpus):
+    (corpus / "trench.md").unlink()
+    (corpus / "fin.md").write_text("# Fin\n\nA fin.\n", encoding="utf-8")
+    with PriorArtIndex(index_path) as index:
+        assert index.update(str(corpus)) == {"added": 1, "updated": 0, "unchanged": 1, "removed": 1, "failed": 0}
+        assert index.document_count() == 2
+
+
+def test_missing_index_raises_file_not_found(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        search_prior_art(tmp_path / "missing.db", ["gate"])
+
+
+def test_unreadable_index_raises_value_error(tmp_path):
+    path = tmp_path / "corrupt.db"
+    path.write_bytes(b"not a database" * 100)
+    with pytest.raises(ValueError, match="cannot be read"):
+        search_prior_art(path, ["gate"])
+
+
+def test_prior_art_search_reports_an_unusable_index_and_keeps_the_strategy(tmp_path):
+    for path in (tmp_path / "missing.db", tmp_path / "corrupt.db"):
+        if path.name == "corrupt.db":
+            path.write_bytes(b"not a database" * 100)
+        result = generate_prior_art_search("A gate electrode on a gate dielectric.", str(path))
+        assert result["local_search"]["index_path"] == str(path)
+        assert "error" in result["local_search"]
+        assert result["boolean_queries"]
+
+
+def test_prior_art_search_runs_the_queries_against_the_index(index_path):
+    result = generate_prior_art_search("A gate electrode on a gate dielectric. The gate electrode.", str(index_path))
+    assert result["local_search"]["documents"] == 2
+    assert result["local_search"]["results"][0]["hits"][0]["title"] == "Gate stack"
+
+
+def test_server_reports_a_missing_index_under_local_matches(tmp_path, monkeypatch):
+    monkeypatch.setattr(server, "result_cache", ResultCache(max_entries=0))
+    missing = tmp_path / "missing.db"
+    monkeypatch.setenv("PATENT_TOOLS_PRIOR_ART_INDEX", str(missing))
+    text = asyncio.run(server.call_tool("generate_prior_art_search", {"content": "A gate electrode."}))[0].text
+    assert f"LOCAL INDEX MATCHES: not searched. Prior art index '{missing}' not found." in text
+    assert "BOOLEAN" in text.upper()
+
+
+@pytest.mark.parametrize("content", [b"not a database" * 100, None])
+def test_search_tool_reports_an_unreadable_index(tmp_path, monkeypatch, content):
+    monkeypatch.setattr(server, "result_cache", ResultCache(max_entries=0))
+    path = tmp_path / "other.db"
+    if content is None:
+        # A SQLite database, but not a prior art index
+        sqlite3.connect(path).execute("CREATE TABLE notes (text)").connection.close()
+    else:
+        path.write_bytes(content)
+    with pytest.raises(ValueError, match="cannot be read"):
+        PriorArtIndex(path)
+
+    arguments = {"query": "gate", "index_path": str(path), "output_format": "json"}
+    text = asyncio.run(server.call_tool("search_prior_art_index", arguments))[0].text
+    assert json.loads(text)["error"].startswith(f"Prior art index '{path}' cannot be read")
@@ -0,0 +1,47 @@
+import asyncio
+import json
+
+import pytest
+
+from patent_tools_mcp import core, server
+from patent_tools_mcp.cache import ResultCache
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(server, "result_cache", ResultCache(max_entries=16))
+
+
+def call(name, arguments):
+    return asyncio.run(server.call_tool(name, arguments))[0].text
+
+
+def test_json_output_is_the_analysis_result(make_document):
+    document = make_document("A widget comprising a base.", "The widget of claim 1, wherein the lid.")
+    result = json.loads(call("analyze_patent_claims", {"content": document, "output_format": "json"}))
+    # JSON object keys are strings
+    expected = json.loads(json.dumps(core.analyze_claims(document)))
+    assert result == expected
+
+
+def test_json_and_text_outputs_are_cached_separately(make_document):
+    document = make_document("A widget comprising a base.")
+    text = call("analyze_patent_word_count", {"content": document})
+    as_json = call("analyze_patent_word_count", {"content": document, "output_format": "json"})
+    assert text.startswith("=== ")
+    assert json.loads(as_json)["total_words"] == core.count_words(document)
+    assert call("analyze_patent_word_count", {"content": document}) == text
+
+
+def test_errors_are_reported_as_json_objects(tmp_path):
+    missing = str(tmp_path / "missing.md")
+    assert json.loads(call("analyze_patent_claims", {"file_path": missing, "output_format": "json"})) == {
+        "error": f"File '{missing}' not found."
+    }
+    assert call("analyze_patent_claims", {"file_path": missing}) == f"Error: File '{missing}' not found."
+
+
+def test_unknown_output_format_is_rejected():
+    assert call("analyze_patent_claims", {"content": "x", "output_format": "xml"}) == (
+        "Error: Unknown output_format 'xml'. Use 'text' or 'json'."
+    )
@@ -0,0 +1,49 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from patent_tools_mcp.similarity import choose_bands, find_near_duplicate_claims, format_pair
+
+
+BASE = "A semiconductor device comprising a substrate, a gate electrode over the substrate, and a spacer on the gate electrode"
+
+
+def claims_document(*claims):
+    return "".join(f"**Claim {n}.** {text}\n" for n, text in enumerate(claims, 1))
+
+
+def test_identical_claims_under_different_parents_are_found():
+    document = claims_document(
+        BASE + ".",
+        "The device of claim 1, wherein the spacer comprises silicon nitride and the gate electrode comprises tungsten.",
+        "A method of cooking rice comprising rinsing the rice and boiling water in a pot.",
+        BASE + ".",
+        "The device of claim 4, wherein the spacer comprises silicon nitride and the gate electrode comprises tungsten.",
+    )
+    result = find_near_duplicate_claims({"app.md": document})
+    pairs = {(p["first"]["claim"], p["second"]["claim"]) for p in result["pairs"]}
+    assert pairs == {(1, 4), (2, 5)}
+    assert all(p["similarity"] == 1.0 and p["same_document"] for p in result["pairs"])
+
+
+def test_pairs_are_found_across_documents():
+    result = find_near_duplicate_claims({"parent.md": claims_document(BASE + "."), "continuation.md": claims_document(BASE + " layer.")})
+    assert len(result["pairs"]) == 1
+    assert format_pair(result["pairs"][0]).startswith("Claim 1 of parent.md ~ claim 1 of continuation.md")
+
+
+def test_unrelated_claims_are_not_paired():
+    result = find_near_duplicate_claims({"a.md": claims_document(BASE + ".", "A method of cooking rice in a pot of boiling water.")})
+    assert result["pairs"] == []
+
+
+def test_bands_reach_the_threshold():
+    bands, rows = choose_bands(128, 0.8)
+    assert bands * rows <= 128
+    # A pair at the threshold becomes a candidate with high probability
+    assert 1 - (1 - 0.8 ** rows) ** bands >= 0.99
+
+
+def test_threshold_is_validated():
+    with pytest.raises(ValueError):
+        find_near_duplicate_claims({}, threshold=0)
@@ -0,0 +1,46 @@
+import random
+
+from patent_tools_mcp import core
+from patent_tools_mcp.ingest import StreamingWordCounter, count_streamed_words
+
+
+PIECES = ["word", "wörd", " ", "\n", "\n\n", "\r\n", "## ", "**", "*", "`", "```", "[a](b)", "[", "](", ")"]
+
+
+def random_chunks(rng, data, pieces):
+    cuts = sorted(rng.sample(range(1, len(data)), min(pieces, len(data) - 1))) if len(data) > 1 else []
+    return [data[start:end] for start, end in zip([0] + cuts, cuts + [len(data)])]
+
+
+def test_counts_markdown_split_across_chunks():
+    document = "Some **bold\ntext** and a [link\nacross](lines) with `code`.\n"
+    chunks = [document[i:i + 3] for i in range(0, len(document), 3)]
+    assert count_streamed_words(chunks) == core.count_words(document)
+
+
+def test_byte_chunks_split_inside_characters_and_line_breaks():
+    document = "naïve wörds\r\nacross\r\nlines\r"
+    data = document.encode("utf-8")
+    assert count_streamed_words(data[i:i + 1] for i in range(len(data))) == core.count_words(
+        document.replace("\r\n", "\n").replace("\r", "\n")
+    )
+
+
+def test_random_documents_and_chunkings_match_count_words():
+    rng = random.Random(2)
+    for _ in range(1500):
+        document = "".join(rng.choice(PIECES) for _ in range(rng.randint(0, 40)))
+        expected = core.count_words(document.replace("\r\n", "\n"))
+        counter = StreamingWordCounter(block_size=rng.randint(1, 8))
+        for chunk in random_chunks(rng, document.encode("utf-8"), rng.randint(0, 10)):
+            counter.feed(chunk)
+        assert counter.close() == expected, repr(document)
+
+
+def test_memory_stays_bounded_without_line_breaks_in_an_open_span():
+    counter = StreamingWordCounter(block_size=16, max_buffer=64)
+    counter.feed("```\n")
+    for _ in range(100):
+        counter.feed("code line\n")
+        assert counter._pending_size <= 64 + 16
+    counter.close()
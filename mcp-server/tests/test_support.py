@@ -0,0 +1,87 @@
+import pytest
+
+from patent_tools_mcp import support
+from patent_tools_mcp.support import SpecificationIndex, check_claim_support, claim_terms, specification_text
+
+
+def document(description, *claims):
+    claim_lines = "".join(f"**Claim {n}.** {text}\n" for n, text in enumerate(claims, 1))
+    return f"## BACKGROUND\n\nA spacer.\n\n## DETAILED DESCRIPTION\n\n{description}\n\n## CLAIMS\n\n{claim_lines}"
+
+
+def unsupported_terms(result):
+    return [entry["term"] for entry in result["unsupported"]]
+
+
+def test_terms_run_to_the_first_word_that_ends_an_element():
+    terms = claim_terms({
+        1: "A device comprising a gate dielectric spacer, a first metal layer over the substrate, "
+           "and a material selected from the group consisting of gold.",
+        2: "The device of claim 1, wherein the gate 104 electrode.",
+    })
+    assert list(terms) == [
+        "device", "gate dielectric spacer", "first metal layer", "substrate", "material", "group", "gate"
+    ]
+    assert terms["device"] == [1, 2]
+
+
+def test_terms_are_at_most_max_term_words_long():
+    terms = claim_terms({1: "A very long lightly doped drain extension region structure."})
+    assert support.MAX_TERM_WORDS == 6
+    assert list(terms) == ["very long lightly doped drain extension"]
+
+
+def test_full_term_must_appear_in_the_specification():
+    result = check_claim_support(document(
+        "The gate dielectric 104 covers the channel.",
+        "A device comprising a gate dielectric spacer and a gate dielectric.",
+    ))
+    assert unsupported_terms(result) == ["device", "gate dielectric spacer"]
+    assert result["unsupported"][1]["nearest"][0]["phrase"] == "gate dielectric"
+
+
+def test_plural_and_case_forms_support_a_term():
+    result = check_claim_support(document(
+        "Device 100 has Gate Electrodes 104 on a substrate.",
+        "A device comprising a gate electrode on the substrate.",
+    ))
+    assert result["unsupported"] == []
+    assert result["specification_sections"] == ["DETAILED DESCRIPTION"]
+
+
+def test_terms_longer_than_the_ngrams_are_matched_as_whole_phrases():
+    index = SpecificationIndex("a lightly doped drain extension region. Drain extension region and lightly doped drain.")
+    assert index.occurrences("lightly doped drain extension region") == 1
+    # Every three-word window is present, but never together
+    assert index.occurrences("lightly doped drain extension") == 1
+    assert index.occurrences("doped drain extension region and") == 0
+    assert index.occurrences("lightly doped drain region") == 0
+
+
+def test_specification_is_everything_but_claims_and_abstract_without_a_detailed_description():
+    text, headings = specification_text("## BACKGROUND\n\nPrior art.\n\n## CLAIMS\n\nClaims.\n\n## ABSTRACT\n\nShort.\n")
+    assert "Prior art." in text and "Claims." not in text and "Short." not in text
+    assert headings == ["BACKGROUND"]
+
+
+@pytest.fixture
+def empty_index_cache():
+    support.clear_index_cache()
+    yield
+    support.clear_index_cache()
+
+
+def test_index_cache_is_keyed_by_digest_and_bounded_by_words(monkeypatch, empty_index_cache):
+    monkeypatch.setattr(support, "INDEX_CACHE_WORDS", 10)
+    first = support.specification_index("one two three four five six")
+    assert support.specification_index("one two three four five six") is first
+    assert all(isinstance(key, str) and len(key) == 40 for key in support._index_cache)
+
+    support.specification_index("seven eight nine ten eleven")
+    assert list(support._index_cache.values())[-1].word_count == 5
+    assert len(support._index_cache) == 1
+    assert support.specification_index("one two three four five six") is not first
+
+
+def test_document_without_claims():
+    assert check_claim_support("## DETAILED DESCRIPTION\n\nText.") == {"error": "No claims found in document", "claims_count": 0}
@@ -0,0 +1,72 @@
+from pathlib import Path
+
+from patent_tools_mcp import terminology
+from patent_tools_mcp.terminology import (
+    BUILTIN_TERMINOLOGY_PATH,
+    TerminologyChecker,
+    compile_terminology_reference,
+    load_terminology,
+    merge_terminologies
+)
+
+
+REFERENCE = """
+| Term | Definition | Notes |
+|------|------------|-------|
+| **substrate** | The base wafer | Preferred term |
+| **wafer** | Same as above | |
+| **gate electrode** | Conductive gate (also called "gate conductor") | |
+
+## Best Practices
+
+1. Be consistent
+   - ✓ "dielectric layer" throughout
+   - ✗ "insulating layer" in some places
+
+Avoid switching between "trench" and "groove".
+"""
+
+
+def test_reference_compiles_into_groups_with_preferred_terms():
+    compiled = compile_terminology_reference(REFERENCE)
+    groups = {group["preferred"]: group["terms"] for group in compiled["groups"]}
+    assert groups["substrate"] == ["substrate", "wafer"]
+    assert groups["gate electrode"] == ["gate electrode", "gate conductor"]
+    assert groups["dielectric layer"] == ["dielectric layer", "insulating layer"]
+    assert groups[None] == ["trench", "groove"]
+
+
+def test_non_preferred_terms_are_reported_with_lines():
+    checker = TerminologyChecker(compile_terminology_reference(REFERENCE))
+    result = checker.check("A substrate.\nThe wafer is thin.\nA handle substrate and a wafer.")
+    (finding,) = result["issues"]
+    assert (finding["kind"], finding["use"]) == ("non_preferred", "substrate")
+    assert [(o["term"], o["line"]) for o in finding["occurrences"]] == [("wafer", 2), ("wafer", 3)]
+    assert terminology.format_finding(finding) == "use 'substrate' instead of 'wafer' (lines 2, 3)"
+
+
+def test_first_used_term_is_kept_in_a_group_without_a_preferred_term():
+    checker = TerminologyChecker(compile_terminology_reference(REFERENCE))
+    result = checker.check("A groove and a trench, then another trench.")
+    (finding,) = result["issues"]
+    assert (finding["kind"], finding["use"]) == ("inconsistent", "groove")
+    assert finding["counts"] == {"groove": 1, "trench": 2}
+
+
+def test_longest_match_wins_over_a_contained_term():
+    compiled = compile_terminology_reference(REFERENCE)
+    compiled["terms"].append("handle wafer")
+    result = TerminologyChecker(compiled).check("A substrate bonded to a handle wafer.")
+    assert result["issues"] == []
+
+
+def test_version_follows_the_terminology():
+    compiled = compile_terminology_reference(REFERENCE)
+    assert TerminologyChecker(compiled).version == TerminologyChecker(compile_terminology_reference(REFERENCE)).version
+    merged = merge_terminologies([compiled, {"terms": [], "groups": [{"preferred": "via", "terms": ["via", "through hole"], "rules": []}]}])
+    assert TerminologyChecker(merged).version != TerminologyChecker(compiled).version
+
+
+def test_built_in_terminology_is_the_compiled_reference():
+    reference = Path(__file__).resolve().parents[2] / "docs" / "h01l-terminology-reference.md"
+    assert load_terminology(reference) == load_terminology(BUILTIN_TERMINOLOGY_PATH)
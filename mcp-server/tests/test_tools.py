@@ -0,0 +1,48 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from patent_tools_mcp import core
+
+
+TOOLS = Path(__file__).resolve().parents[2] / "tools"
+
+
+def run_tool(script, *args):
+    completed = subprocess.run(
+        [sys.executable, str(TOOLS / script), *map(str, args)],
+        capture_output=True, text=True, encoding="utf-8", timeout=60
+    )
+    assert completed.returncode == 0, completed.stderr
+    return completed.stdout
+
+
+def test_core_does_not_load_the_mcp_sdk():
+    code = "import sys, patent_tools_mcp.core, patent_tools_mcp.ingest; print('mcp' in sys.modules)"
+    completed = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                               cwd=Path(__file__).resolve().parents[1])
+    assert completed.stdout.strip() == "False"
+
+
+def test_claim_analyzer_reports_the_core_findings(tmp_path, make_document):
+    document = make_document("A widget comprising a base.", "The widget of claim 1, wherein the lid.")
+    path = tmp_path / "claims.md"
+    path.write_text(document, encoding="utf-8")
+
+    output = run_tool("claim-analyzer.py", path)
+
+    result = core.analyze_claims(document)
+    assert f"Total claims: {result['total_claims']}" in output
+    for issue in result["claim_analysis"][2]["antecedent_issues"]:
+        assert f"⚠ {issue}" in output
+
+
+def test_word_count_matches_the_core_count(tmp_path):
+    document = "## ABSTRACT\n\nA **short** abstract with a [link](http://x) and `code`.\n"
+    path = tmp_path / "abstract.md"
+    path.write_text(document, encoding="utf-8")
+
+    output = run_tool("word-count.py", path)
+
+    assert f"Total word count: {core.count_words(document)}" in output
+    assert "Status: ✓ Within limit" in output
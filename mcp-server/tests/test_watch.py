@@ -0,0 +1,55 @@
+import os
+
+from patent_tools_mcp.watch import Watcher, diff_findings
+
+
+def touch(path, text, mtime_ns):
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_scan_finds_markdown_under_directories(tmp_path):
+    (tmp_path / "a.md").write_text("a")
+    (tmp_path / "notes.pdf").write_text("b")
+    (tmp_path / ".hidden").mkdir()
+    (tmp_path / ".hidden" / "c.md").write_text("c")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "d.txt").write_text("d")
+
+    watcher = Watcher([tmp_path])
+    assert watcher.files() == [tmp_path / "a.md", tmp_path / "sub" / "d.txt"]
+
+
+def test_change_is_reported_once_it_settles(tmp_path):
+    path = tmp_path / "claims.md"
+    touch(path, "one", 1_000_000_000)
+    watcher = Watcher([path], debounce=1.0)
+
+    assert watcher.poll_once(now=0.0) == []
+    touch(path, "two", 2_000_000_000)
+    assert watcher.poll_once(now=10.0) == []
+    # A second write within the interval restarts the wait
+    touch(path, "three", 3_000_000_000)
+    assert watcher.poll_once(now=10.5) == []
+    assert watcher.poll_once(now=11.0) == []
+    assert watcher.poll_once(now=11.5) == [path]
+    assert watcher.poll_once(now=20.0) == []
+
+
+def test_created_and_removed_files_are_reported(tmp_path):
+    watcher = Watcher([tmp_path], debounce=0.0)
+    path = tmp_path / "new.md"
+    path.write_text("claims")
+    assert watcher.poll_once(now=1.0) == [path]
+    assert path in watcher.signatures
+
+    path.unlink()
+    assert watcher.poll_once(now=2.0) == [path]
+    assert path not in watcher.signatures
+
+
+def test_diff_findings_reports_resolved_and_appeared_in_order():
+    old = ["claim 1: a", "claim 2: b", "claim 2: b"]
+    new = ["claim 2: b", "claim 3: c", "claim 1: a"]
+    assert diff_findings(old, new) == (["claim 2: b"], ["claim 3: c"])
+    assert diff_findings(new, new) == ([], [])
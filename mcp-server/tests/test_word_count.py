@@ -0,0 +1,54 @@
+import random
+
+from patent_tools_mcp import core
+
+
+DOCUMENT = (
+    "# Title\n\n## BACKGROUND OF THE INVENTION\n\nSome prior art.\n\n"
+    "## DETAILED DESCRIPTION\n\nThe device 100 has a **gate**.\n\n"
+    "## CLAIMS\n\n**Claim 1.** A device.\n\n## ABSTRACT\n\nA short abstract.\n"
+)
+
+
+def test_sections_are_split_at_line_start_headings():
+    sections_found, sections = core.segment_sections(DOCUMENT)
+    assert sections_found == dict.fromkeys(core.SECTION_TITLE_PATTERNS, True) | {"Summary": False}
+    assert [(s["heading"], s["section"]) for s in sections] == [
+        (None, None),
+        ("BACKGROUND OF THE INVENTION", "Background"),
+        ("DETAILED DESCRIPTION", "Description"),
+        ("CLAIMS", "Claims"),
+        ("ABSTRACT", "Abstract"),
+    ]
+    assert "".join(DOCUMENT[s["start"]:s["end"]] for s in sections) == DOCUMENT
+
+
+def test_section_counts_add_up_to_the_document_count():
+    result = core.analyze_word_count(DOCUMENT, "application.md")
+    assert result["total_words"] == core.count_words(DOCUMENT)
+    assert [s["word_count"] for s in result["sections"]] == [
+        core.count_words(DOCUMENT[s["start"]:s["end"]]) for s in result["sections"]
+    ]
+
+
+def test_section_with_an_open_span_is_merged_with_the_next():
+    document = "## BACKGROUND\ntext **open\n## SUMMARY\nmore** words\n"
+    _, sections = core.segment_sections(document)
+    assert [(s["heading"], s["start"], s["end"]) for s in sections] == [("BACKGROUND", 0, len(document))]
+    assert sections[0]["word_count"] == core.count_words(document)
+
+
+def test_abstract_check():
+    result = core.analyze_word_count("word " * 151, "abstract.md")
+    assert result["abstract_check"] == {
+        "max_allowed": 150, "current_count": 151, "within_limit": False, "remaining": None, "exceeds_by": 1
+    }
+    assert core.analyze_word_count("word " * 10, "spec.md")["abstract_check"] is None
+
+
+def test_section_counts_add_up_on_random_markdown():
+    rng = random.Random(11)
+    pieces = ["word", " ", "\n", "## ", "##", "# ", "**", "*", "`", "```", "[a](b)", "[", "](", ")", "CLAIMS", "ABSTRACT"]
+    for _ in range(3000):
+        document = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 30)))
+        assert core.analyze_word_count(document)["total_words"] == core.count_words(document), repr(document)
@@ -0,0 +1,17 @@
+#!/usr/bin/env python3
+"""
+Batch Patent Analyzer
+Runs word count, claims and prior art analyses over a whole directory of
+documents in one process pool, writing one JSON record per document.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "mcp-server"))
+
+from patent_tools_mcp.batch import main
+
+
+if __name__ == "__main__":
+    main()
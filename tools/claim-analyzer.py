@@ -2,93 +2,57 @@
 """
 Patent Claims Analyzer
 Analyzes patent claims for common issues and best practices.
+With --watch, keeps running and re-checks edited claims on every save.
 """
 
 import sys
-import re
+import argparse
 from pathlib import Path
-from collections import defaultdict
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "mcp-server"))
+
+from patent_tools_mcp import core, daemon, incremental, ingest, watch
+from patent_tools_mcp.claim_graph import ClaimGraph
 
 
 class ClaimAnalyzer:
-    def __init__(self, content):
+    def __init__(self, content, claims=None):
         self.content = content
-        self.claims = self.extract_claims()
+        self.claims = claims if claims is not None else self.extract_claims()
         self.issues = []
         self.warnings = []
         self.suggestions = []
 
     def extract_claims(self):
         """Extract individual claims from the document."""
-        claims = {}
-        # Match claim numbers and their content
-        pattern = r'\*\*Claim\s+(\d+)\.\*\*\s+(.*?)(?=\*\*Claim\s+\d+\.\*\*|$)'
-        matches = re.finditer(pattern, self.content, re.DOTALL)
+        return core.extract_claims(self.content)
 
-        for match in matches:
-            claim_num = int(match.group(1))
-            claim_text = match.group(2).strip()
-            claims[claim_num] = claim_text
+    def index_claim_elements(self, claim_text):
+        """Tokenize a claim once into its introduced elements and "the" references."""
+        return core.index_claim_elements(claim_text)
 
-        return claims
+    def report_antecedent_issues(self, references, introduced):
+        """Report every "the" reference that has no matching introduced element."""
+        return core.report_antecedent_issues(references, introduced)
 
     def analyze_antecedent_basis(self, claim_text):
         """Check for antecedent basis issues."""
-        issues = []
-
-        # Find all uses of "the" followed by a noun
-        the_pattern = r'\bthe\s+([a-z]+(?:\s+[a-z]+)?)'
-        the_matches = re.finditer(the_pattern, claim_text, re.IGNORECASE)
-
-        for match in the_matches:
-            element = match.group(1)
-            # Check if "a" or "an" appears before this element
-            a_pattern = r'\b(?:a|an)\s+' + re.escape(element)
-            if not re.search(a_pattern, claim_text, re.IGNORECASE):
-                issues.append(f"Possible antecedent basis issue: 'the {element}' without prior 'a/an {element}'")
-
-        return issues
+        return core.analyze_antecedent_basis(claim_text)
 
     def analyze_claim_structure(self, claim_num, claim_text):
         """Analyze claim structure and formatting."""
-        issues = []
-
-        # Check for preamble
-        if not re.match(r'^A\s+\w+|^The\s+\w+|^\d+\.', claim_text):
-            issues.append("Missing or unclear preamble")
-
-        # Check for transition phrase
-        if 'comprising' not in claim_text.lower() and \
-           'consisting of' not in claim_text.lower() and \
-           'consisting essentially of' not in claim_text.lower():
-            self.warnings.append(f"Claim {claim_num}: No clear transition phrase (comprising, consisting of, etc.)")
-
-        # Check claim length
-        word_count = len(claim_text.split())
-        if word_count > 200:
-            self.warnings.append(f"Claim {claim_num}: Very long ({word_count} words) - consider simplifying")
-
-        # Check for unclear antecedents
-        if claim_text.count('said') > 0:
-            self.suggestions.append(f"Claim {claim_num}: Consider replacing 'said' with 'the' for clarity")
-
-        return issues
-
-    def check_claim_dependencies(self):
-        """Check claim dependency tree."""
-        independent_claims = []
-        dependent_claims = defaultdict(list)
-
-        for claim_num, claim_text in self.claims.items():
-            # Check if claim depends on another
-            dep_match = re.search(r'claim\s+(\d+)', claim_text, re.IGNORECASE)
-            if dep_match:
-                depends_on = int(dep_match.group(1))
-                dependent_claims[depends_on].append(claim_num)
-            else:
-                independent_claims.append(claim_num)
+        structure = core.analyze_claim_structure(claim_num, claim_text)
+        self.warnings.extend(f"Claim {claim_num}: {warning}" for warning in structure["warnings"])
+        self.suggestions.extend(f"Claim {claim_num}: {suggestion}" for suggestion in structure["suggestions"])
+        return structure["issues"]
+
+    def build_dependency_graph(self):
+        """Parse the claim references into a dependency graph."""
+        return ClaimGraph.from_claims(self.claims)
 
-        return independent_claims, dependent_claims
+    def resolve_introduced_elements(self, claim_elements, graph):
+        """Compute the elements available to each claim, including those of its ancestors."""
+        return core.resolve_introduced_elements(claim_elements, graph)
 
     def analyze_all(self):
         """Run all analyses."""
@@ -96,7 +60,12 @@ class ClaimAnalyzer:
             self.issues.append("No claims found in document")
             return
 
-        independent, dependent = self.check_claim_dependencies()
+        graph = self.build_dependency_graph()
+        independent = graph.independent
+
+        # Index each claim once; dependents inherit their ancestors' elements
+        claim_elements = {num: self.index_claim_elements(text) for num, text in self.claims.items()}
+        available = self.resolve_introduced_elements(claim_elements, graph)
 
         print(f"\n{'='*60}")
         print(f"Patent Claims Analysis")
@@ -114,16 +83,21 @@ class ClaimAnalyzer:
             claim_text = self.claims[claim_num]
             print(f"Claim {claim_num}:")
 
-            if claim_num in independent:
+            dependencies = graph.references[claim_num]
+            if not dependencies:
                 print(f"  Type: Independent claim")
+            elif len(dependencies) == 1:
+                print(f"  Type: Depends on claim {dependencies[0]}")
             else:
-                # Find what it depends on
-                dep_match = re.search(r'claim\s+(\d+)', claim_text, re.IGNORECASE)
-                if dep_match:
-                    print(f"  Type: Depends on claim {dep_match.group(1)}")
+                print(f"  Type: Depends on claims {', '.join(map(str, dependencies))} (multiple dependent)")
 
             print(f"  Length: {len(claim_text.split())} words")
 
+            # Dangling, forward and circular references
+            for issue in graph.issues.get(claim_num, []):
+                self.issues.append(f"Claim {claim_num}: {issue}")
+                print(f"  ✗ {issue}")
+
             # Check structure
             struct_issues = self.analyze_claim_structure(claim_num, claim_text)
             if struct_issues:
@@ -131,7 +105,7 @@ class ClaimAnalyzer:
                     print(f"  ⚠ {issue}")
 
             # Check antecedent basis
-            antecedent_issues = self.analyze_antecedent_basis(claim_text)
+            antecedent_issues = self.report_antecedent_issues(claim_elements[claim_num][1], available[claim_num])
             if antecedent_issues:
                 for issue in antecedent_issues:
                     print(f"  ⚠ {issue}")
@@ -162,23 +136,71 @@ class ClaimAnalyzer:
         print()
 
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: python claim-analyzer.py <file_path>")
-        print("Example: python claim-analyzer.py ../templates/claims/my-claims.md")
-        sys.exit(1)
+def read_claims(file_path):
+    """Extract the claims of a document."""
+    if file_path.stat().st_size >= ingest.STREAMING_THRESHOLD:
+        # Very large files are memory-mapped; only the claim texts are decoded
+        with ingest.map_document(file_path) as data:
+            return ingest.extract_claims(data)
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return core.extract_claims(f.read())
 
-    file_path = Path(sys.argv[1])
 
-    if not file_path.exists():
-        print(f"Error: File '{file_path}' not found.")
-        sys.exit(1)
+def claim_findings(file_path):
+    """The findings for a document as lines, re-checking only the claims edited since its last analysis."""
+    result = incremental.analyze_claims_in_session(str(file_path), read_claims(file_path))
+    if "error" in result:
+        return [f"✗ {result['error']}"]
+
+    findings = [
+        f"Total claims: {result['total_claims']} "
+        f"({result['independent_count']} independent: {result['independent_claims']})"
+    ]
+    for claim_num, analysis in result["claim_analysis"].items():
+        findings.extend(f"Claim {claim_num}: ✗ {issue}" for issue in analysis["dependency_issues"])
+        for key in ("structure_issues", "antecedent_issues", "warnings"):
+            findings.extend(f"Claim {claim_num}: ⚠ {issue}" for issue in analysis[key])
+        findings.extend(f"Claim {claim_num}: 💡 {suggestion}" for suggestion in analysis["suggestions"])
+    return findings
 
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
 
-    analyzer = ClaimAnalyzer(content)
-    analyzer.analyze_all()
+def main():
+    # A running daemon (python -m patent_tools_mcp.daemon start) answers without the startup cost
+    daemon.forward("claim-analyzer", sys.argv[1:])
+
+    parser = argparse.ArgumentParser(
+        description="Analyze patent claims for common issues and best practices.",
+        epilog="Example: python claim-analyzer.py ../templates/claims/my-claims.md"
+    )
+    parser.add_argument("paths", nargs="+", help="Claims or application files (with --watch, also directories)")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running and print only the findings that change when a file is saved")
+    parser.add_argument("--debounce", type=float, default=watch.DEBOUNCE_SECONDS,
+                        help=f"Seconds a file must stay unchanged before it is re-analyzed (default: {watch.DEBOUNCE_SECONDS})")
+    args = parser.parse_args()
+
+    for path in args.paths:
+        if not Path(path).exists():
+            print(f"Error: File '{path}' not found.")
+            sys.exit(1)
+
+    if args.watch:
+        watch.watch(
+            args.paths, claim_findings, debounce=args.debounce,
+            forget=lambda path: incremental.claim_sessions.discard(str(path))
+        )
+        return
+
+    for path in args.paths:
+        file_path = Path(path)
+        if file_path.stat().st_size >= ingest.STREAMING_THRESHOLD:
+            analyzer = ClaimAnalyzer(None, claims=read_claims(file_path))
+        else:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            analyzer = ClaimAnalyzer(content)
+
+        analyzer.analyze_all()
 
 
 if __name__ == "__main__":
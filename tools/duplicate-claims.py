@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Claim Finder
+Finds nearly identical claims within an application or across a family of
+continuations, using MinHash signatures and locality-sensitive hashing.
+Requires NumPy.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "mcp-server"))
+
+from patent_tools_mcp.similarity import main
+
+
+if __name__ == "__main__":
+    main()
@@ -5,9 +5,13 @@ Generates search queries for patent databases based on invention description.
 """
 
 import sys
-import re
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "mcp-server"))
+
+from patent_tools_mcp import core, daemon
+from patent_tools_mcp.search_index import default_index_path, search_prior_art
+
 
 class SearchQueryGenerator:
     def __init__(self):
@@ -17,95 +21,25 @@ class SearchQueryGenerator:
 
     def extract_keywords(self, text):
         """Extract potential keywords from text."""
-        # Remove common words
-        common_words = {
-            'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
-            'of', 'with', 'by', 'from', 'as', 'is', 'was', 'are', 'were', 'be',
-            'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will',
-            'would', 'should', 'could', 'may', 'might', 'can', 'this', 'that',
-            'these', 'those', 'it', 'its', 'which', 'what', 'who', 'when', 'where',
-            'why', 'how', 'said', 'such', 'other', 'also', 'into', 'through'
-        }
-
-        # Extract words (2+ characters, alphabetic)
-        words = re.findall(r'\b[a-z]{2,}\b', text.lower())
-
-        # Filter out common words
-        keywords = [w for w in words if w not in common_words]
-
-        # Find multi-word technical terms (words connected by hyphens or common tech phrases)
-        tech_patterns = [
-            r'\b\w+-\w+(?:-\w+)?\b',  # hyphenated terms
-            r'\b(?:neural|machine|deep|artificial)\s+(?:network|learning|intelligence)\b',
-            r'\b(?:data|image|signal|video)\s+(?:processing|compression|analysis)\b',
-            r'\b(?:user|graphical)\s+interface\b',
-            r'\b(?:computer|processor|memory|storage)\s+\w+\b',
-        ]
-
-        for pattern in tech_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                self.technical_terms.add(match.group(0))
-
-        return keywords
+        # Also collect multi-word technical terms for the report
+        self.technical_terms.update(core.extract_technical_terms(text))
+        return core.extract_keywords(text)
 
     def generate_boolean_queries(self, keywords, max_keywords=5):
         """Generate Boolean search queries."""
-        queries = []
-
-        # Get most frequent keywords
-        from collections import Counter
-        keyword_freq = Counter(keywords)
-        top_keywords = [k for k, v in keyword_freq.most_common(max_keywords)]
-
-        if len(top_keywords) >= 2:
-            # AND query with top keywords
-            queries.append(" AND ".join(top_keywords))
-
-            # OR variations
-            queries.append(" OR ".join(top_keywords[:3]))
-
-            # Mixed queries
-            if len(top_keywords) >= 3:
-                queries.append(f"{top_keywords[0]} AND ({top_keywords[1]} OR {top_keywords[2]})")
-
-        return queries
+        return core.generate_boolean_queries(keywords, max_keywords)
 
     def suggest_cpc_classifications(self, text):
         """Suggest potential CPC classifications based on text content."""
-        # Common CPC classes and their keywords
-        cpc_keywords = {
-            'G06F': ['computer', 'data processing', 'computing', 'processor', 'software'],
-            'G06N': ['artificial intelligence', 'machine learning', 'neural network', 'AI'],
-            'G06T': ['image processing', 'graphics', 'visualization', 'rendering'],
-            'G06Q': ['business', 'commerce', 'management', 'financial', 'payment'],
-            'H04L': ['communication', 'network', 'transmission', 'protocol', 'data transfer'],
-            'H04N': ['video', 'television', 'streaming', 'broadcasting'],
-            'H04W': ['wireless', 'mobile', 'cellular', 'radio'],
-            'A61B': ['medical', 'diagnostic', 'healthcare', 'patient', 'clinical'],
-            'G01N': ['measuring', 'testing', 'analysis', 'detection', 'sensor'],
-            'G05B': ['control', 'automation', 'regulating', 'feedback'],
-            'G16H': ['healthcare IT', 'medical records', 'health informatics'],
-            'B60W': ['vehicle', 'automotive', 'driving', 'autonomous'],
-            'E21B': ['drilling', 'mining', 'extraction', 'well'],
-        }
-
-        text_lower = text.lower()
-        suggested = []
-
-        for cpc, keywords in cpc_keywords.items():
-            for keyword in keywords:
-                if keyword in text_lower:
-                    if cpc not in suggested:
-                        suggested.append(cpc)
-                    break
-
-        return suggested
-
-    def generate_search_strategy(self, text):
-        """Generate a comprehensive search strategy."""
-        keywords = self.extract_keywords(text)
+        return core.suggest_cpc_classifications(text)
+
+    def generate_search_strategy(self, text, index_path=None):
+        """Generate a comprehensive search strategy, running the queries against a local index if given."""
+        keywords = core.extract_keywords(text)
+        self.technical_terms.update(core.extract_technical_terms(text))
         queries = self.generate_boolean_queries(keywords)
+        top_keywords = core.rank_keywords(keywords)
+        proximity_queries = core.generate_proximity_queries(text, [kw["keyword"] for kw in top_keywords])
         cpcs = self.suggest_cpc_classifications(text)
 
         print(f"\n{'='*70}")
@@ -121,10 +55,9 @@ class SearchQueryGenerator:
         print("   - Google Scholar (for academic papers)")
 
         print(f"\n2. SUGGESTED KEYWORDS (Top 20):")
-        from collections import Counter
-        keyword_freq = Counter(keywords)
-        for i, (keyword, freq) in enumerate(keyword_freq.most_common(20), 1):
-            print(f"   {i:2d}. {keyword} ({freq} occurrences)")
+        for i, kw in enumerate(top_keywords, 1):
+            score = f", TF-IDF {kw['tf_idf']:.1f}" if "tf_idf" in kw else ""
+            print(f"   {i:2d}. {kw['keyword']} ({kw['frequency']} occurrences{score})")
 
         if self.technical_terms:
             print(f"\n3. TECHNICAL TERMS/PHRASES:")
@@ -134,12 +67,16 @@ class SearchQueryGenerator:
         print(f"\n4. BOOLEAN SEARCH QUERIES:")
         for i, query in enumerate(queries, 1):
             print(f"   Query {i}: {query}")
+        if proximity_queries:
+            print("\n   Proximity and phrase queries (USPTO syntax):")
+            for i, query in enumerate(proximity_queries, 1):
+                print(f"   Proximity {i}: {query['query']} ({query['count']} co-occurrences)")
 
         if cpcs:
             print(f"\n5. SUGGESTED CPC CLASSIFICATIONS:")
             for cpc in cpcs:
-                print(f"   - {cpc}")
-            print(f"\n   Use format: CPC={cpc} in USPTO database")
+                print(f"   - {cpc['classification']} ({cpc['hits']} hits, e.g. {cpc['matched_keyword']})")
+            print(f"\n   Use format: CPC={cpcs[0]['classification']} in USPTO database")
 
         print(f"\n6. SEARCH STRATEGY:")
         print("   Step 1: Start with keyword searches using Query 1")
@@ -152,18 +89,46 @@ class SearchQueryGenerator:
         print(f"\n7. DOCUMENTATION TEMPLATE:")
         print("   Use: templates/analysis/prior-art-analysis.md")
 
+        if index_path:
+            try:
+                local = search_prior_art(index_path, queries)
+            except (OSError, ValueError) as e:
+                # The rest of the strategy stands without the index
+                print(f"\n8. LOCAL INDEX MATCHES: not searched. {e}")
+            else:
+                print(f"\n8. LOCAL INDEX MATCHES ({local['documents']} documents in {local['index_path']}):")
+                for i, result in enumerate(local["results"], 1):
+                    print(f"   Query {i}:")
+                    for hit in result["hits"]:
+                        print(f"   - {hit['title']} ({hit['score']:.4g}) {hit['path']}")
+                        print(f"     {hit['snippet']}")
+                    if not result["hits"]:
+                        print("   - No matches")
+
         print(f"\n{'='*70}\n")
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python prior-art-search.py <file_path>")
+    # A running daemon (python -m patent_tools_mcp.daemon start) answers without the startup cost
+    daemon.forward("prior-art-search", sys.argv[1:])
+
+    args = sys.argv[1:]
+    index_path = default_index_path()
+    if "--index" in args:
+        position = args.index("--index")
+        index_path = args[position + 1] if position + 1 < len(args) else None
+        del args[position:position + 2]
+
+    if not args:
+        print("Usage: python prior-art-search.py <file_path> [--index <index_file>]")
         print("Example: python prior-art-search.py ../patents/drafts/my-invention.md")
         print("\nThis tool analyzes your invention description and generates")
         print("search queries and strategies for prior art searching.")
+        print("With --index (or PATENT_TOOLS_PRIOR_ART_INDEX) the queries are also")
+        print("run against a local index built with patent_tools_mcp.search_index.")
         sys.exit(1)
 
-    file_path = Path(sys.argv[1])
+    file_path = Path(args[0])
 
     if not file_path.exists():
         print(f"Error: File '{file_path}' not found.")
@@ -173,7 +138,7 @@ def main():
         content = f.read()
 
     generator = SearchQueryGenerator()
-    generator.generate_search_strategy(content)
+    generator.generate_search_strategy(content, index_path)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""
+Command Line Tools Daemon
+Keeps the claims analyzer, word count and prior art search tools loaded in
+one background process serving a local Unix socket, so that each run of
+those tools skips startup. The tools fall back to running in process when
+no daemon is listening.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "mcp-server"))
+
+from patent_tools_mcp.daemon import main
+
+
+if __name__ == "__main__":
+    main()
@@ -2,28 +2,46 @@
 """
 Word Count Tool for Patent Documents
 Counts words in markdown files and checks against patent requirements.
+With --watch, keeps running and recounts documents on every save.
 """
 
 import sys
-import re
+import argparse
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "mcp-server"))
 
-def count_words(text):
-    """Count words in text, excluding markdown formatting."""
-    # Remove markdown headers
-    text = re.sub(r'#+\s+', '', text)
-    # Remove markdown links but keep the text
-    text = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', text)
-    # Remove markdown bold/italic
-    text = re.sub(r'\*\*([^\*]+)\*\*', r'\1', text)
-    text = re.sub(r'\*([^\*]+)\*', r'\1', text)
-    # Remove code blocks
-    text = re.sub(r'```[^`]*```', '', text, flags=re.DOTALL)
-    text = re.sub(r'`[^`]+`', '', text)
-    # Split on whitespace and count
-    words = text.split()
-    return len(words)
+from patent_tools_mcp import core, daemon, ingest, watch
+
+
+ABSTRACT_WORD_LIMIT = 150
+
+
+def count_document(path):
+    """The sections found and the word count of each section of a document."""
+    if path.stat().st_size >= ingest.STREAMING_THRESHOLD:
+        # Very large files are memory-mapped and counted section by section
+        with ingest.map_document(path) as data:
+            return ingest.segment_sections(data)
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    return core.segment_sections(content)
+
+
+def word_count_findings(path):
+    """The counts and checks for a document as lines, for watch mode."""
+    sections_found, sections = count_document(path)
+    total_words = sum(section["word_count"] for section in sections)
+
+    findings = [f"Total word count: {total_words}"]
+    if 'abstract' in path.name.lower() and total_words > ABSTRACT_WORD_LIMIT:
+        findings.append(f"✗ Abstract EXCEEDS limit by {total_words - ABSTRACT_WORD_LIMIT} words")
+    findings.extend(f"✓ {name} section found" for name, found in sections_found.items() if found)
+    if any(section["heading"] for section in sections):
+        findings.extend(
+            f"{section['heading'] or '(before first heading)'}: {section['word_count']} words" for section in sections
+        )
+    return findings
 
 
 def analyze_patent_document(file_path):
@@ -34,10 +52,8 @@ def analyze_patent_document(file_path):
         print(f"Error: File '{file_path}' not found.")
         return
 
-    with open(path, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    total_words = count_words(content)
+    sections_found, sections = count_document(path)
+    total_words = sum(section["word_count"] for section in sections)
 
     print(f"\n{'='*60}")
     print(f"Patent Document Analysis: {path.name}")
@@ -47,40 +63,54 @@ def analyze_patent_document(file_path):
     # Check if it's an abstract
     if 'abstract' in path.name.lower():
         print(f"\nAbstract Requirements:")
-        print(f"  Maximum allowed: 150 words")
+        print(f"  Maximum allowed: {ABSTRACT_WORD_LIMIT} words")
         print(f"  Current count: {total_words}")
-        if total_words <= 150:
-            print(f"  Status: ✓ Within limit ({150 - total_words} words remaining)")
+        if total_words <= ABSTRACT_WORD_LIMIT:
+            print(f"  Status: ✓ Within limit ({ABSTRACT_WORD_LIMIT - total_words} words remaining)")
         else:
-            print(f"  Status: ✗ EXCEEDS limit by {total_words - 150} words")
+            print(f"  Status: ✗ EXCEEDS limit by {total_words - ABSTRACT_WORD_LIMIT} words")
 
     # Check for sections if it's a full application
-    sections = {
-        'Background': r'##\s+BACKGROUND',
-        'Summary': r'##\s+.*SUMMARY',
-        'Description': r'##\s+.*DESCRIPTION',
-        'Claims': r'##\s+CLAIMS',
-        'Abstract': r'##\s+ABSTRACT'
-    }
-
     print(f"\nDocument Structure:")
-    for section_name, pattern in sections.items():
-        if re.search(pattern, content, re.IGNORECASE):
+    for section_name, found in sections_found.items():
+        if found:
             print(f"  ✓ {section_name} section found")
         else:
             print(f"  - {section_name} section not found")
 
+    if any(section["heading"] for section in sections):
+        print(f"\nWords per section:")
+        for section in sections:
+            print(f"  {section['heading'] or '(before first heading)'}: {section['word_count']}")
+
     print(f"\n{'='*60}\n")
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python word-count.py <file_path>")
-        print("Example: python word-count.py ../templates/abstracts/my-abstract.md")
-        sys.exit(1)
+    # A running daemon (python -m patent_tools_mcp.daemon start) answers without the startup cost
+    daemon.forward("word-count", sys.argv[1:])
+
+    parser = argparse.ArgumentParser(
+        description="Count words in patent documents and check them against patent requirements.",
+        epilog="Example: python word-count.py ../templates/abstracts/my-abstract.md"
+    )
+    parser.add_argument("paths", nargs="+", help="Markdown files (with --watch, also directories)")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running and print only the counts that change when a file is saved")
+    parser.add_argument("--debounce", type=float, default=watch.DEBOUNCE_SECONDS,
+                        help=f"Seconds a file must stay unchanged before it is recounted (default: {watch.DEBOUNCE_SECONDS})")
+    args = parser.parse_args()
+
+    if args.watch:
+        for path in args.paths:
+            if not Path(path).exists():
+                print(f"Error: File '{path}' not found.")
+                sys.exit(1)
+        watch.watch(args.paths, word_count_findings, debounce=args.debounce)
+        return
 
-    file_path = sys.argv[1]
-    analyze_patent_document(file_path)
+    for file_path in args.paths:
+        analyze_patent_document(file_path)
 
 
 if __name__ == "__main__":